@@ -1,17 +1,119 @@
+import hashlib
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from .models import User
 from .models import Course, Student, Faculty, Holiday, FeeRecord
 from .models import Announcement
 
-admin.site.register(Course)
-admin.site.register(Student)
-admin.site.register(Faculty)
 admin.site.register(Holiday)
-admin.site.register(FeeRecord)
 admin.site.register(Announcement)
 
 
+# ======================================================
+# 📄 CHANGELIST PAGINATION
+# ======================================================
+class CachedCountPaginator(Paginator):
+    """
+    Paginator whose COUNT(*) is cached for COUNT_TIMEOUT seconds per distinct
+    query, so paging through a large changelist counts the table once instead
+    of on every page. Counts may lag by up to COUNT_TIMEOUT after writes.
+    """
+    COUNT_TIMEOUT = 60
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        sql, params = query.sql_with_params()
+        raw = f"{query.model._meta.label}|{sql}|{params!r}"
+        key = "admin:count:" + hashlib.sha1(raw.encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.COUNT_TIMEOUT)
+        return count
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """Defaults for admins over large tables."""
+    paginator = CachedCountPaginator
+    # skip the second, unfiltered COUNT(*) ("N of M selected")
+    show_full_result_count = False
+    list_per_page = 50
+
+
+# ======================================================
+# 🎓 COURSES, STUDENTS, FACULTY, FEES
+# ======================================================
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ['code', 'name', 'credits', 'total_seats', 'seats_available']
+    search_fields = ['code', 'name']  # small table; also backs Student.course autocomplete
+    ordering = ['code']
+
+
+class ArchivedFilter(admin.SimpleListFilter):
+    title = 'archived'
+    parameter_name = 'archived'
+
+    def lookups(self, request, model_admin):
+        return [('no', 'Active'), ('yes', 'Archived')]
+
+    def queryset(self, request, queryset):
+        # archived_at is indexed
+        if self.value() == 'no':
+            return queryset.filter(archived_at__isnull=True)
+        if self.value() == 'yes':
+            return queryset.filter(archived_at__isnull=False)
+        return queryset
+
+
+@admin.register(Student)
+class StudentAdmin(ScalableAdmin):
+    list_display = ['roll_number', 'name', 'user', 'course', 'mode_of_entry', 'pending_amount', 'archived_at']
+    list_select_related = ['user', 'course']
+    # prefix matches on the unique (indexed) roll_number and username only;
+    # icontains would scan every row
+    search_fields = ['roll_number__startswith', 'user__username__startswith']
+    search_help_text = 'Roll number or username prefix'
+    list_filter = [ArchivedFilter, 'course']
+    raw_id_fields = ['user']
+    autocomplete_fields = ['course']
+    readonly_fields = ['pending_amount', 'created_at', 'updated_at']
+    ordering = ['-id']
+
+    def get_queryset(self, request):
+        # the changelist skips list_select_related once anything is selected,
+        # so apply it here; this also covers FeeRecord's student autocomplete
+        # (Student.__str__ reads the user)
+        return super().get_queryset(request).select_related(*self.list_select_related)
+
+
+@admin.register(Faculty)
+class FacultyAdmin(ScalableAdmin):
+    list_display = ['user', 'department', 'designation', 'email', 'join_date']
+    list_select_related = ['user']
+    search_fields = ['user__username__startswith', 'department__startswith']
+    search_help_text = 'Username or department prefix'
+    list_filter = ['department', 'designation']  # both indexed
+    raw_id_fields = ['user']
+    ordering = ['-id']
+
+
+@admin.register(FeeRecord)
+class FeeRecordAdmin(ScalableAdmin):
+    list_display = ['id', 'student', 'student__roll_number', 'amount', 'status', 'date_paid']
+    list_select_related = ['student__user']
+    search_fields = ['student__roll_number__startswith', 'idempotency_key__exact']
+    search_help_text = 'Student roll number prefix or payment idempotency key'
+    list_filter = ['status']  # (status, date_paid) index
+    autocomplete_fields = ['student']  # searches StudentAdmin.search_fields
+    ordering = ['-id']
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     model = User
@@ -19,6 +121,3 @@ class CustomUserAdmin(UserAdmin):
         ('Extra Info', {'fields': ('role', 'department', 'enrollment_no')}),
     )
     list_display = ['username', 'email', 'first_name', 'last_name', 'role']
-
-
-
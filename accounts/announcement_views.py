@@ -1,6 +1,14 @@
-from rest_framework import generics, permissions
-from .models import Announcement
-from .serializers import AnnouncementSerializer
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from . import feed
+from .models import Announcement, AnnouncementDelivery, User
+from .pagination import KeysetPagination
+from .serializers import AnnouncementDeliverySerializer, AnnouncementFeedSerializer, AnnouncementSerializer
 
 
 class AnnouncementListView(generics.ListAPIView):
@@ -8,3 +16,87 @@ class AnnouncementListView(generics.ListAPIView):
     queryset = Announcement.objects.all().order_by('-created_at')
     serializer_class = AnnouncementSerializer
     permission_classes = [permissions.AllowAny]
+
+
+# ======================================================
+# 📬 PER-USER ANNOUNCEMENT FEED (audience + unread state)
+# ======================================================
+class AnnouncementFeedPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+
+
+class AnnouncementFeedView(generics.ListAPIView):
+    """
+    GET → announcements for the user's role (students: all + students,
+    teachers: all + faculty, admins: everything), newest first, keyset
+    paginated. Each item carries `unread`.
+    """
+    serializer_class = AnnouncementFeedSerializer
+    pagination_class = AnnouncementFeedPagination
+    permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        return feed.visible_announcements(self.request.user.role)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if not hasattr(self, "_watermark"):
+            self._watermark = feed.get_watermark(self.request.user.pk)
+        context["watermark"] = self._watermark
+        return context
+
+
+class AnnouncementSeenView(APIView):
+    """
+    POST → mark the feed as read, up to {"up_to": <announcement id>} or up to
+    the newest announcement when omitted.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        up_to = None
+        if request.data.get("up_to") is not None:
+            try:
+                up_to_id = int(request.data["up_to"])
+            except (TypeError, ValueError):
+                return Response({"error": "up_to must be an announcement id."}, status=status.HTTP_400_BAD_REQUEST)
+            up_to = get_object_or_404(feed.visible_announcements(request.user.role), pk=up_to_id)
+
+        watermark = feed.mark_seen(request.user.pk, request.user.role, up_to)
+        unread, more = feed.unread_count(request.user.role, watermark)
+        return Response({"last_seen_at": watermark, "unread": unread, "more": more})
+
+
+class AnnouncementBadgeView(APIView):
+    """
+    GET → {"unread": n, "more": bool}; n is capped at 99 ("more" = 99+).
+
+    Built for frequent polling: the user id comes straight from the JWT (no
+    user lookup) and the count is served from the shared cache, so a warm
+    poll runs no database queries.
+    """
+    authentication_classes = [JWTStatelessUserAuthentication, SessionAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+
+        def load_role():
+            return getattr(user, "role", None) or User.objects.filter(pk=user.id).values_list("role", flat=True).first()
+
+        unread, more = feed.badge(user.id, load_role)
+        return Response({"unread": unread, "more": more})
+
+
+# ======================================================
+# ✉️ ANNOUNCEMENT EMAIL DELIVERY PROGRESS
+# ======================================================
+class AnnouncementDeliveryView(generics.RetrieveAPIView):
+    """GET → email fan-out progress of one announcement (404 if it wasn't emailed)."""
+    serializer_class = AnnouncementDeliverySerializer
+    permission_classes = [permissions.AllowAny]
+    lookup_field = "announcement_id"
+    lookup_url_kwarg = "pk"
+    queryset = AnnouncementDelivery.objects.all()
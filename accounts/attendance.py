@@ -0,0 +1,241 @@
+"""
+Attendance storage and counting.
+
+A session stores one bit per student of the course roster (1 = present),
+so a 60-student class costs 8 bytes per session instead of 60 rows.
+Percentages are computed with whole-bitmap integer operations:
+
+* per session / per course totals: popcount (int.bit_count) of the bitmap
+* per student over many sessions: a bit-sliced counter. Each session bitmap
+  is added to a stack of "count planes" with carry-save XOR/AND, so adding
+  one session costs a few big-integer ops for the whole class, whatever its size.
+"""
+import hashlib
+from array import array
+from collections import defaultdict
+from sys import byteorder
+
+from django.db import IntegrityError, transaction
+
+from .models import AttendanceRoster, AttendanceSession, Course, Student
+
+
+# ---------------------------
+# Packing helpers
+# ---------------------------
+def pack_ids(ids):
+    packed = array("Q", ids)
+    if byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ids(data):
+    ids = array("Q")
+    ids.frombytes(bytes(data))
+    if byteorder != "little":
+        ids.byteswap()
+    return ids
+
+
+def build_bitmap(roster_ids, present_ids):
+    """Bitmap bytes with bit i set when roster_ids[i] is in present_ids."""
+    position = {student_id: i for i, student_id in enumerate(roster_ids)}
+    bits = 0
+    for student_id in present_ids:
+        bits |= 1 << position[student_id]
+    return bits.to_bytes((len(roster_ids) + 7) // 8, "little")
+
+
+def bitmap_int(data):
+    return int.from_bytes(bytes(data), "little")
+
+
+class BitSlicedCounter:
+    """Per-position counts over many bitmaps, using carry-save addition on big ints."""
+
+    def __init__(self):
+        self.planes = []  # planes[k] holds bit k of every position's count
+
+    def add(self, bits):
+        carry = bits
+        for k, plane in enumerate(self.planes):
+            self.planes[k] = plane ^ carry
+            carry &= plane
+            if not carry:
+                return
+        if carry:
+            self.planes.append(carry)
+
+    def counts(self, size):
+        totals = [0] * size
+        for k, plane in enumerate(self.planes):
+            weight = 1 << k
+            # walk only the set bits of each plane
+            while plane:
+                low = plane & -plane
+                totals[low.bit_length() - 1] += weight
+                plane ^= low
+        return totals
+
+
+# ---------------------------
+# Rosters & marking
+# ---------------------------
+def current_roster(course):
+    """Roster for the course's current (non-archived) students, reused when unchanged."""
+    ids = list(
+        Student.objects.filter(course=course, archived_at__isnull=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    packed = pack_ids(ids)
+    digest = hashlib.sha1(packed).hexdigest()
+    try:
+        with transaction.atomic():
+            roster, _ = AttendanceRoster.objects.get_or_create(
+                course=course, digest=digest, defaults={"student_ids": packed, "size": len(ids)},
+            )
+    except IntegrityError:  # created concurrently by another request
+        roster = AttendanceRoster.objects.get(course=course, digest=digest)
+    return roster, ids
+
+
+def mark_session(course, date, slot, present_ids=None, absent_ids=None, marked_by=None):
+    """
+    Create or replace the attendance of one class session.
+    Exactly one of present_ids / absent_ids is given. Raises ValueError for
+    ids that are not on the course roster.
+    """
+    roster, roster_ids = current_roster(course)
+    on_roster = set(roster_ids)
+    given = set(present_ids if present_ids is not None else absent_ids)
+    unknown = given - on_roster
+    if unknown:
+        raise ValueError(f"Not on the {course.code} roster: {sorted(unknown)}")
+    present = given if present_ids is not None else on_roster - given
+
+    bitmap = build_bitmap(roster_ids, present)
+    session, _ = AttendanceSession.objects.update_or_create(
+        course=course, date=date, slot=slot,
+        defaults={
+            "roster": roster,
+            "present": bitmap,
+            "present_count": len(present),
+            "marked_by": marked_by,
+        },
+    )
+    return session
+
+
+# ---------------------------
+# Reporting
+# ---------------------------
+def _course_counts(course_ids=None):
+    """
+    {student_id: [attended, held]} for the given courses (all when None).
+    Sessions are read as raw bitmaps and folded per roster.
+    """
+    sessions = AttendanceSession.objects.order_by()
+    if course_ids is not None:
+        sessions = sessions.filter(course_id__in=course_ids)
+
+    counters = defaultdict(BitSlicedCounter)
+    held = defaultdict(int)
+    for roster_id, bitmap in sessions.values_list("roster_id", "present").iterator(chunk_size=2000):
+        counters[roster_id].add(bitmap_int(bitmap))
+        held[roster_id] += 1
+
+    totals = defaultdict(lambda: [0, 0])
+    rosters = AttendanceRoster.objects.filter(pk__in=list(held)).values_list("pk", "student_ids", "size")
+    for roster_id, packed, size in rosters:
+        ids = unpack_ids(packed)
+        for student_id, attended in zip(ids, counters[roster_id].counts(size)):
+            entry = totals[student_id]
+            entry[0] += attended
+            entry[1] += held[roster_id]
+    return totals
+
+
+def _percentage(attended, held):
+    return round(attended * 100 / held, 2) if held else None
+
+
+def course_summary(course):
+    totals = _course_counts([course.pk])
+    sessions = AttendanceSession.objects.filter(course=course).values_list("present_count", "roster__size")
+    marked = seats = 0
+    session_count = 0
+    for present_count, size in sessions:
+        marked += present_count
+        seats += size
+        session_count += 1
+    names = dict(Student.objects.filter(pk__in=list(totals)).values_list("pk", "name"))
+    return {
+        "course": course.pk,
+        "course_name": course.name,
+        "sessions": session_count,
+        "average_percentage": _percentage(marked, seats),
+        "students": [
+            {
+                "student": student_id,
+                "name": names.get(student_id),
+                "attended": attended,
+                "held": held,
+                "percentage": _percentage(attended, held),
+            }
+            for student_id, (attended, held) in sorted(totals.items())
+        ],
+    }
+
+
+def student_summary(student):
+    """Attendance of one student across the sessions of their course."""
+    attended = held = 0
+    if student.course_id:
+        rosters = AttendanceRoster.objects.filter(course_id=student.course_id).values_list("pk", "student_ids")
+        positions = {}
+        for roster_id, packed in rosters:
+            ids = unpack_ids(packed)
+            try:
+                positions[roster_id] = ids.index(student.pk)
+            except ValueError:
+                continue  # roster from before the student joined
+        sessions = AttendanceSession.objects.filter(roster_id__in=list(positions)).values_list("roster_id", "present")
+        for roster_id, bitmap in sessions.iterator(chunk_size=2000):
+            held += 1
+            attended += (bitmap_int(bitmap) >> positions[roster_id]) & 1
+    return {
+        "student": student.pk,
+        "course": student.course_id,
+        "attended": attended,
+        "held": held,
+        "percentage": _percentage(attended, held),
+    }
+
+
+def shortfall_report(threshold=75):
+    """Every student (college-wide) whose attendance is below `threshold` percent."""
+    totals = _course_counts()
+    short = {
+        student_id: (attended, held)
+        for student_id, (attended, held) in totals.items()
+        if held and attended * 100 < threshold * held
+    }
+    students = Student.objects.filter(pk__in=list(short)).values_list("pk", "name", "roll_number", "course_id")
+    course_names = dict(Course.objects.values_list("pk", "name"))
+    rows = [
+        {
+            "student": pk,
+            "name": name,
+            "roll_number": roll_number,
+            "course": course_id,
+            "course_name": course_names.get(course_id),
+            "attended": short[pk][0],
+            "held": short[pk][1],
+            "percentage": _percentage(*short[pk]),
+        }
+        for pk, name, roll_number, course_id in students
+    ]
+    rows.sort(key=lambda row: (row["percentage"], row["student"]))
+    return rows
@@ -0,0 +1,84 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import attendance
+from .models import Course, Faculty, Student
+from .serializers import AttendanceMarkSerializer
+
+
+# ======================================================
+# 📝 ATTENDANCE MARKING (one request per class session)
+# ======================================================
+class AttendanceSessionMarkView(APIView):
+    """
+    POST → mark a whole session of a course.
+    Body: {"course": 3, "date": "2026-10-18", "slot": 1, "absent": [12, 40]}
+    (or "present": [...]). Re-posting the same course/date/slot replaces it.
+    The marking faculty is the logged-in faculty user, or "faculty" in the body.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = AttendanceMarkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        marked_by = data.get("faculty")
+        if marked_by is None and request.user.is_authenticated:
+            marked_by = Faculty.objects.filter(user=request.user).first()
+
+        try:
+            session = attendance.mark_session(
+                data["course"], data["date"], data["slot"],
+                present_ids=data.get("present"),
+                absent_ids=data.get("absent"),
+                marked_by=marked_by,
+            )
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "id": session.pk,
+            "course": session.course_id,
+            "date": session.date,
+            "slot": session.slot,
+            "present": session.present_count,
+            "strength": session.roster.size,
+            "marked_by": session.marked_by_id,
+        }, status=status.HTTP_201_CREATED)
+
+
+# ======================================================
+# 📊 ATTENDANCE PERCENTAGES
+# ======================================================
+class CourseAttendanceView(APIView):
+    """GET → per-student attendance for one course plus the class average."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        course = get_object_or_404(Course, pk=pk)
+        return Response(attendance.course_summary(course))
+
+
+class StudentAttendanceView(APIView):
+    """GET → one student's attendance over their course's sessions."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        student = get_object_or_404(Student, pk=pk)
+        return Response(attendance.student_summary(student))
+
+
+class AttendanceShortfallView(APIView):
+    """GET → all students below ?threshold= percent (default 75), lowest first."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        try:
+            threshold = float(request.query_params.get("threshold", 75))
+        except ValueError:
+            return Response({"error": "threshold must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        rows = attendance.shortfall_report(threshold)
+        return Response({"threshold": threshold, "count": len(rows), "results": rows})
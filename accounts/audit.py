@@ -0,0 +1,175 @@
+"""
+Audit log of admin changes (students, fee records, faculty), buffered in
+memory and written in batches.
+
+A write path takes a snapshot() of the object before changing it and calls
+record() afterwards with the acting user. record() keeps only the fields that
+changed. Once the surrounding transaction commits, it appends the entry to a
+per-process buffer, so a rolled-back change leaves no entry. Nothing is
+inserted on the request path.
+
+Personal data (SENSITIVE_FIELDS: Aadhar number, phone numbers, address) is
+never stored. An entry shows that such a field changed, or what a deleted row
+had, only as MASK.
+
+A daemon flusher thread inserts the buffer with bulk_create every
+AUDIT_FLUSH_SECONDS, or as soon as AUDIT_FLUSH_SIZE entries are waiting. The
+thread is started by the first entry, i.e. after gunicorn forks. flush() also
+runs at interpreter exit and before every audit query, so a worker always
+sees its own changes.
+
+Loss is bounded. A killed worker loses what it buffered since the last flush:
+at most AUDIT_FLUSH_SECONDS worth of changes, and never more than
+AUDIT_FLUSH_SIZE entries unless inserts are failing. While the database
+rejects inserts, entries are kept and retried, up to AUDIT_BUFFER_MAX. Past
+that the oldest are dropped and counted in `dropped`.
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+_WRITE_BATCH = 2000
+SENSITIVE_FIELDS = frozenset({"aadhar", "parent_contact", "address", "phone"})
+MASK = "***"
+
+_lock = threading.Lock()  # guards _buffer, dropped and _flusher
+_buffer = deque()
+dropped = 0  # entries discarded because the buffer overflowed
+_flush_lock = threading.Lock()  # one flush at a time, so entries are inserted in order
+_wakeup = threading.Event()
+_flusher = None
+
+
+# ---------------------------
+# Capturing changes
+# ---------------------------
+def _audited_fields(instance):
+    # generated and auto_now columns change on every save and say nothing about who changed what
+    return [
+        field for field in instance._meta.concrete_fields
+        if not field.generated and not getattr(field, "auto_now", False)
+    ]
+
+
+def snapshot(instance, **extra):
+    """Field values of `instance` ({name: value}, foreign keys as ids), plus `extra` values of related objects."""
+    values = {field.name: field.value_from_object(instance) for field in _audited_fields(instance)}
+    values.update(extra)
+    return values
+
+
+def _masked(name, value):
+    return MASK if name in SENSITIVE_FIELDS and value not in (None, "") else value
+
+
+def record(entity, object_id, actor, before, after=None):
+    """
+    Queue an audit entry for `object_id`: an update with the fields that differ
+    between the `before` and `after` snapshots (nothing if none), or a delete
+    with every `before` value if `after` is None. SENSITIVE_FIELDS values are
+    compared but stored as MASK.
+    """
+    if after is None:
+        action, changes = "delete", {name: [value, None] for name, value in before.items()}
+    else:
+        action = "update"
+        changes = {name: [before.get(name), value] for name, value in after.items() if before.get(name) != value}
+        if not changes:
+            return
+    changes = {name: [_masked(name, old), _masked(name, new)] for name, (old, new) in changes.items()}
+    entry = AuditEntry(
+        entity=entity, object_id=object_id, action=action, changes=changes,
+        actor_id=actor.pk if actor is not None and actor.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: _append(entry))
+
+
+# ---------------------------
+# Buffer & flusher
+# ---------------------------
+def _trim():
+    """Drop the oldest entries past AUDIT_BUFFER_MAX. Call with _lock held."""
+    global dropped
+    overflow = len(_buffer) - settings.AUDIT_BUFFER_MAX
+    for _ in range(max(0, overflow)):
+        _buffer.popleft()
+        dropped += 1
+    if overflow > 0:
+        logger.warning("audit buffer full: dropped %d entries (%d so far)", overflow, dropped)
+
+
+def _append(entry):
+    with _lock:
+        _buffer.append(entry)
+        _trim()
+        full = len(_buffer) >= settings.AUDIT_FLUSH_SIZE
+    flusher()
+    if full:
+        _wakeup.set()
+
+
+def pending():
+    """Number of entries buffered in this process and not yet inserted."""
+    with _lock:
+        return len(_buffer)
+
+
+def flush():
+    """Insert everything buffered so far in one transaction. Returns the number of entries written."""
+    with _flush_lock:
+        with _lock:
+            batch = list(_buffer)
+            _buffer.clear()
+        if not batch:
+            return 0
+        try:
+            with transaction.atomic():
+                AuditEntry.objects.bulk_create(batch, batch_size=_WRITE_BATCH)
+        except Exception:
+            for entry in batch:
+                entry.pk = None  # ids from the rolled-back insert
+            with _lock:
+                _buffer.extendleft(reversed(batch))  # retried first next time
+                _trim()
+            raise
+        return len(batch)
+
+
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        logger.exception("writing the audit log at exit failed; %d entries lost", pending())
+
+
+def _run():
+    while True:
+        _wakeup.wait(settings.AUDIT_FLUSH_SECONDS)
+        _wakeup.clear()
+        close_old_connections()
+        try:
+            flush()
+        except Exception:
+            logger.exception("writing the audit log failed; %d entries kept for the next flush", pending())
+        finally:
+            close_old_connections()
+
+
+def flusher():
+    """The background flusher thread of this process, started on first use (and again after a fork)."""
+    global _flusher
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            if _flusher is None:
+                atexit.register(_flush_at_exit)
+            _flusher = threading.Thread(target=_run, name="audit-flusher", daemon=True)
+            _flusher.start()
+        return _flusher
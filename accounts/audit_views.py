@@ -0,0 +1,71 @@
+import logging
+
+from rest_framework import generics, permissions, serializers
+from rest_framework.exceptions import ValidationError
+
+from . import audit
+from .models import AuditEntry
+from .pagination import KeysetPagination
+from .serializers import AuditEntrySerializer
+
+logger = logging.getLogger(__name__)
+
+
+class AuditPagination(KeysetPagination):
+    page_size = 200
+    ordering = ("-created_at", "-id")
+
+
+# ======================================================
+# 🕵️ AUDIT LOG (admin changes to students, fees, faculty)
+# ======================================================
+class AuditEntryListView(generics.ListAPIView):
+    """
+    GET → audit entries, newest first.
+
+    Query params (all optional, each served by an index):
+      entity             → students | fees | faculty
+      object_id          → one object (requires entity)
+      actor              → user id of whoever made the change
+      since / until      → ISO date-times, created_at range [since, until)
+      cursor, page_size  → keyset pagination
+    """
+    serializer_class = AuditEntrySerializer
+    pagination_class = AuditPagination
+    permission_classes = [permissions.AllowAny]
+
+    def _param(self, name, field):
+        value = self.request.query_params.get(name)
+        if value in (None, ""):
+            return None
+        try:
+            return field.run_validation(value)
+        except serializers.ValidationError as exc:
+            raise ValidationError({name: exc.detail})
+
+    def get_queryset(self):
+        entity = self._param("entity", serializers.ChoiceField(choices=AuditEntry._meta.get_field("entity").choices))
+        object_id = self._param("object_id", serializers.IntegerField(min_value=1))
+        actor = self._param("actor", serializers.IntegerField(min_value=1))
+        since = self._param("since", serializers.DateTimeField())
+        until = self._param("until", serializers.DateTimeField())
+        if object_id is not None and entity is None:
+            raise ValidationError({"object_id": "Filter by entity too."})
+
+        try:
+            audit.flush()  # this worker's buffered entries first, so a change shows up right after it is made
+        except Exception:
+            # the entries stay buffered for the flusher; serve what is already in the table
+            logger.exception("flushing the audit log before a read failed; %d entries still buffered", audit.pending())
+        entries = AuditEntry.objects.select_related("actor")
+        if entity is not None:
+            entries = entries.filter(entity=entity)
+        if object_id is not None:
+            entries = entries.filter(object_id=object_id)
+        if actor is not None:
+            entries = entries.filter(actor_id=actor)
+        if since is not None:
+            entries = entries.filter(created_at__gte=since)
+        if until is not None:
+            entries = entries.filter(created_at__lt=until)
+        return entries
@@ -0,0 +1,180 @@
+"""
+POST /api/auth/batch/ — several API GETs in one round trip.
+
+    {"requests": ["me/", "dashboard/", {"path": "courses/", "etag": "\"...\""}]}
+  → {"responses": [{"path": ..., "status": 200, "etag": "\"...\"", "body": {...}}, ...]}
+
+Each path is resolved with the normal URLconf and its view is called in
+process, with the caller's headers and cookies (so JWT or session auth,
+permissions and throttles apply per sub-request as if it had been sent on its
+own). Sub-requests run concurrently on a small thread pool. Each item keeps
+its status code and an ETag (the view's own, or one computed from the body);
+sending that ETag back with the same path returns 304 with no body.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.cache import set_response_etag
+from django.utils.http import parse_etags
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .serializers import BatchRequestSerializer
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/"
+# request headers that belong to the batch POST itself, not its sub-requests
+_DROPPED_META = (
+    "wsgi.input", "CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE",
+)
+
+_pool_lock = threading.Lock()
+_pool = None
+
+
+def batch_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="batch")
+        return _pool
+
+
+class SubRequest(HttpRequest):
+    """A GET for `path_info`, carrying the parent request's headers, cookies and auth state."""
+
+    def __init__(self, parent, path_info, query_string):
+        super().__init__()
+        self.method = "GET"
+        self.path_info = path_info
+        self.path = parent.META.get("SCRIPT_NAME", "").rstrip("/") + path_info
+        self.META = {key: value for key, value in parent.META.items() if key not in _DROPPED_META}
+        self.META.update({
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path_info,
+            "QUERY_STRING": query_string,
+            "CONTENT_LENGTH": "0",
+            # JSON unless the path picks another format, e.g. ?format=columnar (application/vnd.columnar+json)
+            "HTTP_ACCEPT": "application/json, application/*;q=0.9",
+        })
+        self.GET = QueryDict(query_string)
+        self.COOKIES = parent.COOKIES
+        self._parent_scheme = parent.scheme
+        # state the middleware put on the parent (session/JWT fast path, user, session)
+        for attr in ("user", "session", "_token_api_request", "urlconf"):
+            if hasattr(parent, attr):
+                setattr(self, attr, getattr(parent, attr))
+
+    def _get_scheme(self):
+        return self._parent_scheme
+
+
+def _item(path, status_code, etag=None, body=b"null"):
+    return b'{"path":%s,"status":%d,"etag":%s,"body":%s}' % (
+        json.dumps(path).encode(), status_code, json.dumps(etag).encode(), body,
+    )
+
+
+def _error(path, status_code, detail):
+    return _item(path, status_code, body=json.dumps({"detail": detail}).encode())
+
+
+def _is_json_media(content_type):
+    """application/json and its +json family (e.g. the columnar renderer's application/vnd.columnar+json)."""
+    media = content_type.split(";", 1)[0].strip().lower()
+    return media == "application/json" or (media.startswith("application/") and media.endswith("+json"))
+
+
+def dispatch(parent, base, path, etag=None):
+    """Run one GET in process; returns the serialized envelope item (bytes)."""
+    split = urlsplit(path)
+    path_info = split.path if split.path.startswith("/") else base + split.path
+    if not path_info.startswith(API_PREFIX):
+        return _error(path, status.HTTP_400_BAD_REQUEST, "Only API paths can be batched.")
+    try:
+        match = resolve(path_info, getattr(parent, "urlconf", None))
+    except Resolver404:
+        return _error(path, status.HTTP_404_NOT_FOUND, "Not found.")
+    if getattr(match.func, "view_class", None) is BatchView:
+        return _error(path, status.HTTP_400_BAD_REQUEST, "Batches can't be nested.")
+
+    request = SubRequest(parent, path_info, split.query)
+    request.resolver_match = match
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, "render") and callable(response.render):
+            response = response.render()
+    except Exception:
+        logger.exception("batch sub-request %s failed", path_info)
+        return _error(path, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error.")
+    is_json = _is_json_media(response.headers.get("Content-Type", ""))
+    if response.streaming:
+        if not is_json:
+            return _error(path, status.HTTP_400_BAD_REQUEST, "Streaming responses (downloads) can't be batched.")
+        # streamed JSON lists (StreamingListMixin) are collected into one body
+        response = HttpResponse(
+            b"".join(response.streaming_content), status=response.status_code,
+            content_type=response.headers["Content-Type"],
+        )
+
+    if response.status_code == 200 and not response.has_header("ETag"):
+        set_response_etag(response)
+    response_etag = response.headers.get("ETag")
+    if etag and response_etag and response.status_code == 200 and response_etag in parse_etags(etag):
+        return _item(path, status.HTTP_304_NOT_MODIFIED, response_etag)
+
+    content = response.content
+    if not content:
+        body = b"null"
+    elif is_json:
+        body = content  # already JSON: spliced in without a parse/serialize round trip
+    else:
+        body = json.dumps(content.decode(response.charset or "utf-8", "replace")).encode()
+    return _item(path, response.status_code, response_etag, body)
+
+
+def _in_worker(parent, base, path, etag):
+    close_old_connections()
+    try:
+        return dispatch(parent, base, path, etag)
+    finally:
+        close_old_connections()
+
+
+# ======================================================
+# 📦 BATCH GET
+# ======================================================
+class BatchView(APIView):
+    """
+    POST → {"requests": [path | {"path", "etag"}, ...]} (up to 20 GETs)
+    Returns {"responses": [...]} in request order; the batch itself is 200
+    unless the envelope is malformed.
+    """
+    permission_classes = [permissions.AllowAny]  # each sub-request checks its own permissions
+
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        requests = serializer.validated_data["requests"]
+
+        parent = request._request
+        # paths without a leading slash are relative to this endpoint's parent (/api/auth/)
+        base = parent.path_info[: parent.path_info.rstrip("/").rfind("/") + 1]
+        if hasattr(parent, "user"):
+            parent.user.is_authenticated  # resolve the lazy user once, before threads share it
+
+        if len(requests) == 1:
+            items = [dispatch(parent, base, *requests[0])]
+        else:
+            futures = [batch_pool().submit(_in_worker, parent, base, path, etag) for path, etag in requests]
+            items = [future.result() for future in futures]
+        return HttpResponse(b'{"responses":[' + b",".join(items) + b"]}", content_type="application/json")
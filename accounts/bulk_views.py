@@ -0,0 +1,378 @@
+import json
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Least
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Course, Faculty, FeeRecord, Student, User
+from . import rollnumbers
+from .serializers import (
+    FacultyBulkRemoveSerializer, RollNumberBlockSerializer, StudentBatchItemSerializer, StudentBulkRemoveSerializer,
+)
+from .signals import bulk_changes, record_changes
+from .transactions import immediate_atomic
+
+
+# ======================================================
+# 🧑‍🎓 BATCH STUDENT UPDATE (promotions, course moves, fee settlement)
+# ======================================================
+class StudentBatchUpdateView(APIView):
+    """
+    PATCH → update many students in one request.
+
+    Body: a list (or {"items": [...]}) of partial student objects, each with "id".
+    Every row is validated; referenced students, courses and roll numbers are
+    looked up with one query each; valid rows are written with bulk_update in
+    a single transaction. Course moves adjust seats_available by the net
+    per-course delta. Invalid rows are reported and skipped.
+
+    Response: {"updated": n, "failed": n, "results": [{"index", "id", "status", "errors"?}]}
+    (207 when any row failed, 200 otherwise)
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def patch(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Send a non-empty list of student updates."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [
+            {"index": i, "id": item.get("id") if isinstance(item, dict) else None, "status": "error"}
+            for i, item in enumerate(items)
+        ]
+        pending = {}  # index → validated data
+
+        # --- 1. field validation, no queries ---
+        seen_ids = set()
+        for i, item in enumerate(items):
+            serializer = StudentBatchItemSerializer(data=item, partial=True)
+            if not serializer.is_valid():
+                results[i]["errors"] = serializer.errors
+                continue
+            data = serializer.validated_data
+            if "id" not in data:
+                results[i]["errors"] = {"id": ["This field is required."]}
+                continue
+            if data["id"] in seen_ids:
+                results[i]["errors"] = {"id": ["Duplicate id in batch."]}
+                continue
+            seen_ids.add(data["id"])
+            pending[i] = data
+
+        # --- 2. batch lookups: students, courses, roll numbers (one query each) ---
+        # read inside the write transaction, so a concurrent batch can't take a roll
+        # number between the check and the update
+        try:
+            with immediate_atomic():
+                students = Student.objects.in_bulk([d["id"] for d in pending.values()])
+                course_ids = {d["course"] for d in pending.values() if "course" in d}
+                courses = Course.objects.in_bulk(course_ids) if course_ids else {}
+
+                new_rolls = {}
+                for i, data in pending.items():
+                    if "roll_number" in data:
+                        new_rolls.setdefault(data["roll_number"], []).append(i)
+                taken = dict(
+                    Student.objects.filter(roll_number__in=list(new_rolls)).values_list("roll_number", "id")
+                ) if new_rolls else {}
+
+                for i, data in list(pending.items()):
+                    error = None
+                    if data["id"] not in students:
+                        error = {"id": ["Student not found."]}
+                    elif "course" in data and data["course"] not in courses:
+                        error = {"course": ["Course not found."]}
+                    elif "roll_number" in data:
+                        roll = data["roll_number"]
+                        if len(new_rolls[roll]) > 1:
+                            error = {"roll_number": ["Duplicate roll number in batch."]}
+                        elif taken.get(roll, data["id"]) != data["id"]:
+                            error = {"roll_number": ["Student with this roll number already exists."]}
+                    if error:
+                        results[i]["errors"] = error
+                        del pending[i]
+
+                # --- 3. apply ---
+                if pending:
+                    moving = {
+                        i for i, data in pending.items()
+                        if "course" in data and data["course"] != students[data["id"]].course_id
+                    }
+                    affected = set()
+                    for i in moving:
+                        affected.add(pending[i]["course"])
+                        if students[pending[i]["id"]].course_id is not None:
+                            affected.add(students[pending[i]["id"]].course_id)
+                    locked = {c.pk: c for c in Course.objects.select_for_update().filter(pk__in=affected)}
+
+                    # seats are taken in request order; a seat freed by an earlier
+                    # move becomes available to later rows of the same batch
+                    available = {pk: c.seats_available for pk, c in locked.items()}
+                    delta = {pk: 0 for pk in locked}
+                    for i in sorted(moving):
+                        student = students[pending[i]["id"]]
+                        target = pending[i]["course"]
+                        if available[target] <= 0:
+                            results[i]["errors"] = {"course": ["No seats available in selected department."]}
+                            del pending[i]
+                            continue
+                        available[target] -= 1
+                        delta[target] -= 1
+                        if student.course_id in available:
+                            available[student.course_id] += 1
+                            delta[student.course_id] += 1
+
+                    now = timezone.now()
+                    fields = {"updated_at"}
+                    changed = []
+                    for i, data in pending.items():
+                        student = students[data["id"]]
+                        for field, value in data.items():
+                            if field == "id":
+                                continue
+                            if field == "course":
+                                student.course_id = value
+                            else:
+                                setattr(student, field, value)
+                            fields.add(field)
+                        student.updated_at = now
+                        changed.append(student)
+                        results[i]["status"] = "updated"
+
+                    Student.objects.bulk_update(changed, sorted(fields), batch_size=500)
+
+                    seat_changes = []
+                    for pk, d in delta.items():
+                        if d:
+                            course = locked[pk]
+                            course.seats_available = min(course.total_seats, max(0, course.seats_available + d))
+                            seat_changes.append(course)
+                    if seat_changes:
+                        Course.objects.bulk_update(seat_changes, ["seats_available"])
+
+                    # bulk_update skips post_save, so feed the delta-sync log directly
+                    record_changes("students", [s.pk for s in changed])
+                    record_changes("courses", [c.pk for c in seat_changes])
+        except IntegrityError:
+            # a unique value (roll number) taken by a concurrent write on a database that
+            # doesn't serialize writers; nothing of this batch was saved
+            return Response(
+                {"error": "Another update changed these students at the same time; nothing was saved. Retry the batch."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        updated = sum(1 for r in results if r["status"] == "updated")
+        failed = len(results) - updated
+        return Response(
+            {"updated": updated, "failed": failed, "results": results},
+            status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK,
+        )
+
+
+# ======================================================
+# 🔢 ROLL NUMBER BLOCKS (bulk imports)
+# ======================================================
+class RollNumberBlockView(APIView):
+    """
+    POST → reserve consecutive roll numbers for a bulk import.
+
+    Body: {"course": id | null, "year": 2025, "count": n}  (year defaults to this year)
+    The whole block is taken from the (year, course) sequence with one update,
+    so admissions running at the same time continue after it.
+
+    Response: {"roll_numbers": ["25CSE0001", ...]} (201)
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = RollNumberBlockSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        course = data["course"]
+        try:
+            roll_numbers = rollnumbers.allocate(
+                data["year"], course.code if course is not None else rollnumbers.NO_COURSE, data["count"],
+            )
+        except rollnumbers.SerialsExhausted as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"roll_numbers": roll_numbers}, status=status.HTTP_201_CREATED)
+
+
+# ======================================================
+# 🗑️ BULK REMOVE (delete / archive) FOR STUDENTS & FACULTY
+# ======================================================
+class BulkRemoveView(ABC, APIView):
+    """
+    POST → delete or archive every row matching the filters, in chunks.
+
+    Body: {"action": "archive" | "delete", "dry_run": bool, "chunk_size": int, ...filters}
+    At least one filter is required. dry_run returns the match count only.
+    Otherwise the response streams newline-delimited JSON progress events:
+      {"action", "total"} → {"processed", "total"} per chunk → {"done": true, ...}
+    Each chunk runs in its own transaction, so an interrupted run can simply
+    be repeated with the same filters.
+    """
+    permission_classes = [permissions.AllowAny]
+    serializer_class = None  # validates the body: BulkRemoveSerializer plus the subclass's filters
+    default_chunk_size = 500
+
+    @abstractmethod
+    def filter_queryset(self, data):
+        """Return the queryset matching the validated filters, or None when no filter was given."""
+
+    @abstractmethod
+    def process_chunk(self, rows, action):
+        """Delete/archive one chunk; return a dict of counters to accumulate."""
+
+    def chunk_columns(self):
+        return ("pk",)
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        action = data["action"]
+
+        queryset = self.filter_queryset(data)
+        if queryset is None:
+            return Response({"error": "At least one filter is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if action == "archive":
+            queryset = self.exclude_archived(queryset)
+
+        total = queryset.count()
+        if data["dry_run"]:
+            return Response({"action": action, "matched": total}, status=status.HTTP_200_OK)
+
+        chunk_size = max(1, min(data.get("chunk_size") or self.default_chunk_size, 2000))
+
+        return StreamingHttpResponse(
+            self._run(queryset, action, chunk_size, total),
+            content_type="application/x-ndjson",
+        )
+
+    def exclude_archived(self, queryset):
+        return queryset
+
+    def _run(self, queryset, action, chunk_size, total):
+        yield json.dumps({"action": action, "total": total}) + "\n"
+        processed, last_pk, counters = 0, 0, Counter()
+        while True:
+            # keyset walk over pk: every chunk is an index range, however far we are
+            rows = list(
+                queryset.filter(pk__gt=last_pk).order_by("pk").values_list(*self.chunk_columns())[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            with transaction.atomic(), bulk_changes():
+                counters.update(self.process_chunk(rows, action))
+            processed += len(rows)
+            yield json.dumps({"processed": processed, "total": total}) + "\n"
+        yield json.dumps({"done": True, "action": action, "processed": processed, **counters}) + "\n"
+
+
+class StudentBulkRemoveView(BulkRemoveView):
+    """
+    Filters: course (id), year (roll number prefix, as in StudentListView),
+    entry_type (mode_of_entry), ids (list of student ids).
+
+    delete  → removes the students' users; students, fee records and reset
+              tokens go with them through the FK cascade, one chunk at a time.
+    archive → stamps archived_at and deactivates the users; fee history is kept.
+    Seats of non-archived students are given back to their courses in one
+    UPDATE per course per chunk.
+    """
+    serializer_class = StudentBulkRemoveSerializer
+
+    def filter_queryset(self, data):
+        students = Student.objects.all()
+        filtered = False
+        if data.get("course") is not None:
+            students = students.filter(course_id=data["course"])
+            filtered = True
+        if data.get("year") is not None:
+            students = students.filter(roll_number__startswith=str(data["year"])[-2:])
+            filtered = True
+        if data.get("entry_type"):
+            students = students.filter(mode_of_entry__iexact=data["entry_type"])
+            filtered = True
+        if data.get("ids"):
+            students = students.filter(pk__in=data["ids"])
+            filtered = True
+        return students if filtered else None
+
+    def exclude_archived(self, queryset):
+        return queryset.filter(archived_at__isnull=True)
+
+    def chunk_columns(self):
+        return ("pk", "user_id", "course_id", "archived_at")
+
+    def process_chunk(self, rows, action):
+        student_ids = [row[0] for row in rows]
+        user_ids = [row[1] for row in rows]
+        freed = Counter(row[2] for row in rows if row[2] is not None and row[3] is None)
+
+        if action == "delete":
+            fee_ids = list(FeeRecord.objects.filter(student_id__in=student_ids).values_list("pk", flat=True))
+            User.objects.filter(pk__in=user_ids).delete()
+            record_changes("students", student_ids, deleted=True)
+            record_changes("fees", fee_ids, deleted=True)
+        else:
+            now = timezone.now()
+            Student.objects.filter(pk__in=student_ids).update(archived_at=now, updated_at=now)
+            User.objects.filter(pk__in=user_ids).update(is_active=False)
+            record_changes("students", student_ids)
+
+        for course_id, count in freed.items():
+            Course.objects.filter(pk=course_id).update(
+                seats_available=Least(F("seats_available") + count, F("total_seats"))
+            )
+        record_changes("courses", list(freed))
+        return {"seats_restored": sum(freed.values())}
+
+
+class FacultyBulkRemoveView(BulkRemoveView):
+    """
+    Filters: department, ids (list of faculty ids).
+
+    delete  → removes the faculty members' users (Faculty rows cascade).
+    archive → deactivates the users and keeps the Faculty rows.
+    """
+    serializer_class = FacultyBulkRemoveSerializer
+
+    def filter_queryset(self, data):
+        faculty = Faculty.objects.all()
+        filtered = False
+        if data.get("department"):
+            faculty = faculty.filter(department__iexact=data["department"])
+            filtered = True
+        if data.get("ids"):
+            faculty = faculty.filter(pk__in=data["ids"])
+            filtered = True
+        return faculty if filtered else None
+
+    def exclude_archived(self, queryset):
+        return queryset.filter(user__is_active=True)
+
+    def chunk_columns(self):
+        return ("pk", "user_id")
+
+    def process_chunk(self, rows, action):
+        faculty_ids = [row[0] for row in rows]
+        user_ids = [row[1] for row in rows]
+        if action == "delete":
+            User.objects.filter(pk__in=user_ids).delete()
+            record_changes("faculty", faculty_ids, deleted=True)
+        else:
+            User.objects.filter(pk__in=user_ids).update(is_active=False)
+            record_changes("faculty", faculty_ids)
+        return {}
@@ -0,0 +1,95 @@
+"""
+Per-process Course catalog.
+
+Courses are few and hot: every student and fee record row shows its course
+name, and every student write validates a course id. Each worker keeps the
+static fields (name, code, credits, total_seats) of all courses in memory and
+serializers read them from here instead of joining accounts_course.
+
+Invalidation: a Course save/delete bumps a generation (generations.py) on
+commit (see signals.py) and drops this process's copy at once. Other workers
+compare their copy's version with the shared one at most every CHECK_INTERVAL
+seconds, so a rename shows up there within that interval. An id that isn't in
+the catalog reloads it immediately (a course created by another worker).
+
+seats_available changes with every admission and is never cached here:
+`live_seats()` reads it fresh, and course instances handed out by
+`course_instance()` leave it deferred, so reading it queries the database.
+"""
+import threading
+import time
+from typing import NamedTuple
+
+from . import generations
+from .models import Course
+
+VERSION_KEY = "courses:catalog:version"
+CHECK_INTERVAL = 1.0
+STATIC_FIELDS = ("id", "name", "code", "credits", "total_seats")
+
+
+class CourseInfo(NamedTuple):
+    id: int
+    name: str
+    code: str
+    credits: int
+    total_seats: int
+
+
+_lock = threading.Lock()
+_courses = None  # {id: CourseInfo}
+_version = None
+_checked_at = 0.0
+
+
+def _load():
+    global _courses, _version, _checked_at
+    with _lock:
+        version = generations.generation(VERSION_KEY)  # read before the rows: a bump in between forces a reload
+        _courses = {row[0]: CourseInfo(*row) for row in Course.objects.values_list(*STATIC_FIELDS)}
+        _version = version
+        _checked_at = time.monotonic()
+    return _courses
+
+
+def courses():
+    """{id: CourseInfo} for every course, reloaded when another worker changed one."""
+    global _checked_at
+    current = _courses
+    if current is None:
+        return _load()
+    if time.monotonic() - _checked_at >= CHECK_INTERVAL:
+        if generations.generation(VERSION_KEY) != _version:
+            return _load()
+        _checked_at = time.monotonic()
+    return current
+
+
+def get(course_id):
+    """CourseInfo for `course_id`, or None (also for a null id)."""
+    if course_id is None:
+        return None
+    info = courses().get(course_id)
+    if info is None:
+        info = _load().get(course_id)
+    return info
+
+
+def course_instance(course_id):
+    """A Course built from the catalog (seats_available deferred), or None if it doesn't exist."""
+    info = get(course_id)
+    if info is None:
+        return None
+    return Course.from_db("default", list(STATIC_FIELDS), list(info))
+
+
+def live_seats():
+    """{id: seats_available}, always from the database (one small query)."""
+    return dict(Course.objects.values_list("id", "seats_available"))
+
+
+def invalidate():
+    """A course changed (called on commit): drop this process's copy and tell the other workers."""
+    global _courses
+    _courses = None
+    generations.bump_generation(VERSION_KEY)
@@ -0,0 +1,144 @@
+"""
+Single-flight computation of expensive aggregates (dashboard, reports, fee
+summary) with stale-while-revalidate.
+
+Results are kept in the "shared" cache as (computed_at, value):
+
+- younger than AGGREGATE_FRESH_SECONDS: served as is;
+- older, up to AGGREGATE_STALE_SECONDS: served as is while one background
+  thread recomputes it;
+- missing or older than that: computed before answering.
+
+However many requests ask for the same key at once, a worker computes it at
+most once: the first caller runs it and the others wait on its Future. With
+AGGREGATE_SHARED_LOCK, workers also take a lock in the shared cache (a
+cache.add), and a worker that doesn't get it waits for the lock holder's
+result instead of running the same queries. If the holder dies or takes
+longer than LOCK_TIMEOUT, the waiter computes the result itself.
+
+The lock is only as good as cache.add: the shared cache must add atomically
+(ATOMIC_ADD_BACKENDS). FileBasedCache checks, then writes, so with it the
+setting raises ImproperlyConfigured instead of promising exclusion it can't give.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+# cache backends whose add() is a single atomic operation (SET NX, memcached add, a primary-key insert)
+ATOMIC_ADD_BACKENDS = (RedisCache, BaseMemcachedCache, DatabaseCache, LocMemCache)
+
+_lock = threading.Lock()
+_inflight = {}  # key → Future of the computation running in this process
+
+
+def shared_cache():
+    return caches["shared"]
+
+
+_pool_lock = threading.Lock()
+_pool = None
+
+
+def refresh_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="coalesce")
+        return _pool
+
+
+def _store(cache, key, value):
+    cache.set(key, (time.time(), value), settings.AGGREGATE_STALE_SECONDS)
+    return value
+
+
+def _wait_for_peer(cache, key, newer_than):
+    """Another worker holds the lock: poll for its result. None if it doesn't come in time."""
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline and cache.get(f"{key}:lock") is not None:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry[0] > newer_than:
+            return entry
+    entry = cache.get(key)
+    return entry if entry is not None and entry[0] > newer_than else None
+
+
+def _compute(key, compute, newer_than):
+    cache = shared_cache()
+    if not settings.AGGREGATE_SHARED_LOCK:
+        return _store(cache, key, compute())
+    if not isinstance(cache, ATOMIC_ADD_BACKENDS):
+        raise ImproperlyConfigured(
+            f"AGGREGATE_SHARED_LOCK needs a shared cache with an atomic add (Redis, Memcached, database); "
+            f"{type(cache).__name__} isn't one. Set REDIS_URL or turn AGGREGATE_SHARED_LOCK off."
+        )
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            return _store(cache, key, compute())
+        finally:
+            cache.delete(lock_key)
+    entry = _wait_for_peer(cache, key, newer_than)
+    return entry[1] if entry is not None else _store(cache, key, compute())
+
+
+def _join(key):
+    """(future, started): this process's computation of `key`, registered by this call if none was running."""
+    with _lock:
+        if key in _inflight:
+            return _inflight[key], False
+        future = _inflight[key] = Future()
+        return future, True
+
+
+def _fly(key, compute, future, newer_than):
+    try:
+        future.set_result(_compute(key, compute, newer_than))
+    except BaseException as exc:
+        future.set_exception(exc)
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def _fly_in_worker(key, compute, future, newer_than):
+    close_old_connections()
+    try:
+        _fly(key, compute, future, newer_than)
+    finally:
+        close_old_connections()
+    if future.exception() is not None:
+        # the stale value was already served; the next request tries again
+        logger.error("refreshing %s failed", key, exc_info=future.exception())
+
+
+def get_or_compute(key, compute):
+    """compute()'s result for `key`, computed at most once at a time per worker (and across workers)."""
+    entry = shared_cache().get(key)
+    if entry is not None:
+        computed_at, value = entry
+        if time.time() - computed_at >= settings.AGGREGATE_FRESH_SECONDS:
+            future, started = _join(key)
+            if started:
+                refresh_pool().submit(_fly_in_worker, key, compute, future, computed_at)
+        return value
+
+    future, started = _join(key)
+    if started:
+        _fly(key, compute, future, 0)
+    return future.result()
@@ -0,0 +1,306 @@
+"""
+Rank-based seat allocation (counseling).
+
+A round allocates every active applicant (waiting or already allocated) at
+once with applicant-proposing deferred acceptance:
+
+- Applicants propose to their preferred courses in order. A course keeps its
+  best proposals up to its capacity (Course.seats_available, the seats not
+  yet taken by admitted students) and rejects the rest, who move on to their
+  next preference.
+- A course ranks its proposals by OJEE rank, except that applicants who
+  already hold a seat there from an earlier round come first.
+- Each holder's preference list is cut off after the course they hold.
+
+So a later round can only move an applicant up their list: seats freed by
+withdrawals and new seats go to the best-ranked applicants who want them,
+and those applicants' old seats pass down the same way. A holder loses a seat
+only if the course's capacity dropped below its number of holders. Such
+applicants are counted as `displaced`.
+
+The engine works on flat arrays: applicant i is the i-th best rank,
+preferences are one `array` of course indexes with per-applicant offsets, and
+each course keeps a heap of the priority keys it currently holds. A round is
+O(proposals × log seats). Proposals go in rank order, so rejections only
+happen when a holder outranks someone the course already took. Results are
+written with one UPDATE per course and chunk.
+
+`commit()` turns allocated applicants into Students in bulk: one block of
+roll numbers per course, bulk-created users and students, and one seat
+update per course.
+"""
+import secrets
+import time
+from array import array
+from heapq import heappush, heapreplace
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from . import rollnumbers
+from .models import CounselingApplicant, CounselingRound, Course, Student
+from .signals import record_changes
+from .transactions import immediate_atomic
+
+User = get_user_model()
+
+ACTIVE_STATUSES = ("waiting", "allocated")
+_WRITE_BATCH = 2000
+
+
+def _chunks(items, size=_WRITE_BATCH):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ---------------------------
+# Engine (pure, array-backed)
+# ---------------------------
+def deferred_acceptance(pref_flat, pref_start, capacity, held):
+    """
+    Applicant-proposing deferred acceptance.
+
+    Applicants are 0..n-1 in rank order (0 is the best). Applicant i's
+    preferences are pref_flat[pref_start[i]:pref_start[i + 1]] (course
+    indexes). capacity[c] is the number of seats of course c, and held[i] is the
+    course applicant i holds from an earlier round, or -1. Holders of a course
+    outrank everyone else there. Returns an array of the assigned course per
+    applicant (-1 = none).
+    """
+    n = len(held)
+    assigned = array("l", [-1]) * n
+    next_pref = array("l", pref_start[:n])
+    heaps = [[] for _ in capacity]  # per course: -key of every applicant it holds (max-heap on key)
+    pending = list(range(n - 1, -1, -1))  # stack, best rank on top
+    while pending:
+        i = pending.pop()
+        end = pref_start[i + 1]
+        while next_pref[i] < end:
+            course = pref_flat[next_pref[i]]
+            next_pref[i] += 1
+            seats = capacity[course]
+            if not seats:
+                continue
+            key = i - n if held[i] == course else i  # holders first, then by rank
+            heap = heaps[course]
+            if len(heap) < seats:
+                heappush(heap, -key)
+                assigned[i] = course
+                break
+            worst = -heap[0]
+            if key < worst:
+                heapreplace(heap, -key)
+                assigned[i] = course
+                rejected = worst + n if worst < 0 else worst
+                assigned[rejected] = -1
+                pending.append(rejected)
+                break
+    return assigned
+
+
+# ---------------------------
+# Rounds
+# ---------------------------
+def _load(course_index):
+    """(applicant ids, pref_flat, pref_start, held) for every active applicant, best rank first."""
+    ids = array("q")
+    pref_flat = array("l")
+    pref_start = array("l", [0])
+    held = array("l")
+    rows = (
+        CounselingApplicant.objects.filter(status__in=ACTIVE_STATUSES)
+        .order_by("ojee_rank", "id")
+        .values_list("id", "preferences", "allocated_course_id")
+    )
+    for applicant_id, preferences, allocated_course_id in rows.iterator(chunk_size=_WRITE_BATCH):
+        hold = course_index.get(allocated_course_id, -1)
+        for course_id in preferences:
+            course = course_index.get(course_id)
+            if course is None:
+                continue  # course deleted since the preferences were submitted
+            pref_flat.append(course)
+            if course == hold:
+                break
+        else:
+            if hold != -1:
+                pref_flat.append(hold)  # preferences edited after allocation: keep the seat as a floor
+        ids.append(applicant_id)
+        held.append(hold)
+        pref_start.append(len(pref_flat))
+    return ids, pref_flat, pref_start, held
+
+
+def run_round():
+    """Run the next allocation round over all active applicants and save it. Returns the CounselingRound."""
+    started = time.perf_counter()
+    with transaction.atomic():
+        seats = list(Course.objects.order_by("id").values_list("id", "seats_available"))
+        course_ids = [course_id for course_id, _ in seats]
+        course_index = {course_id: index for index, course_id in enumerate(course_ids)}
+        capacity = array("l", (available for _, available in seats))
+
+        ids, pref_flat, pref_start, held = _load(course_index)
+        assigned = deferred_acceptance(pref_flat, pref_start, capacity, held)
+
+        number = (CounselingRound.objects.aggregate(last=Max("number"))["last"] or 0) + 1
+        moved = {}  # course index (-1 = none) → applicant ids whose seat changed
+        newly_allocated = upgraded = displaced = 0
+        for i, course in enumerate(assigned):
+            if course == held[i]:
+                continue
+            moved.setdefault(course, []).append(ids[i])
+            if held[i] == -1:
+                newly_allocated += 1
+            elif course == -1:
+                displaced += 1
+            else:
+                upgraded += 1
+
+        now = timezone.now()
+        applicants = CounselingApplicant.objects.filter(status__in=ACTIVE_STATUSES)
+        for course, applicant_ids in moved.items():
+            if course == -1:
+                values = {"allocated_course": None, "allocated_round": None, "status": "waiting"}
+            else:
+                values = {"allocated_course_id": course_ids[course], "allocated_round": number, "status": "allocated"}
+            for chunk in _chunks(applicant_ids):
+                applicants.filter(pk__in=chunk).update(updated_at=now, **values)
+
+        return CounselingRound.objects.create(
+            number=number,
+            applicants=len(ids),
+            allocated=sum(1 for course in assigned if course != -1),
+            newly_allocated=newly_allocated,
+            upgraded=upgraded,
+            displaced=displaced,
+            duration_ms=int((time.perf_counter() - started) * 1000),
+        )
+
+
+# ---------------------------
+# Commit (applicants → Students)
+# ---------------------------
+def _usernames(emails):
+    """email → a free username: the local part like StudentSerializer, or the whole address if that is taken."""
+    wanted = {email: email.split("@")[0] for email in emails}
+    candidates = list(set(wanted.values()) | set(emails))
+    taken = set()
+    for chunk in _chunks(candidates):
+        taken.update(User.objects.filter(username__in=chunk).values_list("username", flat=True))
+    usernames = {}
+    for email, local in wanted.items():
+        username = local if local not in taken else email
+        taken.add(username)
+        usernames[email] = username
+    return usernames
+
+
+def commit(admission_date=None):
+    """
+    Admit every allocated applicant as a Student, in bulk. Returns a dict of
+    counts: admitted, conflicts (e-mail already belongs to a student) and
+    over_capacity (the course filled up since the round; run another round).
+    """
+    admission_date = admission_date or timezone.localdate()
+    planned = dict(
+        CounselingApplicant.objects.filter(status="allocated").order_by()
+        .values_list("allocated_course_id").annotate(count=Count("id"))
+    )
+    codes = dict(Course.objects.filter(pk__in=list(planned)).values_list("id", "code"))
+    # reserved before the transaction (see rollnumbers.py); numbers left unused become gaps
+    roll_numbers = {
+        course_id: rollnumbers.allocate(admission_date.year, codes[course_id], count)
+        for course_id, count in planned.items() if course_id in codes
+    }
+
+    with immediate_atomic():
+        seats = dict(
+            Course.objects.select_for_update().filter(pk__in=list(roll_numbers)).values_list("id", "seats_available")
+        )
+        rows = list(
+            CounselingApplicant.objects.filter(status="allocated", allocated_course_id__in=list(roll_numbers))
+            .order_by("allocated_course_id", "ojee_rank", "id")
+            .values_list("id", "name", "email", "ojee_rank", "mode_of_entry", "allocated_course_id",
+                         "preferences", "allocated_round")
+        )
+        # e-mails are stored lower-case (see CounselingApplicantSerializer); users may not be
+        existing = {}  # email → (user id, student id or None)
+        for chunk in _chunks([row[2] for row in rows]):
+            existing.update(
+                (email, (user_id, student_id))
+                for email, user_id, student_id in User.objects.annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=chunk).values_list("email_lower", "id", "student__id")
+            )
+
+        admit, conflicts, over_capacity = [], 0, 0
+        taken = {course_id: 0 for course_id in roll_numbers}
+        for row in rows:
+            course_id = row[5]
+            user = existing.get(row[2])
+            if user is not None and user[1] is not None:
+                conflicts += 1
+            elif taken[course_id] >= min(seats.get(course_id, 0), len(roll_numbers[course_id])):
+                over_capacity += 1
+            else:
+                admit.append((row, roll_numbers[course_id][taken[course_id]]))
+                taken[course_id] += 1
+
+        user_ids = {email: user_id for email, (user_id, _) in existing.items()}
+        reused = [user_ids[row[2]] for row, _ in admit if row[2] in user_ids]
+        for chunk in _chunks(reused):
+            User.objects.filter(pk__in=chunk).update(role="student")
+        usernames = _usernames([row[2] for row, _ in admit if row[2] not in user_ids])
+        new_users = []
+        for row, _ in admit:
+            if row[2] not in user_ids:
+                first_name, _, last_name = row[1].partition(" ")
+                new_users.append(User(
+                    username=usernames[row[2]], email=row[2], role="student",
+                    first_name=first_name, last_name=last_name,
+                    # unusable, like make_password(None) but without its per-character random choice
+                    password=UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(30),  # set via forgot-password
+                ))
+        User.objects.bulk_create(new_users, batch_size=_WRITE_BATCH)
+        user_ids.update((user.email, user.pk) for user in new_users)
+
+        students = Student.objects.bulk_create(
+            [
+                Student(
+                    user_id=user_ids[row[2]], name=row[1], course_id=row[5], admission_date=admission_date,
+                    roll_number=roll_number, ojee_rank=str(row[3]), mode_of_entry=row[4],
+                    fees_paid=0, total_fees=0,
+                )
+                for row, roll_number in admit
+            ],
+            batch_size=_WRITE_BATCH,
+        )
+
+        # an upsert on the primary key writes status and student for every row in one statement per
+        # batch (bulk_update would build a CASE expression per row)
+        CounselingApplicant.objects.bulk_create(
+            [
+                CounselingApplicant(
+                    pk=row[0], name=row[1], email=row[2], ojee_rank=row[3], mode_of_entry=row[4],
+                    allocated_course_id=row[5], preferences=row[6], allocated_round=row[7],
+                    status="admitted", student_id=student.pk,
+                )
+                for (row, _), student in zip(admit, students)
+            ],
+            batch_size=_WRITE_BATCH,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["status", "student", "updated_at"],
+        )
+        for course_id, count in taken.items():
+            if count:
+                Course.objects.filter(pk=course_id).update(seats_available=F("seats_available") - count)
+
+        # bulk writes skip post_save, so feed the delta-sync log directly
+        record_changes("students", [student.pk for student in students])
+        record_changes("courses", [course_id for course_id, count in taken.items() if count])
+
+    return {"admitted": len(students), "conflicts": conflicts, "over_capacity": over_capacity}
@@ -0,0 +1,104 @@
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import counseling, rollnumbers
+from .models import CounselingApplicant, CounselingRound
+from .pagination import KeysetPagination
+from .serializers import CounselingApplicantSerializer, CounselingRoundSerializer
+
+MAX_APPLICANTS_PER_REQUEST = 10_000
+
+
+class ApplicantPagination(KeysetPagination):
+    ordering = ("ojee_rank", "id")
+
+
+# ======================================================
+# 🎯 COUNSELING APPLICANTS
+# ======================================================
+class CounselingApplicantListCreateView(generics.ListCreateAPIView):
+    """
+    GET → applicants by rank (?status=waiting|allocated|withdrawn|admitted, ?course=<allocated course>)
+    POST → one applicant, or a list of up to 10 000 (bulk-created)
+      {"name", "email", "ojee_rank", "preferences": [course ids, best first], "mode_of_entry"?}
+    """
+    serializer_class = CounselingApplicantSerializer
+    pagination_class = ApplicantPagination
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        applicants = CounselingApplicant.objects.all()
+        params = self.request.query_params
+        if params.get("status"):
+            applicants = applicants.filter(status=params["status"])
+        if params.get("course"):
+            applicants = applicants.filter(allocated_course_id=params["course"])
+        return applicants
+
+    def create(self, request, *args, **kwargs):
+        many = isinstance(request.data, list)
+        if many and not 0 < len(request.data) <= MAX_APPLICANTS_PER_REQUEST:
+            return Response(
+                {"error": f"Send between 1 and {MAX_APPLICANTS_PER_REQUEST} applicants per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = self.get_serializer(data=request.data, many=many)
+        if not serializer.is_valid():
+            return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        applicants = serializer.save()
+        if many:
+            return Response({"created": len(applicants)}, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class CounselingApplicantDetailView(generics.RetrieveUpdateAPIView):
+    """
+    GET → one applicant
+    PUT/PATCH → update preferences or details, or {"status": "withdrawn"} to give up a seat
+    (the seat goes to the next applicants in the following round)
+    """
+    queryset = CounselingApplicant.objects.all()
+    serializer_class = CounselingApplicantSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+# ======================================================
+# 🔁 ALLOCATION ROUNDS & COMMIT
+# ======================================================
+class CounselingRoundListCreateView(APIView):
+    """
+    GET → all rounds so far
+    POST → run the next round over every waiting and allocated applicant
+    (deferred acceptance by OJEE rank; holders can only move up their list)
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        rounds = CounselingRound.objects.order_by("number")
+        return Response(CounselingRoundSerializer(rounds, many=True).data)
+
+    def post(self, request):
+        result = counseling.run_round()
+        return Response(CounselingRoundSerializer(result).data, status=status.HTTP_201_CREATED)
+
+
+class CounselingCommitView(APIView):
+    """
+    POST → {"admission_date"?: "2025-08-01"}: admit every allocated applicant
+    as a Student in bulk (roll numbers allocated per course, no password set:
+    students use forgot-password). Returns {"admitted", "conflicts", "over_capacity"}.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        field = serializers.DateField(required=False, allow_null=True)
+        try:
+            admission_date = field.run_validation(request.data.get("admission_date"))
+        except serializers.ValidationError as exc:
+            return Response({"error": {"admission_date": exc.detail}}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = counseling.commit(admission_date)
+        except rollnumbers.SerialsExhausted as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
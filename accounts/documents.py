@@ -0,0 +1,275 @@
+"""
+Minimal PDF and XLSX writers for the export jobs (stdlib only).
+
+A document is plain data, so it can be pickled to a worker process:
+
+    {"title": "Fee receipt #12",
+     "meta": [["Student", "Asha Rao"], ["Date", "2026-10-01"]],
+     "tables": [{"title": "Payments", "columns": ["Date", "Amount"],
+                 "rows": [["2026-10-01", 5000.0], ...]}]}
+
+Neither writer imports Django; render_to_file() is what runs in the pool.
+"""
+import io
+import os
+import tempfile
+import zipfile
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, Decimal):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+# ---------------------------
+# PDF (A4, Helvetica, text + fixed-column tables)
+# ---------------------------
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 40
+FONT_SIZE = 9
+LINE_HEIGHT = 12
+CHAR_WIDTH = FONT_SIZE * 0.52  # average Helvetica advance, good enough for column layout
+
+
+def _pdf_string(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def _column_offsets(columns, rows):
+    widths = [len(_text(c)) for c in columns]
+    for row in rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(_text(value)))
+    usable = PAGE_WIDTH - 2 * MARGIN
+    total = sum(w + 2 for w in widths) * CHAR_WIDTH
+    scale = min(1.0, usable / total) if total else 1.0
+    offsets, x = [], MARGIN
+    for w in widths:
+        offsets.append(x)
+        x += (w + 2) * CHAR_WIDTH * scale
+    max_chars = [max(1, int((w + 2) * scale) - 1) for w in widths]
+    return offsets, max_chars
+
+
+def _pdf_lines(document):
+    """Flatten the document into (x, font, text) lines, None = blank line."""
+    lines = [(MARGIN, "F2", document.get("title", ""))]
+    lines.append(None)
+    for key, value in document.get("meta", []):
+        lines.append([(MARGIN, "F2", f"{key}:"), (MARGIN + 110, "F1", _text(value))])
+    for table in document.get("tables", []):
+        lines.append(None)
+        if table.get("title"):
+            lines.append((MARGIN, "F2", table["title"]))
+        columns, rows = table["columns"], table["rows"]
+        offsets, max_chars = _column_offsets(columns, rows)
+        lines.append([(x, "F2", _text(c)[:n]) for x, c, n in zip(offsets, columns, max_chars)])
+        for row in rows:
+            lines.append([(x, "F1", _text(v)[:n]) for x, v, n in zip(offsets, row, max_chars)])
+    return lines
+
+
+def render_pdf(document):
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+    lines = _pdf_lines(document)
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    streams = []
+    for number, page in enumerate(pages, start=1):
+        ops = []
+        y = PAGE_HEIGHT - MARGIN
+        for line in page:
+            if line is not None:
+                for x, font, text in (line if isinstance(line, list) else [line]):
+                    if text:
+                        ops.append(f"BT /{font} {FONT_SIZE} Tf {x:.1f} {y} Td {_pdf_string(text)} Tj ET")
+            y -= LINE_HEIGHT
+        footer = f"Page {number} of {len(pages)}"
+        ops.append(f"BT /F1 7 Tf {PAGE_WIDTH - MARGIN - 50} {MARGIN / 2:.0f} Td {_pdf_string(footer)} Tj ET")
+        streams.append("\n".join(ops).encode("latin-1"))
+
+    # objects: 1 catalog, 2 pages, 3-4 fonts, then (page, content) pairs
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # pages tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for stream in streams:
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        kids.append(f"{page_id} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        stream = zlib.compress(stream)
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# ---------------------------
+# XLSX (one sheet per table, inline strings)
+# ---------------------------
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell(ref, value, bold=False):
+    style = ' s="1"' if bold else ""
+    if isinstance(value, bool) or value is None:
+        value = "" if value is None else str(value)
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"{style}><v>{value}</v></c>'
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    text = escape(str(value))
+    return f'<c r="{ref}" t="inlineStr"{style}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _sheet_xml(rows, header_rows):
+    out = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+           '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>']
+    for r, row in enumerate(rows, start=1):
+        cells = "".join(
+            _cell(f"{_column_letter(c)}{r}", value, bold=r in header_rows) for c, value in enumerate(row)
+        )
+        out.append(f'<row r="{r}">{cells}</row>')
+    out.append("</sheetData></worksheet>")
+    return "".join(out)
+
+
+def _sheet_name(name, used):
+    clean = "".join(ch for ch in name if ch not in '[]:*?/\\')[:31] or "Sheet"
+    candidate, n = clean, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate, n = clean[:31 - len(suffix)] + suffix, n + 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def render_xlsx(document):
+    sheets = []
+    summary = [[document.get("title", "")], []] + [[key, value] for key, value in document.get("meta", [])]
+    sheets.append(("Summary", summary, {1}))
+    for table in document.get("tables", []):
+        sheets.append((table.get("title") or "Data", [table["columns"]] + list(table["rows"]), {1}))
+
+    used = set()
+    names = [_sheet_name(name, used) for name, _, _ in sheets]
+    content_types = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    workbook_sheets = "".join(
+        f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>' for i, name in enumerate(names, start=1)
+    )
+    workbook_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    styles_id = len(sheets) + 1
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{content_types}</Types>'
+        ))
+        archive.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        archive.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{workbook_sheets}</sheets></workbook>'
+        ))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{workbook_rels}<Relationship Id="rId{styles_id}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        archive.writestr("xl/styles.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+            '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+            '</styleSheet>'
+        ))
+        for i, (_, rows, header_rows) in enumerate(sheets, start=1):
+            archive.writestr(f"xl/worksheets/sheet{i}.xml", _sheet_xml(rows, header_rows))
+    return buffer.getvalue()
+
+
+RENDERERS = {"pdf": render_pdf, "xlsx": render_xlsx}
+
+
+def render_to_file(fmt, document, path):
+    """Render and atomically move the result into place. Returns the file size."""
+    data = RENDERERS[fmt](document)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return len(data)
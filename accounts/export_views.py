@@ -0,0 +1,65 @@
+import os
+
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import exports
+from .documents import CONTENT_TYPES
+from .models import ExportJob
+from .serializers import ExportJobSerializer, ExportRequestSerializer
+
+
+# ======================================================
+# 🧾 EXPORT JOBS (PDF / XLSX receipts, statements, reports)
+# ======================================================
+class ExportJobCreateView(APIView):
+    """
+    POST → {"kind": "fee_receipt" | "course_statement" | "fee_report",
+            "format": "pdf" | "xlsx", "fee": id, "course": id}
+
+    202 with the queued job, or 200 when the document already exists for the
+    current data (or is being generated by an earlier request). Poll
+    GET exports/<id>/ until status is "done", then follow download_url.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = ExportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        job, queued = exports.request_export(data["kind"], data["format"], data["params"], request.user)
+        return Response(
+            ExportJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED if queued else status.HTTP_200_OK,
+        )
+
+
+class ExportJobDetailView(APIView):
+    """GET → job status (queued / running / done / failed)."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk)
+        return Response(ExportJobSerializer(job, context={"request": request}).data)
+
+
+class ExportDownloadView(APIView):
+    """GET → the generated file, streamed from disk."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk)
+        if job.status != "done":
+            return Response({"error": f"Export is {job.status}.", "status": job.status}, status=status.HTTP_409_CONFLICT)
+        path = exports.file_path(job.cache_key, job.format)
+        if not os.path.exists(path):
+            return Response({"error": "Export file has expired, request it again."}, status=status.HTTP_410_GONE)
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=exports.download_name(job),
+            content_type=CONTENT_TYPES[job.format],
+        )
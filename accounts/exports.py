@@ -0,0 +1,294 @@
+"""
+Export jobs: fee receipts, course fee statements and the fee report as PDF/XLSX.
+
+Requests never build documents themselves:
+
+  POST  → request_export() returns a finished job straight away when the same
+          document over the same data already exists on disk, joins an
+          in-flight job for it, or queues a new one.
+  queue → a dispatcher thread loads the data (ORM, plain Python values) and
+          hands it to a process pool that renders and writes the file.
+
+Files live at EXPORT_ROOT/<key[:2]>/<key>.<format>, where key hashes the
+document kind, format, parameters and the version of the rows that document
+reads (data_version): the latest ChangeLog id among them, plus their counts
+where rows can drop out of the document (a student moved to another course, a
+deleted fee record). A change to one of those rows produces a new key, so old
+files are never served for new data, and changes elsewhere leave a cached
+receipt or statement valid. Only the fee report, which reads everything, is
+keyed on the latest ChangeLog id overall.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from . import documents
+from .models import ChangeLog, Course, ExportJob, FeeRecord, Student
+
+# bump when a document layout changes so cached files are regenerated
+LAYOUT_VERSION = 1
+# queued/running jobs older than this are assumed lost (e.g. worker restarted)
+STALE_AFTER = timedelta(minutes=10)
+INSTITUTE = "Synergy Institute"
+
+
+def export_root():
+    return str(getattr(settings, "EXPORT_ROOT", "") or os.path.join(tempfile.gettempdir(), "college_project_exports"))
+
+
+def _latest_change(entity, object_ids):
+    return ChangeLog.objects.filter(entity=entity, object_id__in=object_ids).aggregate(version=Max("id"))["version"] or 0
+
+
+def data_version(kind, params):
+    """
+    Version of the rows the `kind` document reads, as a list: the latest
+    change id among them first (stored as ExportJob.data_version), then row
+    counts if any. Each lookup is an index seek per row (changelog_object_seq_idx).
+    """
+    if kind == "fee_receipt":
+        row = FeeRecord.objects.filter(pk=params["fee"]).values_list("student_id", "student__course_id").first()
+        student_id, course_id = row or (None, None)
+        return [max(
+            _latest_change("fees", [params["fee"]]),
+            _latest_change("students", [student_id]),
+            _latest_change("courses", [course_id]),
+        )]
+    if kind == "course_statement":
+        students = Student.objects.filter(course=params["course"], archived_at__isnull=True)
+        records = FeeRecord.objects.filter(student__in=students)
+        return [
+            max(
+                _latest_change("courses", [params["course"]]),
+                _latest_change("students", students.values("id")),
+                _latest_change("fees", records.values("id")),
+            ),
+            students.count(),
+            records.count(),
+        ]
+    return [ChangeLog.objects.aggregate(version=Max("id"))["version"] or 0]
+
+
+def cache_key(kind, fmt, params, version):
+    raw = json.dumps([LAYOUT_VERSION, kind, fmt, params, version], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def file_path(key, fmt):
+    return os.path.join(export_root(), key[:2], f"{key}.{fmt}")
+
+
+def download_name(job):
+    suffix = "-".join(str(v) for _, v in sorted(job.params.items()))
+    name = f"{job.kind}-{suffix}" if suffix else job.kind
+    return f"{name}-v{job.data_version}.{job.format}"
+
+
+# ---------------------------
+# Document builders (run in the dispatcher thread, return plain data)
+# ---------------------------
+def _money(value):
+    return float(value or 0)
+
+
+def build_fee_receipt(params):
+    fee = FeeRecord.objects.select_related("student__user", "student__course").get(pk=params["fee"])
+    student = fee.student
+    return {
+        "title": f"{INSTITUTE} - Fee receipt #{fee.pk}",
+        "meta": [
+            ["Student", student.name or student.user.get_full_name() or student.user.username],
+            ["Roll number", student.roll_number],
+            ["Course", student.course.name if student.course else "-"],
+            ["Date", fee.date_paid.isoformat()],
+            ["Amount", _money(fee.amount)],
+            ["Status", fee.get_status_display()],
+            ["Total fees", _money(student.total_fees)],
+            ["Paid to date", _money(student.fees_paid)],
+            ["Outstanding", _money(student.pending_amount)],
+        ],
+        "tables": [],
+    }
+
+
+def build_course_statement(params):
+    course = Course.objects.get(pk=params["course"])
+    students = list(
+        Student.objects.filter(course=course, archived_at__isnull=True)
+        .order_by("roll_number", "id")
+        .values_list("id", "roll_number", "name", "total_fees", "fees_paid", "pending_amount")
+    )
+    records = (
+        FeeRecord.objects.filter(student__course=course, student__archived_at__isnull=True)
+        .order_by("student__roll_number", "date_paid", "id")
+        .values_list("id", "student__roll_number", "date_paid", "amount", "status")
+    )
+    totals = {"total": 0.0, "paid": 0.0, "pending": 0.0}
+    rows = []
+    for _, roll_number, name, total_fees, fees_paid, pending in students:
+        rows.append([roll_number, name or "", _money(total_fees), _money(fees_paid), _money(pending)])
+        totals["total"] += _money(total_fees)
+        totals["paid"] += _money(fees_paid)
+        totals["pending"] += _money(pending)
+    return {
+        "title": f"{INSTITUTE} - Fee statement: {course.name} ({course.code})",
+        "meta": [
+            ["Students", len(students)],
+            ["Total fees", totals["total"]],
+            ["Collected", totals["paid"]],
+            ["Outstanding", totals["pending"]],
+        ],
+        "tables": [
+            {
+                "title": "Students",
+                "columns": ["Roll number", "Name", "Total fees", "Paid", "Outstanding"],
+                "rows": rows,
+            },
+            {
+                "title": "Payments",
+                "columns": ["Receipt", "Roll number", "Date", "Amount", "Status"],
+                "rows": [
+                    [pk, roll_number, date_paid.isoformat(), _money(amount), status]
+                    for pk, roll_number, date_paid, amount, status in records.iterator(chunk_size=5000)
+                ],
+            },
+        ],
+    }
+
+
+def build_fee_report(params):
+    by_status = dict(
+        FeeRecord.objects.order_by().values("status").annotate(total=Sum("amount")).values_list("status", "total")
+    )
+    courses = (
+        Course.objects.order_by("name")
+        .annotate(
+            students=Count("student", filter=Q(student__archived_at__isnull=True)),
+            billed=Sum("student__total_fees", filter=Q(student__archived_at__isnull=True)),
+            collected=Sum("student__fees_paid", filter=Q(student__archived_at__isnull=True)),
+            outstanding=Sum("student__pending_amount", filter=Q(student__archived_at__isnull=True)),
+        )
+        .values_list("code", "name", "students", "billed", "collected", "outstanding")
+    )
+    return {
+        "title": f"{INSTITUTE} - Fee report",
+        "meta": [
+            ["Students", Student.objects.filter(archived_at__isnull=True).count()],
+            ["Paid", _money(by_status.get("paid"))],
+            ["Pending", _money(by_status.get("pending"))],
+            ["Overdue", _money(by_status.get("overdue"))],
+        ],
+        "tables": [
+            {
+                "title": "By course",
+                "columns": ["Code", "Course", "Students", "Billed", "Collected", "Outstanding"],
+                "rows": [
+                    [code, name, count, _money(billed), _money(collected), _money(outstanding)]
+                    for code, name, count, billed, collected, outstanding in courses
+                ],
+            },
+        ],
+    }
+
+
+BUILDERS = {
+    "fee_receipt": build_fee_receipt,
+    "course_statement": build_course_statement,
+    "fee_report": build_fee_report,
+}
+
+
+# ---------------------------
+# Pools
+# ---------------------------
+_pool_lock = threading.Lock()
+_render_pool = None
+_dispatcher = None
+
+
+def _workers():
+    return max(1, int(getattr(settings, "EXPORT_WORKERS", 2)))
+
+
+def render_pool():
+    """Process pool for rendering. Created lazily, i.e. after gunicorn forks."""
+    global _render_pool
+    with _pool_lock:
+        if _render_pool is None:
+            # never fork a threaded web worker: start children from a clean interpreter
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _render_pool = ProcessPoolExecutor(max_workers=_workers(), mp_context=multiprocessing.get_context(method))
+        return _render_pool
+
+
+def dispatcher():
+    global _dispatcher
+    with _pool_lock:
+        if _dispatcher is None:
+            _dispatcher = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="export")
+        return _dispatcher
+
+
+# ---------------------------
+# Jobs
+# ---------------------------
+def request_export(kind, fmt, params, user=None):
+    """Returns (job, queued): a finished or in-flight job is reused when possible."""
+    version = data_version(kind, params)
+    key = cache_key(kind, fmt, params, version)
+    requested_by = user if user is not None and user.is_authenticated else None
+
+    if os.path.exists(file_path(key, fmt)):
+        job = ExportJob.objects.filter(cache_key=key, status="done").first()
+        if job is None:  # file kept, job rows purged
+            job = ExportJob.objects.create(
+                kind=kind, format=fmt, params=params, data_version=version[0], cache_key=key,
+                status="done", size=os.path.getsize(file_path(key, fmt)),
+                requested_by=requested_by, finished_at=timezone.now(),
+            )
+        return job, False
+
+    in_flight = ExportJob.objects.filter(
+        cache_key=key, status__in=["queued", "running"], created_at__gte=timezone.now() - STALE_AFTER,
+    ).first()
+    if in_flight:
+        return in_flight, False
+
+    job = ExportJob.objects.create(
+        kind=kind, format=fmt, params=params, data_version=version[0], cache_key=key, requested_by=requested_by,
+    )
+    transaction.on_commit(lambda: dispatcher().submit(run_job, job.pk))
+    return job, True
+
+
+def run_job(job_id):
+    """Dispatcher thread: load the data, render it in the process pool, record the outcome."""
+    close_old_connections()
+    try:
+        job = ExportJob.objects.get(pk=job_id)
+        ExportJob.objects.filter(pk=job_id).update(status="running")
+        with transaction.atomic():
+            version = data_version(job.kind, job.params)
+            document = BUILDERS[job.kind](job.params)
+        # key the file by what was actually read (the data may have changed after the request)
+        key = cache_key(job.kind, job.format, job.params, version)
+        size = render_pool().submit(documents.render_to_file, job.format, document, file_path(key, job.format)).result()
+        ExportJob.objects.filter(pk=job_id).update(
+            status="done", size=size, data_version=version[0], cache_key=key, finished_at=timezone.now(),
+        )
+    except Exception as exc:
+        ExportJob.objects.filter(pk=job_id).update(
+            status="failed", error=f"{type(exc).__name__}: {exc}"[:2000], finished_at=timezone.now(),
+        )
+    finally:
+        connection.close()
@@ -0,0 +1,214 @@
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import FeeRecord, Student
+from .pagination import KeysetPagination
+from .serializers import FeeDefaulterSerializer, FeePaymentSerializer
+from .signals import record_changes, refresh_last_paid
+
+
+# ======================================================
+# 💸 FEE DEFAULTERS (students with outstanding fees)
+# ======================================================
+class FeeDefaulterPagination(KeysetPagination):
+    page_size = 200
+
+
+class FeeDefaulterListView(generics.ListAPIView):
+    """
+    GET → Students owing fees, largest outstanding amount first.
+
+    Query params (all optional, all applied in SQL):
+      min_due / max_due  → outstanding amount range (min_due defaults to > 0)
+      course             → course id
+      department         → course name (contains)
+      year               → admission year, matched on the roll number prefix
+      entry_type         → mode_of_entry
+      ordering           → "-pending_amount" (default) or "pending_amount"
+      cursor, page_size  → keyset pagination
+    """
+    serializer_class = FeeDefaulterSerializer
+    pagination_class = FeeDefaulterPagination
+    permission_classes = [permissions.AllowAny]
+
+    def _decimal_param(self, name):
+        value = self.request.query_params.get(name)
+        if value in (None, ""):
+            return None
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({name: "Must be a number."})
+
+    @property
+    def keyset_ordering(self):
+        if self.request.query_params.get("ordering") == "pending_amount":
+            return ("pending_amount", "id")
+        return ("-pending_amount", "-id")
+
+    def get_queryset(self):
+        params = self.request.query_params
+        students = Student.objects.select_related("user")  # course names: catalog
+
+        min_due = self._decimal_param("min_due")
+        max_due = self._decimal_param("max_due")
+        if min_due is None:
+            students = students.filter(pending_amount__gt=0)
+        else:
+            students = students.filter(pending_amount__gte=min_due)
+        if max_due is not None:
+            students = students.filter(pending_amount__lte=max_due)
+
+        course = params.get("course")
+        if course:
+            if not course.isdigit():
+                raise ValidationError({"course": "Must be a course id."})
+            students = students.filter(course_id=int(course))
+
+        dept = params.get("department")
+        if dept:
+            students = students.filter(course__name__icontains=dept)
+
+        # same convention as StudentListView: year=2023 → roll numbers starting with '23'
+        year = params.get("year")
+        if year:
+            students = students.filter(roll_number__startswith=str(year)[-2:])
+
+        entry_type = params.get("entry_type")
+        if entry_type:
+            students = students.filter(mode_of_entry__iexact=entry_type)
+
+        return students
+
+
+# ======================================================
+# 🧾 BULK PAYMENT POSTING (idempotent)
+# ======================================================
+class FeePaymentPostView(APIView):
+    """
+    POST → post a batch of payments.
+
+    Body: a list (or {"payments": [...]}) of
+      {"idempotency_key", "student", "amount", "date_paid"?, "status"?="paid"}
+
+    In one transaction the new FeeRecords are inserted with bulk_create and
+    each student's fees_paid is incremented by the sum of their "paid"
+    amounts with set-based UPDATEs (F-expression, no read-modify-write).
+    A key that was already posted is reported as "duplicate" with the
+    existing fee id, so terminals can safely retry a whole batch.
+
+    Response: {"posted": n, "duplicates": n, "failed": n, "results": [...]}
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        items = request.data.get("payments") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Send a non-empty list of payments."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = []
+        valid = {}  # index → validated payment
+        first_index_for_key = {}
+        for i, item in enumerate(items):
+            serializer = FeePaymentSerializer(data=item)
+            result = {"index": i, "idempotency_key": item.get("idempotency_key") if isinstance(item, dict) else None}
+            results.append(result)
+            if not serializer.is_valid():
+                result.update(status="error", errors=serializer.errors)
+                continue
+            key = serializer.validated_data["idempotency_key"]
+            if key in first_index_for_key:
+                result.update(status="duplicate", duplicate_of=first_index_for_key[key])
+                continue
+            first_index_for_key[key] = i
+            valid[i] = serializer.validated_data
+
+        known_students = set(
+            Student.objects.filter(pk__in={p["student"] for p in valid.values()}).values_list("pk", flat=True)
+        )
+        for i, payment in list(valid.items()):
+            if payment["student"] not in known_students:
+                results[i].update(status="error", errors={"student": ["Student not found."]})
+                del valid[i]
+
+        if valid:
+            # a concurrent retry of the same keys can win the race between our
+            # existence check and the insert; the second attempt then sees them
+            for attempt in range(2):
+                try:
+                    self._post(valid, results)
+                    break
+                except IntegrityError:
+                    if attempt:
+                        raise
+
+        counts = defaultdict(int)
+        for result in results:
+            counts[result["status"]] += 1
+        return Response({
+            "posted": counts["posted"],
+            "duplicates": counts["duplicate"],
+            "failed": counts["error"],
+            "results": results,
+        }, status=status.HTTP_207_MULTI_STATUS if counts["error"] else status.HTTP_200_OK)
+
+    def _post(self, valid, results):
+        today = timezone.now().date()
+        with transaction.atomic():
+            existing = dict(
+                FeeRecord.objects.filter(
+                    idempotency_key__in=[p["idempotency_key"] for p in valid.values()]
+                ).values_list("idempotency_key", "id")
+            )
+
+            new_records = []
+            indexes = []
+            paid_by_student = defaultdict(Decimal)
+            for i, payment in valid.items():
+                key = payment["idempotency_key"]
+                if key in existing:
+                    results[i].update(status="duplicate", fee_id=existing[key])
+                    continue
+                new_records.append(FeeRecord(
+                    student_id=payment["student"],
+                    amount=payment["amount"],
+                    date_paid=payment.get("date_paid") or today,
+                    status=payment["status"],
+                    idempotency_key=key,
+                ))
+                indexes.append(i)
+                if payment["status"] == "paid":
+                    paid_by_student[payment["student"]] += payment["amount"]
+
+            FeeRecord.objects.bulk_create(new_records, batch_size=1000)
+            for i, record in zip(indexes, new_records):
+                results[i].update(status="posted", fee_id=record.pk)
+
+            # one UPDATE ... SET fees_paid = fees_paid + CASE id WHEN .. END per 500 students
+            money = DecimalField(max_digits=10, decimal_places=2)
+            totals = list(paid_by_student.items())
+            for start in range(0, len(totals), 500):
+                chunk = totals[start:start + 500]
+                increment = Case(
+                    *[When(pk=pk, then=Value(total, output_field=money)) for pk, total in chunk],
+                    default=Value(Decimal("0"), output_field=money),
+                    output_field=money,
+                )
+                Student.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+                    fees_paid=Coalesce(F("fees_paid"), Value(Decimal("0"), output_field=money)) + increment,
+                    updated_at=timezone.now(),
+                )
+
+            # bulk paths skip post_save: keep last_paid_on and the delta-sync log current
+            refresh_last_paid(paid_by_student)
+            record_changes("fees", [r.pk for r in new_records])
+            record_changes("students", list(paid_by_student))
@@ -0,0 +1,89 @@
+"""
+Per-user announcement feed state.
+
+Read state is a single watermark per user (AnnouncementWatermark): anything
+created after it is unread. The unread count is then an index range count on
+(target_audience, created_at), capped at BADGE_CAP so it never scans more
+than BADGE_CAP + 1 index entries.
+
+Badge counts are cached in the "shared" cache under a key that includes an
+announcement generation number (GENERATION_KEY, see generations.py). Any
+announcement save/delete bumps the generation (see signals.py), and marking
+the feed as seen drops the user's key.
+"""
+from django.core.cache import caches
+from django.db.models import Max
+
+from .generations import generation
+from .models import Announcement, AnnouncementWatermark
+
+BADGE_CAP = 99
+BADGE_TIMEOUT = 300
+GENERATION_KEY = "announcements:generation"
+
+# User.role → audiences whose announcements the user sees
+AUDIENCES = {
+    "student": ("all", "students"),
+    "teacher": ("all", "faculty"),
+    "admin": ("all", "students", "faculty"),
+}
+
+
+def shared_cache():
+    return caches["shared"]
+
+
+def audiences_for(role):
+    return AUDIENCES.get(role, ("all",))
+
+
+def visible_announcements(role):
+    return Announcement.objects.filter(target_audience__in=audiences_for(role))
+
+
+def get_watermark(user_id):
+    return (
+        AnnouncementWatermark.objects.filter(user_id=user_id).values_list("last_seen_at", flat=True).first()
+    )
+
+
+def unread_count(role, watermark, cap=BADGE_CAP):
+    """(count, capped): counts at most cap + 1 rows."""
+    unread = visible_announcements(role)
+    if watermark is not None:
+        unread = unread.filter(created_at__gt=watermark)
+    count = unread.order_by()[:cap + 1].count()
+    return min(count, cap), count > cap
+
+
+def mark_seen(user_id, role, up_to=None):
+    """
+    Move the user's watermark forward to `up_to` (an announcement) or to the
+    newest visible announcement. Never moves it back. Returns the watermark.
+    """
+    if up_to is None:
+        seen_at = visible_announcements(role).aggregate(newest=Max("created_at"))["newest"]
+    else:
+        seen_at = up_to.created_at
+    current = get_watermark(user_id)
+    if seen_at is None or (current is not None and seen_at <= current):
+        return current
+    AnnouncementWatermark.objects.update_or_create(user_id=user_id, defaults={"last_seen_at": seen_at})
+    shared_cache().delete(badge_key(user_id))
+    return seen_at
+
+
+def badge_key(user_id, gen=None):
+    return f"announcements:badge:{gen if gen is not None else generation(GENERATION_KEY)}:{user_id}"
+
+
+def badge(user_id, load_role):
+    """Cached (count, capped); `load_role()` is only called on a cache miss."""
+    cache = shared_cache()
+    key = badge_key(user_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    value = unread_count(load_role(), get_watermark(user_id))
+    cache.set(key, value, BADGE_TIMEOUT)
+    return value
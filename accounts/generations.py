@@ -0,0 +1,38 @@
+"""
+Generation counters in the "shared" cache.
+
+A generation is a number that a writer bumps whenever some data changes;
+readers put the current value into their cache keys (or compare it with the
+one they loaded), so old entries simply stop being read. Each feature owns
+its key: the announcement feed (feed.GENERATION_KEY), the course catalog
+(catalog.VERSION_KEY) and the holidays list (HOLIDAYS_KEY below, which has no
+module of its own). Bumps go through signals.py, after the commit.
+"""
+import time
+
+from django.core.cache import caches
+
+# upcoming holidays (student profile section, see profile.py)
+HOLIDAYS_KEY = "holidays:generation"
+
+
+def shared_cache():
+    return caches["shared"]
+
+
+def generation(key):
+    cache = shared_cache()
+    value = cache.get(key)
+    if value is None:
+        # evicted or first use: a fresh value can't collide with keys built from older ones
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def bump_generation(key):
+    cache = shared_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
@@ -0,0 +1,192 @@
+"""
+Marks → grades → SGPA/CGPA.
+
+Grades use the 10-point scale below. SGPA is Σ(credits × grade point) / Σ credits
+for one semester. CGPA applies the same formula to all semesters up to and
+including that one. Failed courses count their credits with 0 points.
+
+The engine never loops over students in the ORM:
+  1. One GROUP BY query sums credits and credit-points per (student, semester).
+  2. The sums go into flat arrays sorted by (student, semester), and one linear
+     scan builds the running totals that give the CGPA.
+  3. Rows that differ from the stored SemesterResult are bulk upserted.
+
+Incremental recompute (marks of one course changed) aggregates only the
+changed semester of the affected students. Earlier and later semesters are
+read from their persisted SemesterResult totals.
+"""
+from array import array
+from bisect import bisect_right
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Sum
+
+from .models import Mark, SemesterResult
+
+# (minimum marks, grade, grade point), ascending
+GRADE_SCALE = [
+    (0, "F", 0),
+    (40, "C", 5),
+    (50, "B", 6),
+    (60, "B+", 7),
+    (70, "A", 8),
+    (80, "A+", 9),
+    (90, "O", 10),
+]
+_GRADE_CUTOFFS = [cutoff for cutoff, _, _ in GRADE_SCALE]
+
+_TWO_PLACES = Decimal("0.01")
+_WRITE_BATCH = 2000
+
+
+def grade_for(marks):
+    """marks (0-100) → (grade, grade point)."""
+    _, grade, point = GRADE_SCALE[bisect_right(_GRADE_CUTOFFS, marks) - 1]
+    return grade, point
+
+
+def _gpa(points, credits):
+    if not credits:
+        return Decimal("0.00")
+    return (Decimal(points) / Decimal(credits)).quantize(_TWO_PLACES, rounding=ROUND_HALF_UP)
+
+
+class SemesterTotals:
+    """Column arrays of per-(student, semester) credit and point sums."""
+
+    def __init__(self):
+        self.students = array("q")
+        self.semesters = array("H")
+        self.credits = array("L")
+        self.points = array("L")
+
+    def __len__(self):
+        return len(self.students)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """rows: (student_id, semester, credits, points) sorted by (student, semester)."""
+        totals = cls()
+        for student_id, semester, credits, points in rows:
+            totals.students.append(student_id)
+            totals.semesters.append(semester)
+            totals.credits.append(credits)
+            totals.points.append(points)
+        return totals
+
+    def results(self, from_semester=1, stored=None):
+        """
+        One scan over the arrays: yields SemesterResult objects (unsaved) with
+        SGPA and running CGPA, skipping semesters before `from_semester` and
+        rows equal to `stored` {(student, semester): (credits, points, cgpa)}.
+        """
+        stored = stored or {}
+        students, semesters, credits, points = self.students, self.semesters, self.credits, self.points
+        current = None
+        total_credits = total_points = 0
+        for i in range(len(students)):
+            if students[i] != current:
+                current = students[i]
+                total_credits = total_points = 0
+            total_credits += credits[i]
+            total_points += points[i]
+            if semesters[i] < from_semester:
+                continue
+            cgpa = _gpa(total_points, total_credits)
+            if stored.get((current, semesters[i])) == (credits[i], points[i], cgpa):
+                continue
+            yield SemesterResult(
+                student_id=current,
+                semester=semesters[i],
+                credits=credits[i],
+                points=points[i],
+                sgpa=_gpa(points[i], credits[i]),
+                cgpa=cgpa,
+            )
+
+
+def _mark_sums(marks):
+    """GROUP BY (student, semester) over a Mark queryset, sorted."""
+    return (
+        marks.values("student_id", "semester")
+        .annotate(total_credits=Sum("credits"), total_points=Sum(F("credits") * F("grade_point")))
+        .order_by("student_id", "semester")
+        .values_list("student_id", "semester", "total_credits", "total_points")
+    )
+
+
+def _stored(results):
+    return {
+        (student_id, semester): (credits, points, cgpa)
+        for student_id, semester, credits, points, cgpa in results.values_list(
+            "student_id", "semester", "credits", "points", "cgpa"
+        ).iterator(chunk_size=5000)
+    }
+
+
+def _save(results):
+    batch = []
+    written = 0
+    for result in results:
+        batch.append(result)
+        if len(batch) >= _WRITE_BATCH:
+            written += _upsert(batch)
+            batch = []
+    if batch:
+        written += _upsert(batch)
+    return written
+
+
+def _upsert(batch):
+    SemesterResult.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["student", "semester"],
+        update_fields=["credits", "points", "sgpa", "cgpa", "updated_at"],
+    )
+    return len(batch)
+
+
+@transaction.atomic
+def recompute_all():
+    """Bring every SemesterResult in line with the Mark table. Returns rows written."""
+    totals = SemesterTotals.from_rows(_mark_sums(Mark.objects.all()).iterator(chunk_size=5000))
+    written = _save(totals.results(stored=_stored(SemesterResult.objects.all())))
+    # semesters whose marks were all removed
+    SemesterResult.objects.exclude(
+        Exists(Mark.objects.filter(student_id=OuterRef("student_id"), semester=OuterRef("semester")))
+    ).delete()
+    return written
+
+
+@transaction.atomic
+def recompute_students(student_ids, semester):
+    """
+    Marks of `semester` changed for `student_ids`: re-aggregate that semester
+    only, then roll CGPA forward using the stored totals of the other semesters.
+    Returns the number of SemesterResult rows written (unchanged ones are skipped).
+    """
+    student_ids = sorted(set(student_ids))
+    if not student_ids:
+        return 0
+    changed = {
+        (student_id, sem): (credits, points)
+        for student_id, sem, credits, points in _mark_sums(
+            Mark.objects.filter(student_id__in=student_ids, semester=semester)
+        )
+    }
+    stored = _stored(SemesterResult.objects.filter(student_id__in=student_ids))
+    rows = {key: (credits, points) for key, (credits, points, _) in stored.items() if key[1] != semester}
+    rows.update(changed)
+
+    # students left with no marks in the semester lose that result row
+    gone = [student_id for student_id in student_ids if (student_id, semester) not in changed]
+    if gone:
+        SemesterResult.objects.filter(student_id__in=gone, semester=semester).delete()
+
+    totals = SemesterTotals.from_rows(
+        (student_id, sem, credits, points)
+        for (student_id, sem), (credits, points) in sorted(rows.items())
+    )
+    return _save(totals.results(from_semester=semester, stored=stored))
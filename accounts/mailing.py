@@ -0,0 +1,220 @@
+"""
+Announcement email fan-out.
+
+Posting an announcement with `send_email` creates an AnnouncementDelivery and
+starts a background thread once the transaction commits. The thread:
+
+  1. resolves the audience with one query (users by role, with an email,
+     active, not archived), streamed in user-id order;
+  2. sends one message per recipient, ANNOUNCEMENT_EMAIL_CHUNK at a time,
+     over a single backend connection (`get_connection`, one `send_messages`
+     call per message so every message has its own outcome);
+  3. commits sent/failed counts and the last user id after every chunk.
+
+Only a refused address (SMTPRecipientsRefused) counts as `failed`. Any other
+error (server gone, socket error) stops the run: progress is committed up to
+the last recipient actually handled and the delivery is marked failed, so
+`requeue_failed` continues with the first recipient who wasn't emailed.
+
+If the process dies mid-way the row stays `sending` with an old `updated_at`;
+`manage.py resume_announcement_emails` picks it up and continues after
+`last_user_id`, so nobody is emailed twice (apart from, at worst, the one
+chunk that was in flight).
+"""
+import threading
+from datetime import timedelta
+from smtplib import SMTPRecipientsRefused
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import AnnouncementDelivery, User
+
+DEFAULT_CHUNK_SIZE = 100
+# a sending delivery whose heartbeat is older than this is assumed dead
+STALE_AFTER = timedelta(minutes=5)
+INSTITUTE = "Synergy Institute"
+
+# Announcement.target_audience → User.role values that receive it
+RECIPIENT_ROLES = {
+    "students": ("student",),
+    "faculty": ("teacher",),
+    "all": ("student", "teacher", "admin"),
+}
+
+
+def chunk_size():
+    return max(1, int(getattr(settings, "ANNOUNCEMENT_EMAIL_CHUNK", DEFAULT_CHUNK_SIZE)))
+
+
+def recipients(audience, after_id=0):
+    """(user id, email) of the audience past `after_id`, in id order, as one query."""
+    return (
+        User.objects.filter(role__in=RECIPIENT_ROLES.get(audience, ()), is_active=True, pk__gt=after_id)
+        .exclude(email="")
+        .filter(Q(student__isnull=True) | Q(student__archived_at__isnull=True))
+        .order_by("pk")
+        .values_list("pk", "email")
+    )
+
+
+def build_message(announcement, email, connection=None):
+    body = (
+        f"{announcement.message}\n\n"
+        f"--\n{INSTITUTE} Portal\n"
+        f"You are receiving this because you are registered on the {INSTITUTE} portal."
+    )
+    return EmailMessage(
+        subject=f"[{INSTITUTE}] {announcement.title}",
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+        connection=connection,
+    )
+
+
+# ---------------------------
+# Queueing
+# ---------------------------
+def queue_delivery(announcement):
+    """Create the delivery row and start sending after the surrounding commit."""
+    delivery, _ = AnnouncementDelivery.objects.get_or_create(announcement=announcement)
+    transaction.on_commit(lambda: start_in_background(delivery.pk))
+    return delivery
+
+
+def start_in_background(delivery_id):
+    thread = threading.Thread(
+        target=_run_in_thread, args=(delivery_id,), name=f"announcement-email-{delivery_id}", daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _run_in_thread(delivery_id):
+    close_old_connections()
+    try:
+        run_delivery(delivery_id)
+    finally:
+        connection.close()
+
+
+# ---------------------------
+# Sending
+# ---------------------------
+def claim(delivery_id, stale_after=STALE_AFTER):
+    """
+    Atomically take ownership of a queued, or stale sending, delivery so two
+    workers never send the same one. Returns True if this caller owns it.
+    """
+    now = timezone.now()
+    return bool(
+        AnnouncementDelivery.objects.filter(pk=delivery_id)
+        .filter(Q(status="queued") | Q(status="sending", updated_at__lt=now - stale_after))
+        .update(status="sending", updated_at=now)
+    )
+
+
+def _send_chunk(backend, messages):
+    """
+    Send `messages` in order; returns (sent, failed, error). Each goes out in
+    its own send_messages() call over the already open connection: a backend
+    that fails mid-batch (SMTP raises on the first refused message) doesn't
+    say which earlier messages went out, so a batch call can't be retried
+    without emailing some recipients twice. A refused address only fails its
+    own message. Any other exception stops the chunk and is returned as
+    `error`; the messages from sent + failed onwards were not attempted.
+    """
+    sent = failed = 0
+    for message in messages:
+        try:
+            delivered = backend.send_messages([message]) or 0
+        except SMTPRecipientsRefused:
+            failed += 1
+            backend.close()  # reopened by the next send_messages()
+            continue
+        except Exception as exc:
+            return sent, failed, exc
+        sent += delivered
+        failed += 1 - delivered
+    return sent, failed, None
+
+
+def run_delivery(delivery_id, stale_after=STALE_AFTER):
+    """
+    Send (or continue sending) one delivery in the calling thread. Returns the
+    delivery, or None when another worker owns it or it is already finished.
+    """
+    if not claim(delivery_id, stale_after):
+        return None
+    delivery = AnnouncementDelivery.objects.select_related("announcement").get(pk=delivery_id)
+    announcement = delivery.announcement
+    if delivery.total == 0:
+        delivery.total = delivery.sent + delivery.failed + recipients(
+            announcement.target_audience, delivery.last_user_id
+        ).count()
+        AnnouncementDelivery.objects.filter(pk=delivery_id).update(total=delivery.total)
+
+    size = chunk_size()
+    backend = get_connection(fail_silently=False)
+    try:
+        backend.open()
+        batch = []
+        rows = recipients(announcement.target_audience, delivery.last_user_id).iterator(chunk_size=2000)
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                _flush(delivery, announcement, backend, batch)
+                batch = []
+        if batch:
+            _flush(delivery, announcement, backend, batch)
+    except Exception as exc:
+        AnnouncementDelivery.objects.filter(pk=delivery_id).update(
+            status="failed", error=f"{type(exc).__name__}: {exc}"[:2000], finished_at=timezone.now(),
+        )
+        delivery.refresh_from_db()
+        return delivery
+    finally:
+        backend.close()
+
+    AnnouncementDelivery.objects.filter(pk=delivery_id).update(status="done", finished_at=timezone.now())
+    delivery.refresh_from_db()
+    return delivery
+
+
+def _flush(delivery, announcement, backend, batch):
+    messages = [build_message(announcement, email, backend) for _, email in batch]
+    sent, failed, error = _send_chunk(backend, messages)
+    if sent + failed:
+        # only as far as the last recipient handled, so a resume starts with the first one not emailed
+        last_user_id = batch[sent + failed - 1][0]
+        AnnouncementDelivery.objects.filter(pk=delivery.pk).update(
+            sent=F("sent") + sent,
+            failed=F("failed") + failed,
+            last_user_id=last_user_id,
+            updated_at=timezone.now(),
+        )
+        delivery.sent += sent
+        delivery.failed += failed
+        delivery.last_user_id = last_user_id
+    if error is not None:
+        raise error
+
+
+def resumable(stale_after=STALE_AFTER, include_failed=False):
+    """Deliveries that were queued but never started, or whose sender stopped."""
+    now = timezone.now()
+    pending = Q(status="queued", created_at__lt=now - stale_after) | Q(status="sending", updated_at__lt=now - stale_after)
+    if include_failed:
+        pending |= Q(status="failed")
+    return AnnouncementDelivery.objects.filter(pending).order_by("pk")
+
+
+def requeue_failed(delivery_id):
+    """Put a failed delivery back in the queue; it continues after last_user_id."""
+    return AnnouncementDelivery.objects.filter(pk=delivery_id, status="failed").update(
+        status="queued", error="", finished_at=None,
+    )
@@ -0,0 +1,87 @@
+"""
+Shared helpers for the bench_* management commands.
+
+Benchmarks seed synthetic rows inside a transaction that is always rolled
+back, so they can be pointed at any database without leaving data behind.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from accounts.models import Course, FeeRecord, Student, User
+from accounts.signals import refresh_last_paid
+
+
+@contextmanager
+def scratch_data():
+    """Run the block in a transaction and roll everything back afterwards."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def best_of(fn, repeat=5):
+    """Best wall-clock time of `repeat` calls to fn(), in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def seed_courses(count=8):
+    courses = [
+        Course(name=f"Bench Course {i}", code=f"BC{i:03d}", credits=random.choice([2, 3, 4]),
+               total_seats=10_000, seats_available=10_000)
+        for i in range(count)
+    ]
+    return Course.objects.bulk_create(courses)
+
+
+def seed_students(count, courses, prefix="bench"):
+    """Bulk-create `count` users + students spread over `courses`."""
+    users = User.objects.bulk_create(
+        User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", role="student",
+             first_name="Bench", last_name=f"Student {i}", password="!")
+        for i in range(count)
+    )
+    today = date.today()
+    students = [
+        Student(
+            user=user,
+            name=f"Bench Student {i}",
+            course=courses[i % len(courses)],
+            admission_date=today - timedelta(days=365 * (i % 4)),
+            roll_number=f"{prefix.upper()}{i:07d}",
+            total_fees=120000,
+            fees_paid=random.choice([0, 30000, 60000, 120000]),
+            mode_of_entry="Lateral" if i % 10 == 0 else "Regular",
+            address="Plot 42, Patia, Bhubaneswar",
+            parent_name="Parent Name",
+            parent_contact="9876543210",
+        )
+        for i, user in enumerate(users)
+    ]
+    return Student.objects.bulk_create(students, batch_size=2000)
+
+
+def seed_fee_records(students, per_student=3):
+    today = date.today()
+    records = [
+        FeeRecord(
+            student=student,
+            amount=random.choice([10000, 20000, 30000]),
+            date_paid=today - timedelta(days=random.randint(0, 180)),
+            status=random.choice(["paid", "paid", "pending", "overdue"]),
+        )
+        for student in students
+        for _ in range(per_student)
+    ]
+    records = FeeRecord.objects.bulk_create(records, batch_size=5000)
+    refresh_last_paid(student.pk for student in students)  # bulk_create skips the signal that keeps it
+    return records
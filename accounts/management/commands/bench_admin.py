@@ -0,0 +1,82 @@
+import time
+from contextlib import contextmanager
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+
+from accounts.models import Faculty, FeeRecord, Student, User
+
+from ._bench import scratch_data, seed_courses, seed_fee_records, seed_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the Student/FeeRecord/Faculty admin changelist and change form at --students rows with "
+        "the configured admins and with a stock ModelAdmin, reporting time and query count per page."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=100_000)
+        parser.add_argument("--skip-stock", action="store_true", help="Only measure the configured admins")
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        with scratch_data():
+            courses = seed_courses(8)
+            students = seed_students(options["students"], courses)
+            seed_fee_records(students[:options["students"] // 2], per_student=2)
+            Faculty.objects.bulk_create(
+                Faculty(user=student.user, department="CSE", designation="Lecturer",
+                        join_date=student.admission_date, email=student.user.email)
+                for student in students[:200]
+            )
+            superuser = User.objects.create(username="bench-admin", is_staff=True, is_superuser=True, password="!")
+
+            def request(path="", **params):
+                request = factory.get(f"/admin/{path}", params)
+                request.user = superuser
+                return request
+
+            pages = []
+            for model in (Student, FeeRecord, Faculty):
+                pk = model.objects.order_by("-pk").values_list("pk", flat=True)[0]
+                # a page that exists at both 50 (configured) and 100 (stock) rows per page
+                deep = max(1, min(100, model.objects.count() // 100))
+                pages += [
+                    (model, "changelist", lambda ma: ma.changelist_view(request())),
+                    (model, f"changelist p.{deep}", lambda ma, p=deep: ma.changelist_view(request(p=p))),
+                    (model, "change form", lambda ma, pk=pk: ma.change_view(request(f"{pk}/change/"), str(pk))),
+                ]
+            self.stdout.write(f"{'page':<28} {'configured':>18} {'stock ModelAdmin':>20}")
+            for model, label, view in pages:
+                cache.clear()
+                # first render warms templates and the cached count
+                view(admin.site._registry[model]).render()
+                configured = self.measure(lambda: view(admin.site._registry[model]).render())
+                row = f"{model.__name__ + ' ' + label:<28} {configured:>18}"
+                if not options["skip_stock"]:
+                    row += f" {self.measure(lambda: view(admin.ModelAdmin(model, admin.site)).render()):>20}"
+                self.stdout.write(row)
+
+    @staticmethod
+    def measure(render):
+        with counting_queries() as queries:
+            start = time.perf_counter()
+            render()
+            elapsed = time.perf_counter() - start
+        return f"{elapsed * 1000:7.1f} ms {queries[0]:5d} q"
+
+
+@contextmanager
+def counting_queries():
+    count = [0]
+
+    def wrapper(execute, sql, params, many, context):
+        count[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield count
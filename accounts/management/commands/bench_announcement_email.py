@@ -0,0 +1,100 @@
+import socketserver
+import threading
+import time
+
+from django.core import mail
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from accounts import mailing
+from accounts.models import Announcement, AnnouncementDelivery
+
+from ._bench import scratch_data, seed_courses, seed_students
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard mail."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line[:4].upper()
+            if verb == b"EHLO":
+                self.reply("250 sink")
+            elif verb == b"DATA":
+                self.reply("354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.messages += 1
+                self.reply("250 queued")
+            elif verb == b"QUIT":
+                self.reply("221 bye")
+                return
+            else:  # HELO, MAIL, RCPT, RSET, NOOP
+                self.reply("250 ok")
+
+
+class _SmtpSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+        self.connections = self.messages = 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Email one announcement to --recipients students through the fan-out path (locmem backend, "
+        "or a local SMTP stand-in with --smtp) and report throughput, connections and progress commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=10_000)
+        parser.add_argument("--chunk-size", type=int, default=mailing.DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--smtp", action="store_true", help="Send over SMTP to an in-process sink")
+
+    def handle(self, *args, **options):
+        count = options["recipients"]
+        backend = {"EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend"}
+        sink = None
+        if options["smtp"]:
+            sink = _SmtpSink()
+            threading.Thread(target=sink.serve_forever, daemon=True).start()
+            backend = {
+                "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+                "EMAIL_HOST": "127.0.0.1", "EMAIL_PORT": sink.server_address[1],
+                "EMAIL_USE_TLS": False, "EMAIL_USE_SSL": False, "EMAIL_HOST_USER": "", "EMAIL_HOST_PASSWORD": "",
+            }
+
+        with scratch_data(), override_settings(ANNOUNCEMENT_EMAIL_CHUNK=options["chunk_size"], **backend):
+            seed_students(count, seed_courses(4))
+            announcement = Announcement.objects.create(
+                title="Bench notice", message="Campus closed tomorrow.", target_audience="students",
+            )
+            delivery = AnnouncementDelivery.objects.create(announcement=announcement)
+            mail.outbox = []
+            start = time.perf_counter()
+            delivery = mailing.run_delivery(delivery.pk)
+            elapsed = time.perf_counter() - start
+            outbox = len(mail.outbox)
+
+        if sink is not None:
+            sink.shutdown()
+            sink.server_close()
+            transport = f"SMTP sink: {sink.messages} messages over {sink.connections} connection(s)"
+        else:
+            transport = f"locmem: {outbox} messages in the outbox"
+        chunks = -(-delivery.total // options["chunk_size"])
+        self.stdout.write(
+            f"{delivery.sent}/{delivery.total} sent ({delivery.failed} failed, status {delivery.status}) "
+            f"in {elapsed:.2f}s, {delivery.sent / elapsed:.0f} msg/s"
+        )
+        self.stdout.write(f"  {transport}; {chunks} progress commits of {options['chunk_size']}")
@@ -0,0 +1,55 @@
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from accounts import attendance
+from accounts.models import AttendanceSession, Course
+
+from ._bench import best_of, scratch_data, seed_courses, seed_students
+
+
+class Command(BaseCommand):
+    help = "Storage size and query time of bitmap attendance (course, student and college-wide shortfall)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--courses", type=int, default=8)
+        parser.add_argument("--sessions", type=int, default=120, help="sessions per course")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        with scratch_data():
+            courses = seed_courses(options["courses"])
+            seed_students(options["students"], courses)
+            start = date.today() - timedelta(days=options["sessions"])
+            stored = 0
+            for course in courses:
+                roster, ids = attendance.current_roster(course)
+                sessions = []
+                for day in range(options["sessions"]):
+                    present = [i for i in ids if random.random() < 0.8]
+                    bitmap = attendance.build_bitmap(ids, present)
+                    stored += len(bitmap)
+                    sessions.append(AttendanceSession(
+                        course=course, roster=roster, date=start + timedelta(days=day),
+                        present=bitmap, present_count=len(present),
+                    ))
+                AttendanceSession.objects.bulk_create(sessions, batch_size=1000)
+
+            course = Course.objects.get(pk=courses[0].pk)
+            student = course.student_set.first()
+            marks = options["students"] * options["sessions"]  # each student is on one course roster
+            timings = {
+                "course summary": best_of(lambda: attendance.course_summary(course), repeat),
+                "student summary": best_of(lambda: attendance.student_summary(student), repeat),
+                "shortfall (all)": best_of(lambda: attendance.shortfall_report(75), repeat),
+            }
+
+        self.stdout.write(
+            f"{marks} marks in {options['courses'] * options['sessions']} sessions: "
+            f"{stored / 1024:.0f} KiB of bitmaps ({stored * 8 / marks:.2f} bits/mark)"
+        )
+        for label, seconds in timings.items():
+            self.stdout.write(f"  {label:<17} {seconds * 1000:8.1f} ms")
@@ -0,0 +1,72 @@
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts import audit
+from accounts.models import AuditEntry, Course, FeeRecord, User
+
+from ._bench import seed_fee_records, seed_students
+from .bench_coalesce import herd
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent fee-record updates with an audit entry each: inserted in the update's own "
+        "transaction vs buffered by accounts/audit.py and flushed in one bulk_create. Seeds committed "
+        "rows (threads use their own connections) and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--records", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--per-thread", type=int, default=100)
+
+    def handle(self, *args, **options):
+        tag = f"{os.getpid() % 100_000:05d}"
+        course = Course.objects.create(name="Audit Bench", code=f"ZA{tag}", total_seats=10**6, seats_available=10**6)
+        try:
+            students = seed_students(options["records"], [course], prefix=f"auditbench{tag}")
+            records = [record.pk for record in seed_fee_records(students, per_student=1)]
+            self.run(options, records)
+        finally:
+            AuditEntry.objects.filter(entity="fees", object_id__in=records).delete()
+            FeeRecord.objects.filter(student__course=course).delete()
+            User.objects.filter(username__startswith=f"auditbench{tag}").delete()
+            course.delete()
+
+    def run(self, options, records):
+        def update(write_audit):
+            record = FeeRecord.objects.get(pk=random.choice(records))
+            before = audit.snapshot(record)
+            with transaction.atomic():
+                record.amount += 1000  # always a change, so every update is audited
+                record.save(update_fields=["amount"])
+                write_audit(record, before)
+
+        def synchronous(record, before):
+            changes = {name: [before[name], value] for name, value in audit.snapshot(record).items() if before[name] != value}
+            AuditEntry.objects.create(entity="fees", object_id=record.pk, changes=changes)
+
+        def buffered(record, before):
+            audit.record("fees", record.pk, None, before, audit.snapshot(record))
+
+        updates = options["threads"] * options["per_thread"]
+        self.stdout.write(f"{updates} updates from {options['threads']} threads over {len(records)} fee records")
+        self.stdout.write(f"{'audit write':<22}{'wall ms':>10}{'updates/s':>11}{'p50 ms':>9}{'p99 ms':>9}")
+        for label, write_audit in (("in the transaction", synchronous), ("buffered", buffered)):
+            wall, latencies = herd(options["threads"], options["per_thread"], lambda: update(write_audit))
+            self.stdout.write(
+                f"{label:<22}{wall * 1000:>10.0f}{updates / wall:>11.0f}"
+                f"{latencies[len(latencies) // 2] * 1000:>9.2f}{latencies[int(len(latencies) * 0.99)] * 1000:>9.2f}"
+            )
+
+        start = time.perf_counter()
+        written = audit.flush()
+        self.stdout.write(
+            f"flush: {written} buffered entries in {(time.perf_counter() - start) * 1000:.0f} ms "
+            f"(the background flusher wrote the rest); audit rows for the bench records: "
+            f"{AuditEntry.objects.filter(entity='fees', object_id__in=records).count()} of {updates * 2}"
+        )
@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework import serializers
+
+from accounts import catalog
+from accounts.models import Course, FeeRecord, Student
+from accounts.serializers import CatalogCourseField, FeeRecordSerializer, StudentSerializer
+
+from ._bench import best_of, scratch_data, seed_courses, seed_fee_records, seed_students
+
+
+class JoinedStudentSerializer(StudentSerializer):
+    """The pre-catalog representation: course name and seats read from a joined Course."""
+
+    def to_representation(self, instance):
+        rep = super().to_representation(instance)
+        rep["course_name"] = instance.course.name if instance.course else None
+        rep["seats_available"] = getattr(instance.course, "seats_available", None)
+        return rep
+
+    def live_seats(self):
+        return {}  # seats come from the join
+
+
+class JoinedFeeRecordSerializer(FeeRecordSerializer):
+    def get_department(self, obj):
+        return getattr(obj.student.course, "name", "-")
+
+
+class QuerysetCourse(serializers.Serializer):
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+
+
+class CatalogCourse(serializers.Serializer):
+    course = CatalogCourseField()
+
+
+@contextmanager
+def counting_queries():
+    count = [0]
+
+    def wrapper(execute, sql, params, many, context):
+        count[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield count
+
+
+class Command(BaseCommand):
+    help = "Queries and latency of course lookups through the per-process catalog vs joins and per-write queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--writes", type=int, default=2000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        with scratch_data():
+            courses = seed_courses(12)
+            seed_fee_records(seed_students(options["students"], courses), per_student=2)
+            catalog.invalidate()
+            catalog.courses()
+            course_ids = [course.pk for course in courses]
+
+            cases = {
+                "student list": (
+                    lambda: JoinedStudentSerializer(Student.objects.select_related("user", "course"), many=True).data,
+                    lambda: StudentSerializer(Student.objects.select_related("user"), many=True).data,
+                ),
+                "fee list": (
+                    lambda: JoinedFeeRecordSerializer(
+                        FeeRecord.objects.select_related("student__user", "student__course"), many=True
+                    ).data,
+                    lambda: FeeRecordSerializer(FeeRecord.objects.select_related("student__user"), many=True).data,
+                ),
+                f"{options['writes']} course validations": (
+                    lambda: [QuerysetCourse(data={"course": course_ids[i % len(course_ids)]}).is_valid()
+                             for i in range(options["writes"])],
+                    lambda: [CatalogCourse(data={"course": course_ids[i % len(course_ids)]}).is_valid()
+                             for i in range(options["writes"])],
+                ),
+            }
+            same_output = (
+                cases["student list"][0]() == cases["student list"][1]()
+                and cases["fee list"][0]() == cases["fee list"][1]()
+            )
+
+            self.stdout.write(f"{'case':<26}{'join/query ms':>14}{'q':>6}{'catalog ms':>14}{'q':>6}")
+            for label, (before, after) in cases.items():
+                row = f"{label:<26}"
+                for fn in (before, after):
+                    with counting_queries() as queries:
+                        fn()
+                    row += f"{best_of(fn, repeat) * 1000:>14.1f}{queries[0]:>6}"
+                self.stdout.write(row)
+
+            catalog._checked_at = 0.0  # force the cross-worker version check
+            check = best_of(catalog.courses, 1)
+            hit = best_of(lambda: catalog.get(course_ids[0]), 1)
+        self.stdout.write(f"identical list output: {same_output}")
+        self.stdout.write(f"version check {check * 1e6:.0f} µs, catalog hit {hit * 1e6:.1f} µs")
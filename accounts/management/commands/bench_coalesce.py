@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts import coalesce
+from accounts.dashboard_views import dashboard_data
+from accounts.models import Course, FeeRecord, User
+
+from ._bench import seed_fee_records, seed_students
+
+KEY = "aggregates:bench-dashboard"
+
+
+def herd(threads, per_thread, fn):
+    """`threads` threads call fn() `per_thread` times each, all released at once. Returns (wall s, latencies)."""
+    barrier = threading.Barrier(threads)
+    latencies = []
+    lock = threading.Lock()
+
+    def run():
+        try:
+            barrier.wait()
+            for _ in range(per_thread):
+                start = time.perf_counter()
+                fn()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+class Command(BaseCommand):
+    help = (
+        "A herd of concurrent dashboard requests: every request computing the aggregates vs "
+        "coalesce.get_or_compute (cold, fresh and stale entries). Seeds committed rows (threads use "
+        "their own connections) and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=10_000)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--per-thread", type=int, default=3)
+
+    def handle(self, *args, **options):
+        tag = f"{os.getpid() % 100_000:05d}"
+        course = Course.objects.create(name="Coalesce Bench", code=f"ZC{tag}", total_seats=10**6, seats_available=10**6)
+        try:
+            students = seed_students(options["students"], [course], prefix=f"coalbench{tag}")
+            seed_fee_records(students, per_student=3)
+            self.run(options)
+        finally:
+            FeeRecord.objects.filter(student__course=course).delete()
+            User.objects.filter(username__startswith=f"coalbench{tag}").delete()
+            course.delete()
+            coalesce.shared_cache().delete(KEY)
+
+    def run(self, options):
+        computations = [0]
+
+        def counted():
+            computations[0] += 1
+            return dashboard_data()
+
+        def coalesced():
+            return coalesce.get_or_compute(KEY, counted)
+
+        cache = coalesce.shared_cache()
+        requests = options["threads"] * options["per_thread"]
+        self.stdout.write(f"{requests} requests from {options['threads']} threads")
+        self.stdout.write(f"{'mode':<24}{'computations':>13}{'wall ms':>10}{'p50 ms':>9}{'p99 ms':>9}")
+        scenarios = (
+            ("every request computes", counted, lambda: None),
+            ("single-flight, cold", coalesced, lambda: cache.delete(KEY)),
+            ("single-flight, fresh", coalesced, lambda: None),
+            # an entry past the freshness window: served as is, refreshed once in the background
+            ("single-flight, stale", coalesced, lambda: cache.set(KEY, (0.0, dashboard_data()), 300)),
+        )
+        for label, fn, prepare in scenarios:
+            prepare()
+            computations[0] = 0
+            wall, latencies = herd(options["threads"], options["per_thread"], fn)
+            while coalesce._inflight:  # let a background refresh finish before counting
+                time.sleep(0.01)
+            self.stdout.write(
+                f"{label:<24}{computations[0]:>13}{wall * 1000:>10.0f}"
+                f"{latencies[len(latencies) // 2] * 1000:>9.1f}{latencies[int(len(latencies) * 0.99)] * 1000:>9.1f}"
+            )
@@ -0,0 +1,126 @@
+import random
+import time
+from array import array
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from accounts import counseling
+from accounts.models import CounselingApplicant, Course, Student
+
+from ._bench import best_of, scratch_data
+
+
+def serial_dictatorship(applicants, seats):
+    """Reference allocation for a first round: by rank, each applicant takes their best course with a seat left."""
+    left = dict(seats)
+    result = {}
+    for applicant_id, preferences in applicants:
+        result[applicant_id] = None
+        for course_id in preferences:
+            if left.get(course_id, 0) > 0:
+                left[course_id] -= 1
+                result[applicant_id] = course_id
+                break
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Allocates N synthetic applicants (skewed course popularity) over all courses: round 1, a round 2 "
+        "after withdrawals and new seats, and the bulk commit to Students. Checks round 1 against a "
+        "reference serial dictatorship and that round 2 moved nobody down."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applicants", type=int, default=50_000)
+        parser.add_argument("--courses", type=int, default=40)
+        parser.add_argument("--seat-ratio", type=float, default=0.8, help="total seats / applicants")
+        parser.add_argument("--withdraw", type=float, default=0.05, help="share of allocated applicants withdrawing")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        n = options["applicants"]
+        with scratch_data():
+            total_seats = int(n * options["seat_ratio"])
+            per_course = max(1, total_seats // options["courses"])
+            courses = Course.objects.bulk_create(
+                Course(name=f"Counseling Course {i}", code=f"CC{i:03d}", total_seats=per_course,
+                       seats_available=per_course)
+                for i in range(options["courses"])
+            )
+            course_ids = [course.pk for course in courses]
+            weights = [1 / (rank + 1) for rank in range(len(course_ids))]  # a few courses everybody wants
+
+            start = time.perf_counter()
+            ranks = rng.sample(range(1, n * 2), n)
+            applicants = []
+            for i in range(n):
+                preferences = []
+                while len(preferences) < rng.randint(3, 10):
+                    course_id = rng.choices(course_ids, weights)[0]
+                    if course_id not in preferences:
+                        preferences.append(course_id)
+                applicants.append(CounselingApplicant(
+                    name=f"Applicant {i}", email=f"applicant{i}@example.com", ojee_rank=ranks[i],
+                    preferences=preferences,
+                ))
+            CounselingApplicant.objects.bulk_create(applicants, batch_size=2000)
+            self.stdout.write(f"{n} applicants, {options['courses']} courses, {per_course * len(courses)} seats "
+                              f"(seeded in {time.perf_counter() - start:.1f} s)")
+
+            # engine alone, on arrays already loaded
+            seats = dict(Course.objects.filter(pk__in=course_ids).values_list("id", "seats_available"))
+            index = {course_id: i for i, course_id in enumerate(course_ids)}
+            capacity = array("l", (seats[course_id] for course_id in course_ids))
+            _, pref_flat, pref_start, held = counseling._load(index)
+            engine = best_of(lambda: counseling.deferred_acceptance(pref_flat, pref_start, capacity, held), 3)
+
+            first = counseling.run_round()
+            self.report(first, engine)
+            expected = serial_dictatorship(
+                CounselingApplicant.objects.order_by("ojee_rank", "id").values_list("id", "preferences"), seats,
+            )
+            actual = dict(CounselingApplicant.objects.values_list("id", "allocated_course_id"))
+            self.stdout.write(f"  matches reference serial dictatorship: {expected == actual}")
+
+            before = {
+                applicant_id: preferences.index(course_id)
+                for applicant_id, preferences, course_id in CounselingApplicant.objects.filter(status="allocated")
+                .values_list("id", "preferences", "allocated_course_id")
+            }
+            withdrawn = rng.sample(sorted(before), int(len(before) * options["withdraw"]))
+            CounselingApplicant.objects.filter(pk__in=withdrawn).update(status="withdrawn", allocated_course=None)
+            for course in rng.sample(courses, max(1, len(courses) // 10)):
+                Course.objects.filter(pk=course.pk).update(seats_available=course.seats_available + 20)
+            self.stdout.write(f"{len(withdrawn)} withdrawals, +20 seats in {max(1, len(courses) // 10)} courses")
+
+            second = counseling.run_round()
+            self.report(second)
+            worse = sum(
+                1 for applicant_id, preferences, course_id in CounselingApplicant.objects.filter(pk__in=list(before))
+                .exclude(status="withdrawn").values_list("id", "preferences", "allocated_course_id")
+                if course_id is None or preferences.index(course_id) > before[applicant_id]
+            )
+            self.stdout.write(f"  applicants moved down or out: {worse}")
+
+            start = time.perf_counter()
+            result = counseling.commit(date.today())
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"commit: {result['admitted']} students in {elapsed:.2f} s "
+                f"(conflicts {result['conflicts']}, over capacity {result['over_capacity']}); "
+                f"students in bench courses: {Student.objects.filter(course_id__in=course_ids).count()}, "
+                f"seats left: {sum(Course.objects.filter(pk__in=course_ids).values_list('seats_available', flat=True))}"
+            )
+
+    def report(self, result, engine=None):
+        line = (
+            f"round {result.number}: {result.allocated}/{result.applicants} allocated "
+            f"(new {result.newly_allocated}, upgraded {result.upgraded}, displaced {result.displaced}) "
+            f"in {result.duration_ms} ms"
+        )
+        if engine is not None:
+            line += f", engine alone {engine * 1000:.0f} ms"
+        self.stdout.write(line)
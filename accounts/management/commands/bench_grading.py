@@ -0,0 +1,98 @@
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from accounts import grading
+from accounts.models import Course, Mark, SemesterResult
+
+from ._bench import best_of, scratch_data, seed_courses, seed_students
+
+
+def naive_recompute(student_ids):
+    """Baseline: per-student ORM loop over marks, the way a view would do it."""
+    for student_id in student_ids:
+        total_credits = total_points = 0
+        for semester in sorted(set(Mark.objects.filter(student_id=student_id).values_list("semester", flat=True))):
+            credits = points = 0
+            for mark in Mark.objects.filter(student_id=student_id, semester=semester):
+                credits += mark.credits
+                points += mark.credits * mark.grade_point
+            total_credits += credits
+            total_points += points
+            SemesterResult.objects.update_or_create(
+                student_id=student_id, semester=semester,
+                defaults={
+                    "credits": credits, "points": points,
+                    "sgpa": grading._gpa(points, credits), "cgpa": grading._gpa(total_points, total_credits),
+                },
+            )
+
+
+class Command(BaseCommand):
+    help = "Full-cohort and incremental SGPA/CGPA recompute (default 20k students × 8 semesters)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=20000)
+        parser.add_argument("--semesters", type=int, default=8)
+        parser.add_argument("--courses-per-semester", type=int, default=6)
+        parser.add_argument("--programs", type=int, default=4)
+        parser.add_argument("--naive-sample", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        semesters, per_semester, programs = options["semesters"], options["courses_per_semester"], options["programs"]
+        repeat = options["repeat"]
+        with scratch_data():
+            program_courses = seed_courses(programs)
+            students = seed_students(options["students"], program_courses)
+            subjects = Course.objects.bulk_create(
+                Course(name=f"Bench Subject {p}-{s}-{k}", code=f"BS{p}{s:02d}{k:02d}", credits=random.choice([2, 3, 4]))
+                for p in range(programs) for s in range(1, semesters + 1) for k in range(per_semester)
+            )
+            subjects_of = {}  # (program index, semester) → courses
+            for index, course in enumerate(subjects):
+                p, rest = divmod(index, semesters * per_semester)
+                subjects_of.setdefault((p, rest // per_semester + 1), []).append(course)
+
+            batch = []
+            for i, student in enumerate(students):
+                for semester in range(1, semesters + 1):
+                    for course in subjects_of[(i % programs, semester)]:
+                        score = Decimal(random.randint(25, 100))
+                        grade, point = grading.grade_for(score)
+                        batch.append(Mark(student=student, course=course, semester=semester, marks=score,
+                                          grade=grade, grade_point=point, credits=course.credits))
+                if len(batch) >= 20000:
+                    Mark.objects.bulk_create(batch, batch_size=5000)
+                    batch = []
+            Mark.objects.bulk_create(batch, batch_size=5000)
+            marks = Mark.objects.count()
+
+            full = best_of(grading.recompute_all, 1)  # empty SemesterResult table: writes every row
+            results = SemesterResult.objects.count()
+            noop = best_of(grading.recompute_all, repeat)
+
+            # one course re-graded: only its class (one program) is recomputed
+            semester = semesters // 2
+            course = subjects_of[(0, semester)][0]
+            class_ids = list(Mark.objects.filter(course=course).values_list("student_id", flat=True))
+            incremental = None
+            for step in range(repeat):
+                Mark.objects.filter(course=course).update(grade_point=(F("grade_point") + 1 + step) % 11)
+                elapsed = best_of(lambda: grading.recompute_students(class_ids, semester), 1)
+                incremental = elapsed if incremental is None else min(incremental, elapsed)
+
+            sample = [student.pk for student in students[: options["naive_sample"]]]
+            naive = best_of(lambda: naive_recompute(sample), 1)
+
+        naive_full = naive / len(sample) * len(students)
+        self.stdout.write(f"{len(students)} students × {semesters} semesters: {marks} marks → {results} results")
+        self.stdout.write(f"  full cohort, first build     {full:8.2f} s")
+        self.stdout.write(f"  full cohort, nothing changed {noop:8.2f} s")
+        self.stdout.write(f"  one course re-graded         {incremental:8.2f} s ({len(class_ids)} students)")
+        self.stdout.write(
+            f"  per-student ORM loop         {naive:8.2f} s for {len(sample)} students "
+            f"(≈ {naive_full:.0f} s for the cohort)"
+        )
@@ -0,0 +1,73 @@
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+
+from ._bench import scratch_data
+
+STOCK_MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+# APIView reads DEFAULT_AUTHENTICATION_CLASSES once at import time, so the
+# two orderings are patched onto the class rather than overridden in settings
+SESSION_FIRST_AUTH = [SessionAuthentication, JWTAuthentication]
+JWT_FIRST_AUTH = [JWTAuthentication, SessionAuthentication]
+
+
+class Command(BaseCommand):
+    help = "Per-request overhead of the stock middleware stack vs the API fast path for JWT calls."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--path", default="/api/auth/me/")
+
+    def measure(self, client, path, token, count):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        client.get(path, **headers)  # warm
+        queries = []
+        # execute_wrapper rather than CaptureQueriesContext: request_started resets queries_log
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            response = client.get(path, **headers)
+        assert response.status_code == 200, response.status_code
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get(path, **headers)
+        return (time.perf_counter() - start) / count, len(queries)
+
+    def handle(self, *args, **options):
+        path, count = options["path"], options["requests"]
+        with scratch_data():
+            user = User.objects.create_user(username="bench_mw", email="bench_mw@example.com", password="x")
+            token = str(AccessToken.for_user(user))
+
+            results = {}
+            with override_settings(MIDDLEWARE=STOCK_MIDDLEWARE), \
+                    mock.patch.object(APIView, "authentication_classes", SESSION_FIRST_AUTH):
+                client = Client()
+                client.force_login(user)  # browser-style client: session cookie + bearer token
+                results["stock"] = self.measure(client, path, token, count)
+            with mock.patch.object(APIView, "authentication_classes", JWT_FIRST_AUTH):
+                client = Client()
+                client.force_login(user)
+                results["fast path"] = self.measure(client, path, token, count)
+
+        self.stdout.write(f"GET {path} with bearer token + session cookie, {count} requests")
+        for label, (seconds, queries) in results.items():
+            self.stdout.write(f"  {label:<10} {seconds * 1e6:8.0f} µs/request   {queries} queries/request")
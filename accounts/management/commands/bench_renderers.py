@@ -0,0 +1,55 @@
+import gzip
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import Faculty, FeeRecord, Student, User
+from accounts.renderers import ColumnarJSONRenderer
+from accounts.serializers import FacultySerializer, FeeRecordSerializer, StudentSerializer
+
+from ._bench import best_of, scratch_data, seed_courses, seed_fee_records, seed_students
+
+
+class Command(BaseCommand):
+    help = "Compare payload size and render time of the default JSON renderer vs ?format=columnar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--faculty", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with scratch_data():
+            courses = seed_courses()
+            students = seed_students(options["students"], courses)
+            seed_fee_records(students, per_student=1)
+            users = User.objects.bulk_create(
+                User(username=f"benchfac{i}", email=f"benchfac{i}@example.com", role="faculty", password="!")
+                for i in range(options["faculty"])
+            )
+            Faculty.objects.bulk_create(
+                Faculty(user=user, department="CSE", designation="Assistant Professor",
+                        join_date=date(2020, 7, 1), email=user.email, assigned_courses=["CS101", "CS102"])
+                for user in users
+            )
+
+            datasets = {
+                "students": StudentSerializer(Student.objects.select_related("user", "course"), many=True).data,
+                "fees": FeeRecordSerializer(
+                    FeeRecord.objects.select_related("student__user", "student__course"), many=True
+                ).data,
+                "faculty": FacultySerializer(Faculty.objects.select_related("user"), many=True).data,
+            }
+
+        json_renderer = JSONRenderer()
+        columnar_renderer = ColumnarJSONRenderer()
+        self.stdout.write(f"{'dataset':<10}{'rows':>7}  {'renderer':<9}{'bytes':>11}{'gzip':>10}{'render ms':>11}")
+        for name, data in datasets.items():
+            for label, renderer in (("json", json_renderer), ("columnar", columnar_renderer)):
+                body = renderer.render(data)
+                seconds = best_of(lambda: renderer.render(data), options["repeat"])
+                self.stdout.write(
+                    f"{name:<10}{len(data):>7}  {label:<9}{len(body):>11}"
+                    f"{len(gzip.compress(body)):>10}{seconds * 1000:>11.1f}"
+                )
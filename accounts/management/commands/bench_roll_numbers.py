@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+
+from accounts import rollnumbers
+from accounts.models import Course, RollNumberSequence, Student, User
+from accounts.serializers import StudentSerializer
+
+BENCH_YEAR = 1999
+
+
+def run_threads(count, target):
+    """Start `count` threads on target(thread_index, barrier) together; wait for all of them."""
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        try:
+            target(index, barrier)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress test of roll-number allocation from concurrent threads: uniqueness, gaps and latency of "
+        "the sequence allocator, then concurrent admissions with allocated vs max+1 roll numbers. "
+        "Rows are committed (threads use their own connections) and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--per-thread", type=int, default=200, help="allocations per thread")
+        parser.add_argument("--block", type=int, default=25, help="size of every 10th (bulk) allocation")
+        parser.add_argument("--admissions", type=int, default=25, help="students admitted per thread")
+
+    def handle(self, *args, **options):
+        tag = f"{os.getpid() % 100_000:05d}"
+        try:
+            self.allocator(f"ZA{tag}", options)
+            # cheap hashes: the bench measures allocation, not PBKDF2
+            with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+                course = Course.objects.create(
+                    name="Roll Bench", code=f"ZB{tag}", total_seats=100_000, seats_available=100_000,
+                )
+                self.stdout.write(f"\n{'admissions':<12}{'admitted':>10}{'duplicate':>11}{'other err':>11}{'ms':>9}")
+                for mode in ("max+1", "allocated"):
+                    self.admissions(course, mode, tag, options)
+        finally:
+            User.objects.filter(username__startswith=f"rollbench{tag}").delete()
+            Course.objects.filter(code=f"ZB{tag}").delete()
+            RollNumberSequence.objects.filter(course_code__in=[f"ZA{tag}", f"ZB{tag}"]).delete()
+
+    def allocator(self, code, options):
+        results = [[] for _ in range(options["threads"])]
+        latencies = [[] for _ in range(options["threads"])]
+
+        def work(index, barrier):
+            barrier.wait()
+            for i in range(options["per_thread"]):
+                count = options["block"] if i % 10 == 9 else 1
+                start = time.perf_counter()
+                results[index].extend(rollnumbers.allocate(BENCH_YEAR, code, count))
+                latencies[index].append(time.perf_counter() - start)
+
+        elapsed = run_threads(options["threads"], work)
+        rolls = [roll for chunk in results for roll in chunk]
+        serials = sorted(int(roll[-rollnumbers.width():]) for roll in rolls)
+        calls = [latency for chunk in latencies for latency in chunk]
+        self.stdout.write(
+            f"allocator: {options['threads']} threads, {len(calls)} calls, {len(rolls)} roll numbers "
+            f"in {elapsed * 1000:.0f} ms ({len(calls) / elapsed:.0f} calls/s)"
+        )
+        self.stdout.write(
+            f"  unique: {len(set(rolls)) == len(rolls)}, gap-free: {serials == list(range(1, len(rolls) + 1))}, "
+            f"latency p50 {percentile(calls, 0.5) * 1000:.2f} ms, p99 {percentile(calls, 0.99) * 1000:.2f} ms"
+        )
+
+    def admissions(self, course, mode, tag, options):
+        counts = {"admitted": 0, "duplicate": 0, "other": 0}
+        lock = threading.Lock()
+        admission_date = date(BENCH_YEAR, 7, 1)
+        prefix = rollnumbers.format_roll(BENCH_YEAR, course.code, 0)[: -rollnumbers.width()]
+
+        def next_by_max():
+            # what admissions staff do by hand: take the highest roll number so far and add one
+            last = (
+                Student.objects.filter(roll_number__startswith=prefix)
+                .order_by("-roll_number").values_list("roll_number", flat=True).first()
+            )
+            serial = int(last[len(prefix):]) + 1 if last else 1
+            return rollnumbers.format_roll(BENCH_YEAR, course.code, serial)
+
+        def work(index, barrier):
+            barrier.wait()
+            for i in range(options["admissions"]):
+                data = {
+                    "email": f"rollbench{tag}{mode[0]}{index}x{i}@example.com",
+                    "name": "Roll Bench",
+                    "course": course.pk,
+                    "admission_date": admission_date,
+                }
+                if mode == "max+1":
+                    data["roll_number"] = next_by_max()
+                serializer = StudentSerializer(data=data)
+                try:
+                    if serializer.is_valid():
+                        serializer.save()
+                        outcome = "admitted"
+                    else:
+                        outcome = "duplicate" if "roll_number" in serializer.errors else "other"
+                except Exception as exc:  # noqa: BLE001 - classified below
+                    outcome = "duplicate" if "roll_number" in str(exc) else "other"
+                with lock:
+                    counts[outcome] += 1
+
+        Student.objects.filter(roll_number__startswith=prefix).delete()
+        make_password("warm up the hasher")
+        elapsed = run_threads(options["threads"], work)
+        self.stdout.write(
+            f"{mode:<12}{counts['admitted']:>10}{counts['duplicate']:>11}{counts['other']:>11}{elapsed * 1000:>9.0f}"
+        )
@@ -0,0 +1,68 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from accounts.renderers import StreamingListMixin
+
+from ._bench import scratch_data, seed_courses, seed_fee_records, seed_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Peak Python memory, time to first byte and total time of the students/ and fees/ lists, "
+        "streamed (StreamingListMixin) vs buffered, and a byte-for-byte comparison of the two."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=20_000)
+        parser.add_argument("--fees-per-student", type=int, default=2)
+
+    def handle(self, *args, **options):
+        client = Client()
+        with scratch_data():
+            students = seed_students(options["students"], seed_courses())
+            seed_fee_records(students, per_student=options["fees_per_student"])
+            self.stdout.write("(times include tracemalloc overhead; compare them relative to each other)")
+            self.stdout.write(f"{'list':<10}{'mode':<10}{'bytes':>12}{'peak MiB':>10}{'TTFB ms':>10}{'total ms':>10}")
+            for path in ("/api/auth/students/", "/api/auth/fees/"):
+                streamed = self.measure(client, path)
+                original = StreamingListMixin.can_stream
+                StreamingListMixin.can_stream = lambda view, request: False
+                try:
+                    buffered = self.measure(client, path)
+                finally:
+                    StreamingListMixin.can_stream = original
+                for mode, (body, peak, ttfb, total) in (("buffered", buffered), ("streamed", streamed)):
+                    self.stdout.write(
+                        f"{path.split('/')[-2]:<10}{mode:<10}{len(body):>12}{peak / 2**20:>10.1f}"
+                        f"{ttfb * 1000:>10.1f}{total * 1000:>10.1f}"
+                    )
+                self.stdout.write(f"  identical bytes: {streamed[0] == buffered[0]}")
+
+    @staticmethod
+    def measure(client, path):
+        """
+        (body, peak traced bytes, time to first byte, total time). Streamed
+        chunks are dropped as they arrive, like a socket write, so the peak is
+        what the server holds; the body is fetched again untraced for comparison.
+        """
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = client.get(path)
+        if response.streaming:
+            ttfb = None
+            for _ in response.streaming_content:
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+            body = None
+        else:
+            body = response.content
+            ttfb = time.perf_counter() - start
+        total = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if body is None:
+            body = b"".join(client.get(path).streaming_content)
+        return body, peak, ttfb, total
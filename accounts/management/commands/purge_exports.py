@@ -0,0 +1,31 @@
+import os
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts import exports
+from accounts.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = "Delete export files and job rows older than --days (default 7)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        cutoff = time.time() - options["days"] * 86400
+        removed = 0
+        for directory, _, names in os.walk(exports.export_root()):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        jobs, _ = ExportJob.objects.filter(created_at__lt=timezone.now() - timedelta(days=options["days"])).delete()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} files and {jobs} jobs."))
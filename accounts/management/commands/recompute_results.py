@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts import grading
+
+
+class Command(BaseCommand):
+    help = "Rebuild every student's SGPA/CGPA (SemesterResult) from the Mark table."
+
+    def handle(self, *args, **options):
+        written = grading.recompute_all()
+        self.stdout.write(self.style.SUCCESS(f"{written} semester results written."))
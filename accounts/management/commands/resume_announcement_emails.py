@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import mailing
+
+
+class Command(BaseCommand):
+    help = (
+        "Continue announcement email deliveries that stopped (worker restarted or crashed) from the "
+        "last recipient they reached. Safe to run from cron, e.g. "
+        "`*/10 * * * * python manage.py resume_announcement_emails`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale-minutes", type=int, default=int(mailing.STALE_AFTER.total_seconds() // 60),
+                            help="Treat a sending delivery without progress for this long as stopped")
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry deliveries that failed")
+
+    def handle(self, *args, **options):
+        if options["stale_minutes"] < 0:
+            raise CommandError("--stale-minutes must not be negative")
+        stale_after = timedelta(minutes=options["stale_minutes"])
+
+        resumed = 0
+        for delivery_id in list(mailing.resumable(stale_after, options["retry_failed"]).values_list("pk", flat=True)):
+            mailing.requeue_failed(delivery_id)
+            delivery = mailing.run_delivery(delivery_id, stale_after)
+            if delivery is None:
+                continue  # picked up by someone else meanwhile
+            resumed += 1
+            self.stdout.write(
+                f"Announcement {delivery.announcement_id}: {delivery.status}, "
+                f"{delivery.sent} sent, {delivery.failed} failed of {delivery.total}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Resumed {resumed} deliveries."))
@@ -0,0 +1,36 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import overdue
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark pending fee records past their due window (FEE_DUE_WINDOW_WORKING_DAYS working days, "
+        "skipping weekends and holidays) as overdue. Meant to run daily from cron, e.g. "
+        "`15 0 * * * python manage.py sweep_overdue_fees`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Sweep as of this date (YYYY-MM-DD), default today")
+        parser.add_argument("--window", type=int, help="Working days before a pending fee is overdue")
+        parser.add_argument("--chunk-size", type=int, default=overdue.DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be swept")
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD")
+        if options["window"] is not None and options["window"] < 1:
+            raise CommandError("--window must be at least 1")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        cutoff = overdue.overdue_cutoff(today, options["window"])
+        records, amount = overdue.sweep_overdue(cutoff, options["chunk_size"], options["dry_run"])
+        verb = "Would mark" if options["dry_run"] else "Marked"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {records} fee records ({amount} total) dated before {cutoff} as overdue."
+        ))
@@ -1,6 +1,7 @@
 from rest_framework import generics, permissions
 from .models import Student, Faculty, Course
 from .serializers import StudentSerializer, FacultySerializer, CourseSerializer
+from .renderers import COLUMNAR_RENDERER_CLASSES
 
 
 # ---- Students CRUD ----
@@ -18,9 +19,10 @@ class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # ---- Faculty CRUD ----
 class FacultyListCreateView(generics.ListCreateAPIView):
-    queryset = Faculty.objects.all()
+    queryset = Faculty.objects.all().select_related("user")
     serializer_class = FacultySerializer
     permission_classes = [permissions.AllowAny]
+    renderer_classes = COLUMNAR_RENDERER_CLASSES  # ?format=columnar for table views
 
 
 class FacultyDetailView(generics.RetrieveUpdateDestroyAPIView):
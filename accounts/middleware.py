@@ -0,0 +1,57 @@
+"""
+Routing-aware replacements for the session, auth and messages middleware.
+
+Requests to the JSON API that carry a JWT bearer token never use the
+session, the messages framework or Django's session-based request.user, so
+for those requests the middleware below does nothing. Everything else
+(admin site, browsable API, DRF login, cookie-authenticated calls) goes
+through the stock Django behaviour unchanged.
+
+Configure the prefixes with API_FAST_PATH_PREFIXES (default: ("/api/",)).
+"""
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+
+
+def is_token_api_request(request):
+    """True for API paths authenticated with `Authorization: Bearer ...`."""
+    cached = getattr(request, "_token_api_request", None)
+    if cached is not None:
+        return cached
+    prefixes = getattr(settings, "API_FAST_PATH_PREFIXES", ("/api/",))
+    result = (
+        request.path_info.startswith(tuple(prefixes))
+        and request.META.get("HTTP_AUTHORIZATION", "").startswith("Bearer ")
+    )
+    request._token_api_request = result
+    return result
+
+
+class ApiAwareSessionMiddleware(SessionMiddleware):
+    def process_request(self, request):
+        if not is_token_api_request(request):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if not hasattr(request, "session"):
+            return response
+        return super().process_response(request, response)
+
+
+class ApiAwareAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        if is_token_api_request(request):
+            # DRF's JWTAuthentication sets the real user on the DRF request
+            request.user = AnonymousUser()
+            return
+        super().process_request(request)
+
+
+class ApiAwareMessageMiddleware(MessageMiddleware):
+    # process_response already skips requests without message storage
+    def process_request(self, request):
+        if not is_token_api_request(request):
+            super().process_request(request)
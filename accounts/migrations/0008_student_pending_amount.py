@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:00
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_student_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='pending_amount',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Coalesce(models.F('total_fees'), models.Value(0)), '-', django.db.models.functions.comparison.Coalesce(models.F('fees_paid'), models.Value(0))), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['pending_amount', 'id'], name='student_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['course', 'pending_amount'], name='student_course_pending_idx'),
+        ),
+    ]
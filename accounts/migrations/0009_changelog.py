@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:03
+
+from django.db import migrations, models
+
+
+def backfill_changelog(apps, schema_editor):
+    """Seed one upsert per existing row so a sync from token 0 returns everything."""
+    ChangeLog = apps.get_model('accounts', 'ChangeLog')
+    for entity, model_name in (('courses', 'Course'), ('faculty', 'Faculty'), ('students', 'Student'), ('fees', 'FeeRecord')):
+        model = apps.get_model('accounts', model_name)
+        ids = model.objects.order_by('id').values_list('id', flat=True)
+        ChangeLog.objects.bulk_create(
+            (ChangeLog(entity=entity, object_id=pk) for pk in ids.iterator(chunk_size=2000)),
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_student_pending_amount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('students', 'Student'), ('fees', 'Fee Record'), ('faculty', 'Faculty'), ('courses', 'Course')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity', 'id'], name='changelog_entity_seq_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_changelog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_changelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feerecord',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_feerecord_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_student_archived_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRoster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_ids', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+                ('digest', models.CharField(max_length=40)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rosters', to='accounts.course')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AttendanceSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('slot', models.PositiveSmallIntegerField(default=1, help_text='Period number within the day')),
+                ('present', models.BinaryField()),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_sessions', to='accounts.course')),
+                ('marked_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='accounts.faculty')),
+                ('roster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='accounts.attendanceroster')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='attendanceroster',
+            constraint=models.UniqueConstraint(fields=('course', 'digest'), name='attendance_roster_course_digest_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendancesession',
+            constraint=models.UniqueConstraint(fields=('course', 'date', 'slot'), name='attendance_session_uniq'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_attendance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Mark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.PositiveSmallIntegerField()),
+                ('marks', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('grade', models.CharField(max_length=2)),
+                ('grade_point', models.PositiveSmallIntegerField()),
+                ('credits', models.PositiveSmallIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='marks', to='accounts.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='marks', to='accounts.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course', 'semester'], name='mark_course_semester_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'semester', 'course'), name='mark_student_semester_course_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SemesterResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.PositiveSmallIntegerField()),
+                ('credits', models.PositiveIntegerField()),
+                ('points', models.PositiveIntegerField(help_text='Sum of credits × grade point')),
+                ('sgpa', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('cgpa', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='semester_results', to='accounts.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['semester', 'sgpa'], name='semester_result_sgpa_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'semester'), name='semester_result_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_marks_results'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feerecord',
+            index=models.Index(fields=['status', 'date_paid'], name='feerecord_status_date_idx'),
+        ),
+    ]
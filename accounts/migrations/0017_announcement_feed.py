@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementWatermark',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='announcement_watermark', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_seen_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['target_audience', 'created_at'], name='announcement_audience_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_announcementdelivery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollNumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('course_code', models.CharField(max_length=10)),
+                ('next_value', models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('year', 'course_code'), name='roll_number_sequence_uniq')],
+            },
+        ),
+    ]
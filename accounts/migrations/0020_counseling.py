@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0019_rollnumbersequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounselingRound',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveSmallIntegerField(unique=True)),
+                ('applicants', models.PositiveIntegerField(default=0)),
+                ('allocated', models.PositiveIntegerField(default=0)),
+                ('newly_allocated', models.PositiveIntegerField(default=0)),
+                ('upgraded', models.PositiveIntegerField(default=0)),
+                ('displaced', models.PositiveIntegerField(default=0, help_text='Lost a seat held from an earlier round')),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CounselingApplicant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('ojee_rank', models.PositiveIntegerField()),
+                ('preferences', models.JSONField(default=list)),
+                ('mode_of_entry', models.CharField(choices=[('Regular', 'Regular'), ('Lateral', 'Lateral')], default='Regular', max_length=20)),
+                ('status', models.CharField(choices=[('waiting', 'Waiting'), ('allocated', 'Allocated'), ('withdrawn', 'Withdrawn'), ('admitted', 'Admitted')], default='waiting', max_length=10)),
+                ('allocated_round', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('allocated_course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.course')),
+                ('student', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applicant', to='accounts.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'ojee_rank', 'id'], name='applicant_status_rank_idx')],
+            },
+        ),
+    ]
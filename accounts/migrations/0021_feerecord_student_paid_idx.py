@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0020_counseling'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feerecord',
+            index=models.Index(fields=['student', 'status', 'date_paid'], name='feerecord_student_paid_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:36
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_feerecord_student_paid_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('students', 'Student'), ('fees', 'Fee Record'), ('faculty', 'Faculty'), ('courses', 'Course')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('update', 'Update'), ('delete', 'Delete')], default='update', max_length=10)),
+                ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity', 'object_id', 'created_at'], name='audit_entity_object_idx'), models.Index(fields=['entity', 'created_at'], name='audit_entity_time_idx'), models.Index(fields=['actor', 'created_at'], name='audit_actor_time_idx'), models.Index(fields=['created_at'], name='audit_time_idx')],
+            },
+        ),
+    ]
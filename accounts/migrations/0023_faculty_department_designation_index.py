@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0022_auditentry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='faculty',
+            name='department',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='faculty',
+            name='designation',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_faculty_department_designation_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['entity', 'object_id', 'id'], name='changelog_object_seq_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:11
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_last_paid_on(apps, schema_editor):
+    """One set-based UPDATE: each student's latest "paid" date_paid (feerecord_student_paid_idx)."""
+    Student = apps.get_model('accounts', 'Student')
+    FeeRecord = apps.get_model('accounts', 'FeeRecord')
+    latest = (
+        FeeRecord.objects.filter(student=OuterRef('pk'), status='paid')
+        .order_by('-date_paid').values('date_paid')[:1]
+    )
+    Student.objects.update(last_paid_on=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_changelog_object_seq_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='last_paid_on',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_last_paid_on, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['mode_of_entry', 'course', 'last_paid_on', 'admission_date', 'pending_amount'], name='student_aging_idx'),
+        ),
+    ]
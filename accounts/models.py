@@ -1,7 +1,10 @@
 import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from datetime import timedelta
 
@@ -36,12 +39,15 @@ class Course(models.Model):
 # --- Faculty Model ---
 class Faculty(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    department = models.CharField(max_length=100)
-    designation = models.CharField(max_length=100)
+    # indexed for the admin's department prefix search and department / designation filters
+    # (on PostgreSQL db_index also adds the pattern-ops index a prefix LIKE needs)
+    department = models.CharField(max_length=100, db_index=True)
+    designation = models.CharField(max_length=100, db_index=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     assigned_courses = models.JSONField(default=list, blank=True)
     join_date = models.DateField()
     email = models.EmailField()
+
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.department}"
 
@@ -79,6 +85,9 @@ class Student(models.Model):
     # Fees fields (if not present)
     fees_paid = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     total_fees = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    # date of the latest "paid" FeeRecord (None if never paid), kept current by
+    # signals.refresh_last_paid(); the fee aging report ages outstanding fees from it
+    last_paid_on = models.DateField(blank=True, null=True, editable=False)
 
     # Parent details
     parent_name = models.CharField(max_length=128, blank=True, null=True)
@@ -87,9 +96,30 @@ class Student(models.Model):
     # Meta / timestamps (if you want)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # set when a student is archived (e.g. graduated batch); hidden from the student list
+    archived_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    # Outstanding fees computed by the database so defaulter queries can
+    # filter and sort on it (and use the index) without loading every row.
+    pending_amount = models.GeneratedField(
+        expression=Coalesce(F("total_fees"), Value(0)) - Coalesce(F("fees_paid"), Value(0)),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["pending_amount", "id"], name="student_pending_idx"),
+            models.Index(fields=["course", "pending_amount"], name="student_course_pending_idx"),
+            # covers the fee aging report (accounts/aging.py): grouped without reading the table
+            models.Index(
+                fields=["mode_of_entry", "course", "last_paid_on", "admission_date", "pending_amount"],
+                name="student_aging_idx",
+            ),
+        ]
 
     def pending_fees(self):
-        return self.total_fees - self.fees_paid
+        return (self.total_fees or 0) - (self.fees_paid or 0)
 
     def __str__(self):
         return f"{self.user.get_full_name()} ({self.roll_number})"
@@ -106,6 +136,16 @@ class FeeRecord(models.Model):
         ('overdue', 'Overdue'),
     ]
     status = models.CharField(max_length=10, choices=status_choices, default='paid')
+    # client-supplied key for payment posting; a retried request with the same key is not posted twice
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # overdue sweep and per-status summaries: WHERE status = ... [AND date_paid < ...]
+            models.Index(fields=["status", "date_paid"], name="feerecord_status_date_idx"),
+            # a student's last payment (fee aging): WHERE student_id = ... AND status = 'paid' ORDER BY date_paid DESC
+            models.Index(fields=["student", "status", "date_paid"], name="feerecord_student_paid_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student.user.username} - {self.status}"
@@ -132,10 +172,26 @@ class Announcement(models.Model):
     ]
     target_audience = models.CharField(max_length=10, choices=target_choices, default='all')
 
+    class Meta:
+        indexes = [
+            # per-user feed and unread counts: audience IN (...) AND created_at > watermark
+            models.Index(fields=["target_audience", "created_at"], name="announcement_audience_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.target_audience})"
 
 
+class AnnouncementWatermark(models.Model):
+    """Newest announcement time a user has seen; everything after it is unread."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="announcement_watermark")
+    last_seen_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} seen up to {self.last_seen_at}"
+
+
 # --- simple password-reset model ---
 class PasswordResetToken(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
@@ -151,4 +207,295 @@ class PasswordResetToken(models.Model):
         super().save(*args, **kwargs)
 
     def is_valid(self):
-        return timezone.now() <= self.expires_at
\ No newline at end of file
+        return timezone.now() <= self.expires_at
+
+
+# --- Change Log (delta sync) ---
+class ChangeLog(models.Model):
+    """
+    One row per create/update/delete of a synced model. The auto-increment id
+    is the sync sequence: clients keep the last id they saw as their token and
+    ask for everything after it.
+    """
+    ENTITY_CHOICES = [
+        ('students', 'Student'),
+        ('fees', 'Fee Record'),
+        ('faculty', 'Faculty'),
+        ('courses', 'Course'),
+    ]
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["entity", "id"], name="changelog_entity_seq_idx"),
+            # one object's latest change (per-student profile cache keys)
+            models.Index(fields=["entity", "object_id", "id"], name="changelog_object_seq_idx"),
+        ]
+
+    def __str__(self):
+        action = "delete" if self.deleted else "upsert"
+        return f"#{self.id} {action} {self.entity}:{self.object_id}"
+
+
+# --- Attendance Models ---
+class AttendanceRoster(models.Model):
+    """
+    Ordered list of a course's students, packed as little-endian uint64 ids.
+    Bit i of an AttendanceSession bitmap refers to student_ids[i]. Sessions
+    share a roster row until the class list changes.
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="attendance_rosters")
+    student_ids = models.BinaryField()
+    size = models.PositiveIntegerField()
+    digest = models.CharField(max_length=40)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["course", "digest"], name="attendance_roster_course_digest_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.course.code} roster ({self.size} students)"
+
+
+class AttendanceSession(models.Model):
+    """One class session of a course; `present` is a bitmap over the roster order."""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="attendance_sessions")
+    roster = models.ForeignKey(AttendanceRoster, on_delete=models.CASCADE, related_name="sessions")
+    date = models.DateField()
+    slot = models.PositiveSmallIntegerField(default=1, help_text="Period number within the day")
+    present = models.BinaryField()
+    present_count = models.PositiveIntegerField(default=0)
+    marked_by = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["course", "date", "slot"], name="attendance_session_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.course.code} {self.date} #{self.slot} ({self.present_count}/{self.roster.size})"
+
+# --- Marks & Results Models ---
+class Mark(models.Model):
+    """
+    A student's marks in one course for one semester. `credits` is copied
+    from Course.credits at upload so later credit changes don't rewrite
+    published results.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="marks")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="marks")
+    semester = models.PositiveSmallIntegerField()
+    marks = models.DecimalField(max_digits=5, decimal_places=2)
+    grade = models.CharField(max_length=2)
+    grade_point = models.PositiveSmallIntegerField()
+    credits = models.PositiveSmallIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "semester", "course"], name="mark_student_semester_course_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["course", "semester"], name="mark_course_semester_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.course.code} S{self.semester}: {self.grade}"
+
+
+class SemesterResult(models.Model):
+    """Persisted SGPA/CGPA per student per semester (see accounts/grading.py)."""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="semester_results")
+    semester = models.PositiveSmallIntegerField()
+    credits = models.PositiveIntegerField()
+    points = models.PositiveIntegerField(help_text="Sum of credits × grade point")
+    sgpa = models.DecimalField(max_digits=4, decimal_places=2)
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "semester"], name="semester_result_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["semester", "sgpa"], name="semester_result_sgpa_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student} S{self.semester}: SGPA {self.sgpa}, CGPA {self.cgpa}"
+
+
+# --- Export Job Model ---
+class ExportJob(models.Model):
+    """
+    A queued PDF/XLSX document. Output files are content-addressed by
+    `cache_key` (kind, format, params and the data version), so jobs asking for
+    the same document over unchanged data share one file.
+    """
+    KIND_CHOICES = [
+        ('fee_receipt', 'Fee receipt'),
+        ('course_statement', 'Course fee statement'),
+        ('fee_report', 'Fee report'),
+    ]
+    FORMAT_CHOICES = [('pdf', 'PDF'), ('xlsx', 'XLSX')]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    data_version = models.BigIntegerField(default=0)
+    cache_key = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    size = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind}.{self.format} ({self.status})"
+
+
+# --- Announcement Email Delivery Model ---
+class AnnouncementDelivery(models.Model):
+    """
+    Progress of emailing one announcement to its audience. Recipients are
+    processed in user-id order and `last_user_id` is committed after every
+    chunk, so an interrupted delivery resumes where it stopped.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    announcement = models.OneToOneField(Announcement, on_delete=models.CASCADE, related_name="delivery")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    last_user_id = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # heartbeat while sending
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.announcement} email: {self.sent}/{self.total} ({self.status})"
+
+
+# --- Roll Number Sequence Model ---
+class RollNumberSequence(models.Model):
+    """
+    Next roll-number serial for one (admission year, course code), see
+    accounts/rollnumbers.py. Serials are reserved by incrementing
+    `next_value` in place, so the row is locked for one UPDATE only.
+    """
+    year = models.PositiveSmallIntegerField()
+    course_code = models.CharField(max_length=10)
+    next_value = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["year", "course_code"], name="roll_number_sequence_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.year} {self.course_code}: next {self.next_value}"
+
+
+# --- Counseling (rank-based seat allocation) Models ---
+class CounselingApplicant(models.Model):
+    """
+    An applicant in seat-allocation counseling: OJEE rank plus ranked course
+    preferences (course ids, best first). Rounds (accounts/counseling.py) set
+    `allocated_course`; committing the allocation creates the Student.
+    """
+    STATUS_CHOICES = [
+        ('waiting', 'Waiting'),
+        ('allocated', 'Allocated'),
+        ('withdrawn', 'Withdrawn'),
+        ('admitted', 'Admitted'),
+    ]
+
+    name = models.CharField(max_length=100)
+    email = models.EmailField(unique=True)
+    ojee_rank = models.PositiveIntegerField()
+    preferences = models.JSONField(default=list)
+    mode_of_entry = models.CharField(max_length=20, choices=Student.MODE_CHOICES, default="Regular")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='waiting')
+    allocated_course = models.ForeignKey(Course, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    allocated_round = models.PositiveSmallIntegerField(null=True, blank=True)
+    student = models.OneToOneField(Student, on_delete=models.SET_NULL, null=True, blank=True, related_name="applicant")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "ojee_rank", "id"], name="applicant_status_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} (rank {self.ojee_rank}, {self.status})"
+
+
+class CounselingRound(models.Model):
+    """Outcome of one allocation round."""
+    number = models.PositiveSmallIntegerField(unique=True)
+    applicants = models.PositiveIntegerField(default=0)
+    allocated = models.PositiveIntegerField(default=0)
+    newly_allocated = models.PositiveIntegerField(default=0)
+    upgraded = models.PositiveIntegerField(default=0)
+    displaced = models.PositiveIntegerField(default=0, help_text="Lost a seat held from an earlier round")
+    duration_ms = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Round {self.number}: {self.allocated}/{self.applicants} allocated"
+
+
+# --- Audit Log Model ---
+class AuditEntry(models.Model):
+    """
+    Append-only record of an admin change: who changed which object, and the
+    changed fields as {"field": [old, new]}. Written in batches by
+    accounts/audit.py, so created_at is the time of the change, not of the insert.
+    """
+    ACTION_CHOICES = [
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+    ]
+    entity = models.CharField(max_length=20, choices=ChangeLog.ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default='update')
+    # no FK constraint: a batch flushed after the actor was deleted must still insert
+    actor = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", db_constraint=False,
+    )
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["entity", "object_id", "created_at"], name="audit_entity_object_idx"),
+            models.Index(fields=["entity", "created_at"], name="audit_entity_time_idx"),
+            models.Index(fields=["actor", "created_at"], name="audit_actor_time_idx"),
+            models.Index(fields=["created_at"], name="audit_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity}:{self.object_id} by {self.actor_id or 'anonymous'}"
@@ -0,0 +1,85 @@
+"""
+Pending → overdue fee transitions.
+
+A pending FeeRecord is overdue once FEE_DUE_WINDOW_WORKING_DAYS working days
+(Mon-Fri, excluding Holiday dates) have passed since its date. That
+turns into a single cutoff date, so both the sweep and the serializer
+work with `date_paid < cutoff`.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import FeeRecord, Holiday
+from .signals import record_changes
+from .transactions import immediate_atomic
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def due_window():
+    return getattr(settings, "FEE_DUE_WINDOW_WORKING_DAYS", 30)
+
+
+def overdue_cutoff(today=None, window=None):
+    """
+    Earliest date_paid that is NOT yet overdue on `today`: records dated
+    before it have at least `window` working days strictly between their
+    date and today.
+    """
+    today = today or timezone.localdate()
+    window = due_window() if window is None else window
+    holidays = set()
+    fetched_from = today
+
+    day = today
+    counted = 0
+    while counted < window:
+        day -= timedelta(days=1)
+        if day < fetched_from:
+            # fetch holidays a quarter at a time as the walk goes back
+            start = day - timedelta(days=90)
+            holidays.update(Holiday.objects.filter(date__gte=start, date__lt=fetched_from).values_list("date", flat=True))
+            fetched_from = start
+        if day.weekday() < 5 and day not in holidays:
+            counted += 1
+    return day
+
+
+def overdue_queryset(cutoff):
+    return FeeRecord.objects.filter(status="pending", date_paid__lt=cutoff)
+
+
+def sweep_overdue(cutoff, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """
+    Mark pending records dated before `cutoff` as overdue, `chunk_size` rows per
+    transaction. Each chunk moves rows from pending to overdue atomically, so
+    the fee summary totals stay consistent while the sweep runs. Returns
+    (records, amount) swept.
+    """
+    if dry_run:
+        totals = overdue_queryset(cutoff).aggregate(records=Count("pk"), amount=Sum("amount"))
+        return totals["records"], totals["amount"] or 0
+
+    records = amount = 0
+    while True:
+        with immediate_atomic():
+            # rows someone is editing right now are left for the next run
+            rows = list(
+                overdue_queryset(cutoff)
+                .select_for_update(skip_locked=True)
+                .order_by("status", "date_paid")
+                .values_list("pk", "amount")[:chunk_size]
+            )
+            if not rows:
+                break
+            ids = [pk for pk, _ in rows]
+            FeeRecord.objects.filter(pk__in=ids).update(status="overdue")
+            record_changes("fees", ids)
+        records += len(rows)
+        amount += sum(value for _, value in rows)
+        if len(rows) < chunk_size:
+            break
+    return records, amount
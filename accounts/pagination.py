@@ -0,0 +1,101 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a two-column ordering, e.g. ("-pending_amount", "-id").
+
+    The cursor carries the last row's ordering values, so every page is a
+    WHERE (a, b) < (x, y) range scan on an index instead of an OFFSET.
+    The last field must be unique (normally the primary key).
+    """
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering = ("-id",)
+
+    def get_ordering(self, request, view):
+        return getattr(view, "keyset_ordering", None) or self.ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor.")
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def seek(self, queryset, ordering, values):
+        """Rows strictly after `values` in `ordering`, as (a < x) OR (a = x AND b < y)."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return queryset.filter(condition)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering_fields = self.get_ordering(request, view)
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering_fields)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            if len(cursor) != len(self.ordering_fields):
+                raise NotFound("Invalid cursor.")
+            queryset = self.seek(queryset, self.ordering_fields, cursor)
+
+        # fetch one extra row to know whether there is a next page
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_values = None
+        if self.has_next:
+            last = rows[-1]
+            self.next_values = [getattr(last, field.lstrip("-")) for field in self.ordering_fields]
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_values))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
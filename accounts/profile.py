@@ -0,0 +1,184 @@
+"""
+Composite student profile: the student, their fee history, announcements for
+students and upcoming holidays in one response.
+
+Every request runs one query on the request thread: it checks the student
+exists and, through indexed subqueries (changelog_object_seq_idx), reads the
+versions of this student's own data: the latest ChangeLog id of the student
+row and of its course, and the number of their fee records with the latest
+ChangeLog id among them (the count catches deletes). Those versions, and the
+announcement and holiday generations (bumped on save, see signals.py), are
+part of the section cache keys, so a cached section is never served after its
+data changed, and changes to other students leave it cached. The linked
+user's username and email come from that same query and are never cached.
+Sections that miss the "shared" cache are built concurrently, one query
+each, on a small thread pool.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import feed, generations
+from .models import ChangeLog, FeeRecord, Holiday, Student
+from .serializers import AnnouncementSerializer, HolidaySerializer, StudentSerializer
+
+SECTION_TIMEOUT = 600
+ANNOUNCEMENT_LIMIT = 10
+HOLIDAY_LIMIT = 10
+
+
+def shared_cache():
+    return caches["shared"]
+
+
+def _latest_change(entity, object_id):
+    return Subquery(ChangeLog.objects.filter(entity=entity, object_id=object_id).order_by("-id").values("id")[:1])
+
+
+def probe(pk):
+    """
+    (exists, versions, user) from one query: the student's existence, the
+    versions of their own rows and the linked user's fields shown in the student section.
+    """
+    # MAX over the student's records: one seek per record on changelog_object_seq_idx
+    fee_changes = (
+        ChangeLog.objects.filter(
+            entity="fees", object_id__in=FeeRecord.objects.filter(student=OuterRef(OuterRef("pk"))).values("id"),
+        )
+        .order_by().values("entity").annotate(latest=Max("id")).values("latest")
+    )
+    fee_count = (
+        FeeRecord.objects.filter(student=OuterRef("pk"))
+        .order_by().values("student").annotate(count=Count("id")).values("count")
+    )
+    row = (
+        Student.objects.filter(pk=pk)
+        .annotate(
+            student_version=_latest_change("students", OuterRef("pk")),
+            course_version=_latest_change("courses", OuterRef("course_id")),
+            fees_version=Subquery(fee_changes),
+            fee_count=Coalesce(Subquery(fee_count), 0),
+        )
+        .values_list(
+            "student_version", "course_version", "fees_version", "fee_count",
+            "user__username", "user__email", "user__first_name", "user__last_name",
+        )
+        .first()
+    )
+    if row is None:
+        return False, None, None
+    student, course, fees, fee_count = (version or 0 for version in row[:4])
+    username, email, first_name, last_name = row[4:]
+    user = {"username": username, "email": email, "full_name": f"{first_name or ''} {last_name or ''}".strip()}
+    return True, {"student": student, "course": course, "fees": f"{fee_count}.{fees}"}, user
+
+
+# ---------------------------
+# Sections (one query each)
+# ---------------------------
+def student_section(pk):
+    # without the User fields: user edits don't touch the student change log, so
+    # build_profile() adds them from the probe on every request instead
+    student = Student.objects.select_related("user").get(pk=pk)
+    section = dict(StudentSerializer(student).data)
+    section.pop("email", None)
+    section.pop("username", None)
+    section["name"] = student.name or ""
+    return section
+
+
+def with_user(section, user):
+    section = {**section, "email": user["email"], "username": user["username"]}
+    if not section["name"]:
+        section["name"] = user["full_name"]  # as StudentSerializer does
+    return section
+
+
+def fees_section(pk):
+    records = []
+    totals = {status: Decimal("0.00") for status, _ in FeeRecord.status_choices}
+    for record_id, amount, status, date_paid in (
+        FeeRecord.objects.filter(student_id=pk).order_by("-date_paid", "-id")
+        .values_list("id", "amount", "status", "date_paid")
+    ):
+        records.append({"id": record_id, "amount": str(amount), "status": status, "date_paid": date_paid.isoformat()})
+        totals[status] = totals.get(status, Decimal("0.00")) + amount
+    return {
+        "records": records,
+        "count": len(records),
+        "totals": {status: str(amount) for status, amount in totals.items()},
+    }
+
+
+def announcements_section():
+    announcements = feed.visible_announcements("student").order_by("-created_at", "-id")[:ANNOUNCEMENT_LIMIT]
+    return [dict(item) for item in AnnouncementSerializer(announcements, many=True).data]
+
+
+def holidays_section(today):
+    holidays = Holiday.objects.filter(date__gte=today).order_by("date")[:HOLIDAY_LIMIT]
+    return [dict(item) for item in HolidaySerializer(holidays, many=True).data]
+
+
+# ---------------------------
+# Assembly
+# ---------------------------
+_pool_lock = threading.Lock()
+_pool = None
+
+
+def section_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="profile")
+        return _pool
+
+
+def _in_worker(build, *args):
+    close_old_connections()
+    try:
+        return build(*args)
+    finally:
+        close_old_connections()
+
+
+def build_profile(pk):
+    """The composite profile dict, or None if the student doesn't exist."""
+    exists, versions, user = probe(pk)
+    if not exists:
+        return None
+    today = timezone.localdate()
+    sections = {
+        "student": (f"profile:student:{pk}:{versions['student']}:{versions['course']}", student_section, (pk,)),
+        "fees": (f"profile:fees:{pk}:{versions['fees']}", fees_section, (pk,)),
+        "announcements": (
+            f"profile:announcements:{generations.generation(feed.GENERATION_KEY)}", announcements_section, (),
+        ),
+        "upcoming_holidays": (
+            f"profile:holidays:{today.isoformat()}:{generations.generation(generations.HOLIDAYS_KEY)}",
+            holidays_section, (today,),
+        ),
+    }
+    cache = shared_cache()
+    cached = cache.get_many([key for key, _, _ in sections.values()])
+    profile = {name: cached[key] for name, (key, _, _) in sections.items() if key in cached}
+    missing = [name for name in sections if name not in profile]
+
+    if len(missing) == 1:
+        _, build, args = sections[missing[0]]
+        profile[missing[0]] = build(*args)
+    elif missing:
+        futures = {name: section_pool().submit(_in_worker, sections[name][1], *sections[name][2]) for name in missing}
+        for name, future in futures.items():
+            profile[name] = future.result()
+    if missing:
+        cache.set_many({sections[name][0]: profile[name] for name in missing}, SECTION_TIMEOUT)
+    profile["student"] = with_user(profile["student"], user)
+    return {name: profile[name] for name in sections}
@@ -0,0 +1,23 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import profile
+
+
+# ======================================================
+# 🧾 COMPOSITE STUDENT PROFILE
+# ======================================================
+class StudentProfileView(APIView):
+    """
+    GET → the student (with user and course), their fee history with totals,
+    announcements for students and upcoming holidays, in one response.
+    Replaces separate calls to students/<pk>/, fees/, announcements/ and holidays/.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        data = profile.build_profile(pk)
+        if data is None:
+            return Response({"error": "Student not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
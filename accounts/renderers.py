@@ -0,0 +1,113 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+def to_columnar(rows):
+    """
+    [{"a": 1, "b": 2}, {"a": 3, "b": 4}] → {"columns": ["a", "b"], "rows": [[1, 2], [3, 4]]}
+
+    Columns are taken in first-seen order across all rows, so rows with
+    missing keys get null in that position. Lists that aren't all objects
+    (e.g. DRF's list-style validation errors) are returned unchanged.
+    """
+    if not all(isinstance(row, dict) for row in rows):
+        return rows
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    columns = list(columns)
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows],
+    }
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that sends list responses as a header row plus value arrays
+    instead of repeating every key on every object.
+
+    Selected with ?format=columnar or `Accept: application/vnd.columnar+json`.
+    Works on plain lists and on paginated envelopes (the "results" list is
+    converted, "next" etc. are kept). Anything else (errors, detail objects)
+    is rendered unchanged.
+    """
+    media_type = "application/vnd.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list):
+            data = to_columnar(data)
+        elif isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = {**data, "results": to_columnar(data["results"])}
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+# Default renderers plus the columnar one, for large tabular list endpoints.
+COLUMNAR_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
+
+# ---------------------------
+# Streaming list responses
+# ---------------------------
+def stream_json_array(rows, serialize, render, chunk_size):
+    """
+    Yield a JSON array piece by piece: `rows` is consumed chunk_size items at
+    a time, each chunk is serialized and rendered as a list, and its brackets
+    are dropped. With compact separators "[" + ",".join(chunk bodies) + "]"
+    is byte-for-byte what rendering the whole list at once produces.
+    """
+    rows = iter(rows)
+    yield b"["
+    first = True
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        body = render(serialize(chunk))[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]"
+
+
+class StreamingListMixin:
+    """
+    For ListAPIViews that return large unpaginated arrays: plain JSON list
+    responses are streamed from a chunked queryset iterator instead of
+    building serializer.data and the whole JSON string in memory. The bytes
+    are identical to the buffered response; other formats (columnar,
+    browsable API, ?indent) and paginated views fall back to the buffered path.
+
+    Since the body is produced while it is sent, a database error halfway
+    through truncates the response instead of turning it into a 500.
+    """
+    stream_chunk_size = 500
+
+    def can_stream(self, request):
+        renderer = request.accepted_renderer
+        return (
+            type(renderer) is JSONRenderer
+            and self.paginator is None
+            and renderer.get_indent(request.accepted_media_type, self.get_renderer_context()) is None
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.can_stream(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        # one ListSerializer for every chunk, so per-serializer caches are kept
+        serializer = self.get_serializer(many=True)
+        renderer = request.accepted_renderer
+        context = self.get_renderer_context()
+        chunks = stream_json_array(
+            queryset.iterator(chunk_size=self.stream_chunk_size),
+            serializer.to_representation,
+            lambda data: renderer.render(data, request.accepted_media_type, context),
+            self.stream_chunk_size,
+        )
+        return StreamingHttpResponse(chunks, content_type=renderer.media_type)
+
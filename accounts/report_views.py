@@ -2,20 +2,38 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
 from django.db.models import Sum
+from django.utils import timezone
+
+from . import aging, coalesce
 from .models import FeeRecord
 
+
+def fee_summary_data():
+    paid = FeeRecord.objects.filter(status='paid').aggregate(Sum('amount'))['amount__sum'] or 0
+    pending = FeeRecord.objects.filter(status='pending').aggregate(Sum('amount'))['amount__sum'] or 0
+    overdue = FeeRecord.objects.filter(status='overdue').aggregate(Sum('amount'))['amount__sum'] or 0
+
+    return {
+        "paid": paid,
+        "pending": pending,
+        "overdue": overdue
+    }
+
+
 class FeeSummaryView(APIView):
-    """Return total paid, pending, and overdue fee amounts"""
+    """Return total paid, pending, and overdue fee amounts (single-flight, see coalesce.py)"""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(coalesce.get_or_compute("aggregates:fee-summary", fee_summary_data))
+
+
+class FeeAgingView(APIView):
+    """
+    Outstanding fees per course and mode_of_entry in 0-30, 31-60, 61-90 and
+    90+ day buckets, aged from each student's last payment (see aging.py).
+    """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        paid = FeeRecord.objects.filter(status='paid').aggregate(Sum('amount'))['amount__sum'] or 0
-        pending = FeeRecord.objects.filter(status='pending').aggregate(Sum('amount'))['amount__sum'] or 0
-        overdue = FeeRecord.objects.filter(status='overdue').aggregate(Sum('amount'))['amount__sum'] or 0
-
-        data = {
-            "paid": paid,
-            "pending": pending,
-            "overdue": overdue
-        }
-        return Response(data)
+        return Response(aging.report(timezone.localdate()))
@@ -0,0 +1,140 @@
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import grading
+from .models import Mark, SemesterResult, Student
+from .pagination import KeysetPagination
+from .serializers import MarksUploadSerializer, SemesterResultSerializer
+
+
+# ======================================================
+# 📝 MARKS UPLOAD (one course, one semester, whole class)
+# ======================================================
+class MarksUploadView(APIView):
+    """
+    POST → {"course": 3, "semester": 2, "marks": [{"student": 12, "marks": 78.5}, ...]}
+
+    Marks are graded and upserted in bulk (re-uploading a student replaces
+    their marks). SGPA/CGPA is then recomputed for those students only.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = MarksUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        course = serializer.validated_data["course"]
+        semester = serializer.validated_data["semester"]
+        entries = serializer.validated_data["marks"]
+
+        student_ids = [entry["student"] for entry in entries]
+        known = set(Student.objects.filter(pk__in=student_ids).values_list("pk", flat=True))
+        unknown = sorted(set(student_ids) - known)
+        if unknown:
+            return Response({"error": f"Unknown students: {unknown}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        marks = []
+        for entry in entries:
+            grade, point = grading.grade_for(entry["marks"])
+            marks.append(Mark(
+                student_id=entry["student"], course=course, semester=semester,
+                marks=entry["marks"], grade=grade, grade_point=point, credits=course.credits,
+            ))
+
+        with transaction.atomic():
+            Mark.objects.bulk_create(
+                marks,
+                batch_size=2000,
+                update_conflicts=True,
+                unique_fields=["student", "semester", "course"],
+                update_fields=["marks", "grade", "grade_point", "credits", "updated_at"],
+            )
+            updated = grading.recompute_students(student_ids, semester)
+
+        return Response({
+            "course": course.pk,
+            "semester": semester,
+            "uploaded": len(marks),
+            "results_updated": updated,
+        }, status=status.HTTP_201_CREATED)
+
+
+# ======================================================
+# 🎓 RESULTS
+# ======================================================
+class StudentResultsView(APIView):
+    """GET → a student's SGPA/CGPA per semester with the graded courses."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        student = get_object_or_404(Student, pk=pk)
+        marks = (
+            Mark.objects.filter(student=student)
+            .order_by("semester", "course__code")
+            .values("semester", "course_id", "course__code", "course__name", "credits", "marks", "grade", "grade_point")
+        )
+        courses_by_semester = {}
+        for mark in marks:
+            courses_by_semester.setdefault(mark.pop("semester"), []).append({
+                "course": mark["course_id"],
+                "code": mark["course__code"],
+                "name": mark["course__name"],
+                "credits": mark["credits"],
+                "marks": str(mark["marks"]),
+                "grade": mark["grade"],
+                "grade_point": mark["grade_point"],
+            })
+
+        results = list(SemesterResult.objects.filter(student=student).order_by("semester"))
+        return Response({
+            "student": student.pk,
+            "name": student.name,
+            "roll_number": student.roll_number,
+            "cgpa": str(results[-1].cgpa) if results else None,
+            "semesters": [
+                {
+                    "semester": result.semester,
+                    "credits": result.credits,
+                    "sgpa": str(result.sgpa),
+                    "cgpa": str(result.cgpa),
+                    "courses": courses_by_semester.get(result.semester, []),
+                }
+                for result in results
+            ],
+        })
+
+
+class SemesterResultPagination(KeysetPagination):
+    page_size = 200
+
+
+class SemesterResultListView(generics.ListAPIView):
+    """
+    GET ?semester=2 → that semester's results, highest SGPA first.
+    Optional: course (program id), ordering=cgpa, cursor, page_size.
+    """
+    serializer_class = SemesterResultSerializer
+    pagination_class = SemesterResultPagination
+    permission_classes = [permissions.AllowAny]
+
+    @property
+    def keyset_ordering(self):
+        if self.request.query_params.get("ordering") == "cgpa":
+            return ("-cgpa", "-id")
+        return ("-sgpa", "-id")
+
+    def get_queryset(self):
+        params = self.request.query_params
+        semester = params.get("semester")
+        if not semester or not semester.isdigit():
+            raise ValidationError({"semester": "Required, a semester number."})
+        results = SemesterResult.objects.filter(semester=int(semester)).select_related("student")
+        course = params.get("course")
+        if course:
+            if not course.isdigit():
+                raise ValidationError({"course": "Must be a course id."})
+            results = results.filter(student__course_id=int(course))
+        return results
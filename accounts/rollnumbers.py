@@ -0,0 +1,111 @@
+"""
+Roll-number allocation.
+
+Roll numbers look like 25CSE0042: the 2-digit admission year (the student
+and fee lists filter on that prefix), the course code and a zero-padded
+serial that counts up per (year, course). Students without a course use
+NO_COURSE as the code.
+
+Serials come from a RollNumberSequence row per (year, course code).
+`reserve()` takes `count` consecutive serials with a single
+`UPDATE ... SET next_value = next_value + count` in its own short
+transaction (BEGIN IMMEDIATE on SQLite, see transactions.py). Concurrent admissions therefore queue only on that one-row
+update, never on each other's Student inserts, and nothing scans the student
+table. The one exception is the first reservation for a (year, course): it
+starts the sequence after the highest roll number already in that format
+(for example one assigned by hand), found with one range lookup on the unique
+roll_number index.
+
+A reserved serial is never handed out again, even if the admission that took
+it fails, so roll numbers can have gaps (like a database sequence). Bulk
+imports reserve a whole block at once with `allocate(year, code, count)`.
+Serials never outgrow ROLL_NUMBER_WIDTH digits: a reservation that would run
+past 10 ** width - 1 raises SerialsExhausted and takes nothing.
+
+Call these functions outside any long transaction of your own. Inside one, the
+sequence row stays locked until that transaction commits.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import RollNumberSequence, Student
+from .transactions import immediate_atomic
+
+NO_COURSE = "GEN"
+MAX_BLOCK = 5000
+
+
+class SerialsExhausted(ValueError):
+    """The (year, course) sequence has no room left for the requested serials at ROLL_NUMBER_WIDTH digits."""
+
+
+def width():
+    return settings.ROLL_NUMBER_WIDTH
+
+
+def format_roll(year, course_code, serial):
+    return f"{year % 100:02d}{course_code}{serial:0{width()}d}"
+
+
+def _highest_existing(year, course_code):
+    """Largest serial already used in this (year, course) format, or 0."""
+    prefix = format_roll(year, course_code, 0)[: -width()]
+    candidates = (
+        Student.objects.filter(
+            roll_number__gte=format_roll(year, course_code, 0),
+            roll_number__lte=format_roll(year, course_code, 10 ** width() - 1),
+        )
+        .order_by("-roll_number")
+        .values_list("roll_number", flat=True)
+    )
+    # the range can also hold longer hand-typed values (e.g. 25CSE00421); skip those
+    for roll_number in candidates.iterator(chunk_size=100):
+        serial = roll_number[len(prefix):]
+        if len(serial) == width() and serial.isdigit():
+            return int(serial)
+    return 0
+
+
+def _start_sequence(year, course_code):
+    start = _highest_existing(year, course_code) + 1
+    try:
+        with transaction.atomic():
+            RollNumberSequence.objects.create(year=year, course_code=course_code, next_value=start)
+    except IntegrityError:
+        pass  # another admission started it first
+
+
+def reserve(year, course_code, count=1):
+    """
+    Reserve `count` consecutive serials for (year, course_code). Returns the
+    first one. Raises SerialsExhausted if they wouldn't fit in ROLL_NUMBER_WIDTH digits.
+    """
+    if not 1 <= count <= MAX_BLOCK:
+        raise ValueError(f"count must be between 1 and {MAX_BLOCK}")
+    sequence = RollNumberSequence.objects.filter(year=year, course_code=course_code)
+    for _ in range(2):
+        with immediate_atomic():
+            # the UPDATE comes first so the row lock (and SQLite's write lock) is taken before any read
+            if sequence.update(next_value=F("next_value") + count):
+                first = sequence.values_list("next_value", flat=True).get() - count
+                if first + count - 1 >= 10 ** width():
+                    # raising rolls the update back, so the remaining serials stay available
+                    raise SerialsExhausted(
+                        f"Only {max(0, 10 ** width() - first)} roll numbers left for {year}/{course_code} "
+                        f"at {width()} digits, {count} requested. Raise ROLL_NUMBER_WIDTH."
+                    )
+                return first
+        _start_sequence(year, course_code)
+    raise RuntimeError(f"Roll-number sequence {year}/{course_code} could not be created.")
+
+
+def allocate(year, course_code, count=1):
+    """`count` new roll numbers for (year, course_code), in order."""
+    first = reserve(year, course_code, count)
+    return [format_roll(year, course_code, serial) for serial in range(first, first + count)]
+
+
+def for_admission(course, admission_date):
+    """The next roll number for a student admitted to `course` (or no course) on `admission_date`."""
+    return allocate(admission_date.year, course.code if course is not None else NO_COURSE)[0]
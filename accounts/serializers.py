@@ -1,7 +1,16 @@
+from collections import Counter
+from decimal import Decimal
 from rest_framework import serializers
-from .models import FeeRecord, Holiday, Student, Faculty, Course, Announcement
+from .models import (
+    FeeRecord, Holiday, Student, Faculty, Course, Announcement, AnnouncementDelivery, SemesterResult, ExportJob,
+    CounselingApplicant, CounselingRound, AuditEntry,
+)
+from .overdue import overdue_cutoff
+from . import audit, catalog, rollnumbers
+from .transactions import immediate_atomic
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
 from django.db import transaction, IntegrityError
 
@@ -15,6 +24,29 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+# --- Course Field (catalog-backed) ---
+class CatalogCourseField(serializers.PrimaryKeyRelatedField):
+    """
+    Course id validated against the in-memory catalog instead of a query per
+    write. The instance it returns has seats_available deferred, so code that
+    needs live seats still reads them from the database.
+    """
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Course.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            course = catalog.course_instance(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if course is None:
+            self.fail('does_not_exist', pk_value=data)
+        return course
+
+
 # --- Faculty Serializer ---
 class FacultySerializer(serializers.ModelSerializer):
     # read/write mapped to the related User.email
@@ -40,7 +72,8 @@ class FacultySerializer(serializers.ModelSerializer):
         Update Faculty without creating/updating a duplicate related user record.
         Email updates are applied to the related User model.
         """
-        validated_data.pop('user', None)  # prevent DRF trying to overwrite user relation
+        user_data = validated_data.pop('user', None) or {}  # prevent DRF trying to overwrite user relation
+        before = audit.snapshot(instance, email=instance.user.email if instance.user else None)
 
         # update simple Faculty fields
         instance.department = validated_data.get('department', instance.department)
@@ -50,13 +83,18 @@ class FacultySerializer(serializers.ModelSerializer):
         instance.assigned_courses = validated_data.get('assigned_courses', instance.assigned_courses)
 
         # handle email on related user if provided
-        if 'email' in validated_data:
-            email_val = validated_data['email']
+        if 'email' in user_data:
+            email_val = user_data['email']
             if instance.user:
                 instance.user.email = email_val
                 instance.user.save()
 
         instance.save()
+        request = self.context.get('request')
+        audit.record(
+            "faculty", instance.pk, getattr(request, 'user', None), before,
+            audit.snapshot(instance, email=instance.user.email if instance.user else None),
+        )
         return instance
 
     def create(self, validated_data):
@@ -126,12 +164,18 @@ class StudentSerializer(serializers.ModelSerializer):
     # Username is read-only and pulled from linked User (if exists)
     username = serializers.CharField(source="user.username", read_only=True)
 
+    # Outstanding fees, computed by the database (total_fees - fees_paid)
+    pending_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    course = CatalogCourseField(required=True, allow_null=True)
+
     class Meta:
         model = Student
         fields = "__all__"
         extra_kwargs = {
             "user": {"read_only": True},
-            "course": {"required": True},
+            # left out → allocated from the (year, course) sequence, see accounts/rollnumbers.py
+            "roll_number": {"required": False},
         }
 
     # ---------------------------
@@ -153,12 +197,28 @@ class StudentSerializer(serializers.ModelSerializer):
             if full_name and not rep["name"]:
                 rep["name"] = full_name
 
-        # readable course name & seat info for frontend convenience
-        rep["course_name"] = instance.course.name if instance.course else None
-        rep["seats_available"] = getattr(instance.course, "seats_available", None)
+        # readable course name (catalog) & live seat info for frontend convenience
+        course = catalog.get(instance.course_id)
+        rep["course_name"] = course.name if course else None
+        rep["seats_available"] = self.live_seats().get(instance.course_id) if course else None
 
         return rep
 
+    def live_seats(self):
+        # read once per serializer, i.e. once for a whole list
+        if not hasattr(self, "_live_seats"):
+            self._live_seats = catalog.live_seats()
+        return self._live_seats
+
+    # ---------------------------
+    # Update (reload DB-computed columns)
+    # ---------------------------
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        # pending_amount is generated by the database, so re-read it after saving fees
+        instance.refresh_from_db(fields=["pending_amount"])
+        return instance
+
     # ---------------------------
     # Create (uses writable email & name)
     # ---------------------------
@@ -182,8 +242,15 @@ class StudentSerializer(serializers.ModelSerializer):
         # course is expected to be a Course instance (PrimaryKeyRelatedField in view)
         course = validated_data.get("course")
 
+        # allocate before the admission transaction so the sequence row is locked only briefly
+        if not validated_data.get("roll_number"):
+            try:
+                validated_data["roll_number"] = rollnumbers.for_admission(course, validated_data["admission_date"])
+            except rollnumbers.SerialsExhausted as exc:
+                raise serializers.ValidationError({"roll_number": str(exc)})
+
         try:
-            with transaction.atomic():
+            with immediate_atomic():
                 # lock course row to prevent race conditions
                 if course is not None:
                     # course may already be an instance; ensure fresh select_for_update
@@ -232,7 +299,7 @@ class StudentSerializer(serializers.ModelSerializer):
                 # decrement seats
                 if course is not None:
                     course.seats_available = max(0, course.seats_available - 1)
-                    course.save()
+                    course.save(update_fields=["seats_available"])  # leaves the course catalog alone
 
                 # return fully populated instance
                 student = Student.objects.select_related("user", "course").get(id=student.id)
@@ -298,8 +365,8 @@ class FeeRecordSerializer(serializers.ModelSerializer):
 
     # ✅ Department auto-fetch from student's course
     def get_department(self, obj):
-        course = getattr(obj.student, "course", None)
-        return getattr(course, "name", "-")
+        course = catalog.get(obj.student.course_id)
+        return course.name if course else "-"
 
     # ✅ Mobile number (from student’s parent_contact if available)
     def get_mobile(self, obj):
@@ -309,17 +376,20 @@ class FeeRecordSerializer(serializers.ModelSerializer):
     def get_total_fees(self, obj):
         return float(getattr(obj.student, "total_fees", 0))
 
-    # ✅ Due fees (total - paid)
+    # ✅ Due fees (total - paid, computed by the database)
     def get_due(self, obj):
-        total = getattr(obj.student, "total_fees", 0) or 0
-        paid = getattr(obj.student, "fees_paid", 0) or 0
-        return float(total - paid)
+        return float(getattr(obj.student, "pending_amount", 0) or 0)
 
-    # ✅ Overdue (if pending for >30 days)
+    # ✅ Overdue (marked overdue, or pending past the working-day due window)
     def get_overdue(self, obj):
-        from datetime import date
         if obj.status == "overdue":
             return float(obj.amount)
+        if obj.status == "pending":
+            # computed once per serializer, i.e. once for a whole list
+            if not hasattr(self, "_overdue_cutoff"):
+                self._overdue_cutoff = overdue_cutoff()
+            if obj.date_paid < self._overdue_cutoff:
+                return float(obj.amount)
         return 0.0
 
     # ✅ Last paid (auto)
@@ -327,6 +397,105 @@ class FeeRecordSerializer(serializers.ModelSerializer):
         return obj.date_paid
     
         
+# --- Student Batch Update Item Serializer ---
+class StudentBatchItemSerializer(serializers.ModelSerializer):
+    """
+    One row of a batch PATCH. Only field-level validation happens here;
+    course existence and roll_number uniqueness are checked for the whole
+    batch at once by the view (one query each instead of one per row).
+    """
+    id = serializers.IntegerField()
+    course = serializers.IntegerField(required=False)
+    roll_number = serializers.CharField(required=False, max_length=64)
+
+    class Meta:
+        model = Student
+        fields = [
+            "id",
+            "name",
+            "course",
+            "roll_number",
+            "admission_date",
+            "mode_of_entry",
+            "fees_paid",
+            "total_fees",
+            "aadhar",
+            "abc_id",
+            "address",
+            "blood_group",
+            "ojee_rank",
+            "marksheet_ref",
+            "university_reg_no",
+            "parent_name",
+            "parent_contact",
+        ]
+
+
+# --- Roll Number Block Serializer ---
+class RollNumberBlockSerializer(serializers.Serializer):
+    """A block of roll numbers to reserve for a bulk import (one course, one admission year)."""
+    course = CatalogCourseField(allow_null=True)
+    year = serializers.IntegerField(min_value=2000, max_value=2099, default=lambda: timezone.localdate().year)
+    count = serializers.IntegerField(min_value=1, max_value=rollnumbers.MAX_BLOCK)
+
+
+# --- Bulk Remove Serializers ---
+class BulkRemoveSerializer(serializers.Serializer):
+    """Options shared by the bulk delete/archive endpoints; subclasses add the filters."""
+    action = serializers.ChoiceField(choices=["archive", "delete"], default="archive")
+    dry_run = serializers.BooleanField(default=False)
+    chunk_size = serializers.IntegerField(required=False, allow_null=True)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=10_000)
+
+
+class StudentBulkRemoveSerializer(BulkRemoveSerializer):
+    course = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    year = serializers.IntegerField(min_value=0, max_value=9999, required=False, allow_null=True)
+    entry_type = serializers.CharField(max_length=20, required=False, allow_blank=True)
+
+
+class FacultyBulkRemoveSerializer(BulkRemoveSerializer):
+    department = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+
+# --- Fee Payment (bulk posting) Serializer ---
+class FeePaymentSerializer(serializers.Serializer):
+    """One payment in a bulk posting request."""
+    idempotency_key = serializers.CharField(max_length=64)
+    student = serializers.IntegerField()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal("0.01"))
+    date_paid = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=FeeRecord.status_choices, default="paid")
+
+
+# --- Fee Defaulter Serializer ---
+class FeeDefaulterSerializer(serializers.ModelSerializer):
+    """Flat, read-only row for the defaulters list (one per student)."""
+    email = serializers.EmailField(source="user.email", read_only=True)
+    course_name = serializers.SerializerMethodField()
+    pending_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Student
+        fields = [
+            "id",
+            "name",
+            "roll_number",
+            "email",
+            "course",
+            "course_name",
+            "mode_of_entry",
+            "total_fees",
+            "fees_paid",
+            "pending_amount",
+        ]
+        read_only_fields = fields
+
+    def get_course_name(self, obj):
+        course = catalog.get(obj.course_id)
+        return course.name if course else None
+
+
 # --- Register Serializer ---
 class RegisterSerializer(serializers.ModelSerializer):
     """For registration (signup)."""
@@ -356,13 +525,260 @@ class RegisterSerializer(serializers.ModelSerializer):
 
 # --- Announcement Serializer ---
 class AnnouncementSerializer(serializers.ModelSerializer):
+    # also email the announcement to its audience (see accounts/mailing.py)
+    send_email = serializers.BooleanField(write_only=True, required=False, default=False)
+
     class Meta:
         model = Announcement
-        fields = ['id', 'title', 'message', 'target_audience', 'created_at']
+        fields = ['id', 'title', 'message', 'target_audience', 'created_at', 'send_email']
+
+    def create(self, validated_data):
+        validated_data.pop('send_email', None)
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        validated_data.pop('send_email', None)
+        return super().update(instance, validated_data)
 
 
 # --- Holiday Serializer ---
 class HolidaySerializer(serializers.ModelSerializer):
     class Meta:
         model = Holiday
-        fields = ['id', 'title', 'date']
\ No newline at end of file
+        fields = ['id', 'title', 'date']
+
+# --- Attendance Mark Serializer ---
+class AttendanceMarkSerializer(serializers.Serializer):
+    """One whole class session: either the present or the absent student ids."""
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    date = serializers.DateField(default=timezone.localdate)
+    slot = serializers.IntegerField(min_value=1, max_value=32767, default=1)
+    faculty = serializers.PrimaryKeyRelatedField(queryset=Faculty.objects.all(), required=False, allow_null=True)
+    present = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    absent = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+
+    def validate(self, attrs):
+        if ('present' in attrs) == ('absent' in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'present' or 'absent'.")
+        return attrs
+
+
+# --- Marks Upload Serializers ---
+class MarkEntrySerializer(serializers.Serializer):
+    student = serializers.IntegerField(min_value=1)
+    marks = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal("0"), max_value=Decimal("100"))
+
+
+class MarksUploadSerializer(serializers.Serializer):
+    """All marks of one course for one semester."""
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    semester = serializers.IntegerField(min_value=1, max_value=16)
+    marks = MarkEntrySerializer(many=True, allow_empty=False)
+
+    def validate_marks(self, value):
+        counts = Counter(entry['student'] for entry in value)
+        duplicates = [student for student, count in counts.items() if count > 1]
+        if duplicates:
+            raise serializers.ValidationError(f"Duplicate students: {sorted(duplicates)}")
+        return value
+
+
+# --- Semester Result Serializer ---
+class SemesterResultSerializer(serializers.ModelSerializer):
+    student_name = serializers.CharField(source='student.name', read_only=True)
+    roll_number = serializers.CharField(source='student.roll_number', read_only=True)
+
+    class Meta:
+        model = SemesterResult
+        fields = ['id', 'student', 'student_name', 'roll_number', 'semester', 'credits', 'sgpa', 'cgpa', 'updated_at']
+        read_only_fields = fields
+
+
+# --- Export Job Serializers ---
+class ExportRequestSerializer(serializers.Serializer):
+    """fee_receipt needs `fee`, course_statement needs `course`, fee_report takes nothing."""
+    kind = serializers.ChoiceField(choices=ExportJob.KIND_CHOICES)
+    format = serializers.ChoiceField(choices=ExportJob.FORMAT_CHOICES, default='pdf')
+    fee = serializers.PrimaryKeyRelatedField(queryset=FeeRecord.objects.all(), required=False)
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all(), required=False)
+
+    REQUIRED_PARAMS = {'fee_receipt': 'fee', 'course_statement': 'course', 'fee_report': None}
+
+    def validate(self, attrs):
+        param = self.REQUIRED_PARAMS[attrs['kind']]
+        if param and param not in attrs:
+            raise serializers.ValidationError({param: f"Required for {attrs['kind']}."})
+        attrs['params'] = {param: attrs[param].pk} if param else {}
+        return attrs
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = ['id', 'kind', 'format', 'params', 'status', 'data_version', 'size', 'error',
+                  'created_at', 'finished_at', 'download_url']
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != 'done':
+            return None
+        request = self.context.get('request')
+        url = reverse('export_download', args=[obj.pk])
+        return request.build_absolute_uri(url) if request else url
+
+
+# --- Announcement Feed Serializer ---
+class AnnouncementFeedSerializer(AnnouncementSerializer):
+    """Announcement plus `unread`, relative to context['watermark']."""
+    unread = serializers.SerializerMethodField()
+
+    class Meta(AnnouncementSerializer.Meta):
+        fields = AnnouncementSerializer.Meta.fields + ['unread']
+
+    def get_unread(self, obj):
+        watermark = self.context.get('watermark')
+        return watermark is None or obj.created_at > watermark
+
+
+# --- Announcement Delivery Serializer ---
+class AnnouncementDeliverySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AnnouncementDelivery
+        fields = ['announcement', 'status', 'total', 'sent', 'failed', 'error', 'created_at', 'updated_at', 'finished_at']
+
+
+# --- Batch Request Serializer ---
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    requests: GET paths, either "courses/?page=2" (relative to /api/auth/),
+    "/api/auth/courses/", or {"path": ..., "etag": <ETag from an earlier batch>}.
+    Validates to a list of (path, etag) pairs.
+    """
+    MAX_REQUESTS = 20
+
+    requests = serializers.ListField(child=serializers.JSONField(), min_length=1, max_length=MAX_REQUESTS)
+
+    def validate_requests(self, items):
+        pairs = []
+        for item in items:
+            if isinstance(item, str):
+                path, etag = item, None
+            elif isinstance(item, dict) and isinstance(item.get('path'), str):
+                path, etag = item['path'], item.get('etag')
+                if etag is not None and not isinstance(etag, str):
+                    raise serializers.ValidationError("'etag' must be a string.")
+            else:
+                raise serializers.ValidationError('Each request is a path or {"path": ..., "etag": ...}.')
+            if not path or '://' in path or path.startswith('//'):
+                raise serializers.ValidationError(f"Not a relative path: {path!r}.")
+            pairs.append((path, etag))
+        return pairs
+
+
+# --- Counseling Applicant Serializers ---
+class CounselingApplicantListSerializer(serializers.ListSerializer):
+    """Many applicants at once: e-mail uniqueness checked per batch, rows bulk-created."""
+
+    def validate(self, attrs):
+        counts = Counter(item['email'] for item in attrs)
+        duplicates = sorted(email for email, count in counts.items() if count > 1)
+        if duplicates:
+            raise serializers.ValidationError(f"Duplicate e-mails in batch: {duplicates[:20]}")
+        emails = list(counts)
+        taken = []
+        for start in range(0, len(emails), 2000):
+            taken.extend(
+                CounselingApplicant.objects.filter(email__in=emails[start:start + 2000]).values_list('email', flat=True)
+            )
+        if taken:
+            raise serializers.ValidationError(f"Applicants already registered: {sorted(taken)[:20]}")
+        return attrs
+
+    def create(self, validated_data):
+        return CounselingApplicant.objects.bulk_create(
+            [CounselingApplicant(**item) for item in validated_data], batch_size=2000,
+        )
+
+
+class CounselingApplicantSerializer(serializers.ModelSerializer):
+    """
+    An applicant and their ranked course preferences (course ids, best first).
+    The allocation fields are set by counseling rounds; the only status an
+    applicant can be given by hand is "withdrawn".
+    """
+    MAX_PREFERENCES = 20
+
+    # uniqueness is checked in validate_email (one row) or per batch (list serializer)
+    email = serializers.EmailField(max_length=254)
+    preferences = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_PREFERENCES,
+    )
+    allocated_course_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CounselingApplicant
+        list_serializer_class = CounselingApplicantListSerializer
+        fields = [
+            'id', 'name', 'email', 'ojee_rank', 'preferences', 'mode_of_entry', 'status',
+            'allocated_course', 'allocated_course_name', 'allocated_round', 'student', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['allocated_course', 'allocated_round', 'student', 'created_at', 'updated_at']
+
+    def get_allocated_course_name(self, obj):
+        course = catalog.get(obj.allocated_course_id)
+        return course.name if course else None
+
+    def validate_email(self, value):
+        value = value.lower()
+        if self.parent is None:
+            others = CounselingApplicant.objects.filter(email=value)
+            if self.instance is not None:
+                others = others.exclude(pk=self.instance.pk)
+            if others.exists():
+                raise serializers.ValidationError("An applicant with this e-mail is already registered.")
+        return value
+
+    def validate_preferences(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("A course can be listed only once.")
+        unknown = [course_id for course_id in value if catalog.get(course_id) is None]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown courses: {unknown}")
+        return value
+
+    def validate_status(self, value):
+        current = self.instance.status if self.instance is not None else 'waiting'
+        if value != current and value != 'withdrawn':
+            raise serializers.ValidationError("Only 'withdrawn' can be set; allocation rounds set the rest.")
+        return value
+
+    def validate(self, attrs):
+        if self.instance is not None and self.instance.status == 'admitted':
+            raise serializers.ValidationError("Admitted applicants can't be changed.")
+        if attrs.get('status') == 'withdrawn':
+            attrs['allocated_course'] = None
+            attrs['allocated_round'] = None
+        return attrs
+
+
+# --- Counseling Round Serializer ---
+class CounselingRoundSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CounselingRound
+        fields = [
+            'id', 'number', 'applicants', 'allocated', 'newly_allocated', 'upgraded', 'displaced',
+            'duration_ms', 'created_at',
+        ]
+        read_only_fields = fields
+
+
+# --- Audit Entry Serializer ---
+class AuditEntrySerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source='actor.username', read_only=True, default=None)
+
+    class Meta:
+        model = AuditEntry
+        fields = ['id', 'entity', 'object_id', 'action', 'actor', 'actor_username', 'changes', 'created_at']
+        read_only_fields = fields
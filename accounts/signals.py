@@ -0,0 +1,132 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from . import catalog, feed
+from .generations import HOLIDAYS_KEY, bump_generation
+from .models import Announcement, ChangeLog, Course, Faculty, FeeRecord, Holiday, Student
+
+# model → ChangeLog.entity for everything the delta sync endpoint serves
+SYNCED_MODELS = {
+    Student: "students",
+    FeeRecord: "fees",
+    Faculty: "faculty",
+    Course: "courses",
+}
+
+
+def record_changes(entity, object_ids, deleted=False):
+    """
+    Append change-log rows for many objects at once.
+
+    Use this from bulk code paths (bulk_create / bulk_update / queryset.update)
+    which bypass the post_save / post_delete handlers below.
+    """
+    ChangeLog.objects.bulk_create(
+        [ChangeLog(entity=entity, object_id=pk, deleted=deleted) for pk in object_ids],
+        batch_size=2000,
+    )
+
+
+def refresh_last_paid(student_ids):
+    """
+    Recompute Student.last_paid_on (latest "paid" date_paid) for `student_ids`.
+
+    post_save / post_delete of a FeeRecord call this for its student; bulk
+    code paths that write fee records call it themselves. Returns the ids
+    whose value changed.
+    """
+    latest = (
+        FeeRecord.objects.filter(student=OuterRef("pk"), status="paid")
+        .order_by("-date_paid").values("date_paid")[:1]
+    )
+    changed = {}  # new date → student ids
+    rows = Student.objects.filter(pk__in=list(student_ids)).annotate(latest=Subquery(latest))
+    for pk, current, latest_paid in rows.values_list("pk", "last_paid_on", "latest"):
+        if current != latest_paid:
+            changed.setdefault(latest_paid, []).append(pk)
+    for last_paid_on, ids in changed.items():
+        Student.objects.filter(pk__in=ids).update(last_paid_on=last_paid_on, updated_at=timezone.now())
+    return [pk for ids in changed.values() for pk in ids]
+
+
+_state = threading.local()
+
+
+@contextmanager
+def bulk_changes():
+    """
+    Silence the per-row handlers below for the duration of the block.
+
+    For bulk code that calls record_changes() itself, e.g. cascading deletes
+    that would otherwise insert one change-log row per deleted object.
+    """
+    previous = getattr(_state, "bulk", False)
+    _state.bulk = True
+    try:
+        yield
+    finally:
+        _state.bulk = previous
+
+
+def _log_save(sender, instance, raw=False, **kwargs):
+    if raw or getattr(_state, "bulk", False):  # loaddata / bulk code path
+        return
+    ChangeLog.objects.create(entity=SYNCED_MODELS[sender], object_id=instance.pk)
+
+
+def _log_delete(sender, instance, **kwargs):
+    if getattr(_state, "bulk", False):
+        return
+    ChangeLog.objects.create(entity=SYNCED_MODELS[sender], object_id=instance.pk, deleted=True)
+
+
+def _remember_fee_student(sender, instance, raw=False, **kwargs):
+    # the student a record belonged to before this save, so moving it refreshes both
+    if raw or instance.pk is None or getattr(_state, "bulk", False):
+        return
+    instance._previous_student_id = (
+        FeeRecord.objects.filter(pk=instance.pk).values_list("student_id", flat=True).first()
+    )
+
+
+def _fees_changed(sender, instance, raw=False, **kwargs):
+    if raw or getattr(_state, "bulk", False):
+        return
+    student_ids = {instance.student_id, getattr(instance, "_previous_student_id", None)} - {None}
+    record_changes("students", refresh_last_paid(student_ids))
+
+
+def _announcements_changed(sender, **kwargs):
+    # after commit, so a badge computed in between can't cache the old count under the new generation
+    transaction.on_commit(lambda: bump_generation(feed.GENERATION_KEY))
+
+
+def _holidays_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_generation(HOLIDAYS_KEY))
+
+
+def _courses_changed(sender, update_fields=None, **kwargs):
+    # the catalog doesn't hold seats_available, so admissions (update_fields=["seats_available"]) don't reload it
+    if update_fields is not None and not set(update_fields) & set(catalog.STATIC_FIELDS):
+        return
+    transaction.on_commit(catalog.invalidate)
+
+
+def connect():
+    post_save.connect(_announcements_changed, sender=Announcement, dispatch_uid="announcement_badge_save")
+    post_delete.connect(_announcements_changed, sender=Announcement, dispatch_uid="announcement_badge_delete")
+    post_save.connect(_holidays_changed, sender=Holiday, dispatch_uid="holiday_generation_save")
+    post_delete.connect(_holidays_changed, sender=Holiday, dispatch_uid="holiday_generation_delete")
+    post_save.connect(_courses_changed, sender=Course, dispatch_uid="course_catalog_save")
+    post_delete.connect(_courses_changed, sender=Course, dispatch_uid="course_catalog_delete")
+    pre_save.connect(_remember_fee_student, sender=FeeRecord, dispatch_uid="fee_last_paid_pre_save")
+    post_save.connect(_fees_changed, sender=FeeRecord, dispatch_uid="fee_last_paid_save")
+    post_delete.connect(_fees_changed, sender=FeeRecord, dispatch_uid="fee_last_paid_delete")
+    for model in SYNCED_MODELS:
+        post_save.connect(_log_save, sender=model, dispatch_uid=f"changelog_save_{model.__name__}")
+        post_delete.connect(_log_delete, sender=model, dispatch_uid=f"changelog_delete_{model.__name__}")
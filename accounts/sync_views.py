@@ -0,0 +1,86 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import ChangeLog, Course, Faculty, FeeRecord, Student
+from .serializers import CourseSerializer, FacultySerializer, FeeRecordSerializer, StudentSerializer
+
+# entity → (queryset, serializer) used to render upserted rows
+SYNC_SOURCES = {
+    "students": (Student.objects.select_related("user"), StudentSerializer),
+    "fees": (FeeRecord.objects.select_related("student__user"), FeeRecordSerializer),
+    "faculty": (Faculty.objects.select_related("user"), FacultySerializer),
+    "courses": (Course.objects.all(), CourseSerializer),
+}
+
+
+# ======================================================
+# 🔄 DELTA SYNC (change feed with tombstones)
+# ======================================================
+class SyncView(APIView):
+    """
+    GET → rows created/changed since a sync token, plus tombstones for deleted ids.
+
+    Query params:
+      since     → token from the previous response (0 or omitted = from the start)
+      entities  → comma list of students,fees,faculty,courses (default: all)
+      limit     → max change-log entries consumed per call (default 5000)
+
+    Response:
+      {"token": "<next since>", "has_more": bool,
+       "changes": {"students": {"upserts": [...], "deletes": [ids]}, ...}}
+
+    Work is proportional to the number of changes: the change log is read with
+    an index range scan on id (or on (entity, id)), and only the touched rows
+    are loaded. Keep calling with the returned token while has_more is true.
+    """
+    permission_classes = [permissions.AllowAny]
+    default_limit = 5000
+    max_limit = 10000
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get("since") or 0)
+            limit = int(request.query_params.get("limit") or self.default_limit)
+        except ValueError:
+            return Response({"error": "since and limit must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        entities = list(SYNC_SOURCES)
+        if request.query_params.get("entities"):
+            entities = [e.strip() for e in request.query_params["entities"].split(",") if e.strip()]
+            unknown = set(entities) - set(SYNC_SOURCES)
+            if unknown:
+                return Response(
+                    {"error": f"Unknown entities: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        entries = list(
+            ChangeLog.objects.filter(id__gt=since, entity__in=entities)
+            .order_by("id")
+            .values_list("id", "entity", "object_id")[:limit]
+        )
+
+        # collapse repeated edits of the same row: the current table state wins
+        touched = {entity: set() for entity in entities}
+        for _, entity, object_id in entries:
+            touched[entity].add(object_id)
+
+        changes = {}
+        for entity, ids in touched.items():
+            if not ids:
+                continue
+            queryset, serializer_class = SYNC_SOURCES[entity]
+            rows = list(queryset.filter(pk__in=ids))
+            found = {row.pk for row in rows}
+            changes[entity] = {
+                "upserts": serializer_class(rows, many=True, context={"request": request}).data,
+                "deletes": sorted(ids - found),
+            }
+
+        return Response({
+            "token": str(entries[-1][0] if entries else since),
+            "has_more": len(entries) == limit,
+            "changes": changes,
+        }, status=status.HTTP_200_OK)
@@ -1,3 +1,276 @@
-from django.test import TestCase
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import mailing, rollnumbers
+from .models import Announcement, AnnouncementDelivery, Course, FeeRecord, Student, User
+from .serializers import StudentSerializer
+
+RECIPIENTS = 10_000
+
+
+class RefusingBackend(LocmemBackend):
+    """locmem, failing like the SMTP backend: raises on a refused address after sending the messages before it."""
+    refused = set()
+
+    def send_messages(self, messages):
+        sent = 0
+        for message in messages:
+            if message.to[0] in self.refused:
+                raise SMTPRecipientsRefused({message.to[0]: (550, b"No such user")})
+            sent += super().send_messages([message])
+        return sent
+
+
+class OutageBackend(LocmemBackend):
+    """locmem that loses the server for good after `budget` messages (None = never)."""
+    budget = None
+
+    def send_messages(self, messages):
+        sent = 0
+        for message in messages:
+            if OutageBackend.budget is not None:
+                if OutageBackend.budget <= 0:
+                    raise SMTPServerDisconnected("Connection unexpectedly closed")
+                OutageBackend.budget -= 1
+            sent += super().send_messages([message])
+        return sent
+
+
+class FlakyBackend(RefusingBackend, OutageBackend):
+    """Refuses the `refused` addresses and loses the server after `budget` messages."""
+
+
+@override_settings(ANNOUNCEMENT_EMAIL_CHUNK=100)
+class AnnouncementEmailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            User(username=f"mailtest{i}", email=f"mailtest{i}@example.com", role="student", password="!")
+            for i in range(RECIPIENTS)
+        )
+        User.objects.create(username="mailteacher", email="mailteacher@example.com", role="teacher", password="!")
+        cls.user_ids = list(User.objects.filter(role="student").order_by("pk").values_list("pk", flat=True))
+
+    def setUp(self):
+        announcement = Announcement.objects.create(title="Exam schedule", message="See the notice board.",
+                                                   target_audience="students")
+        self.delivery = AnnouncementDelivery.objects.create(announcement=announcement)
+        RefusingBackend.refused = set()
+        OutageBackend.budget = None
+
+    def assertEachEmailedOnce(self, emails):
+        counts = Counter(message.to[0] for message in mail.outbox)
+        self.assertEqual(set(counts), set(emails))
+        self.assertEqual(max(counts.values()), 1)
+
+    def all_emails(self):
+        return [f"mailtest{i}@example.com" for i in range(RECIPIENTS)]
+
+    def test_sends_every_recipient_exactly_once(self):
+        delivery = mailing.run_delivery(self.delivery.pk)
+
+        self.assertEqual((delivery.status, delivery.total, delivery.sent, delivery.failed), ("done", RECIPIENTS, RECIPIENTS, 0))
+        self.assertEqual(delivery.last_user_id, self.user_ids[-1])
+        self.assertEachEmailedOnce(self.all_emails())
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.RefusingBackend")
+    def test_refused_recipient_fails_alone_without_resending_the_chunk(self):
+        # refused addresses in the middle of chunks: the messages before them must not go out twice
+        refused = {"mailtest5@example.com", "mailtest150@example.com", "mailtest9999@example.com"}
+        RefusingBackend.refused = refused
+
+        delivery = mailing.run_delivery(self.delivery.pk)
+
+        self.assertEqual(delivery.status, "done")
+        self.assertEqual((delivery.sent, delivery.failed), (RECIPIENTS - len(refused), len(refused)))
+        self.assertEachEmailedOnce(set(self.all_emails()) - refused)
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.OutageBackend")
+    def test_resumes_after_an_outage_without_duplicates(self):
+        OutageBackend.budget = 300  # three chunks get through, then the server is gone
+
+        delivery = mailing.run_delivery(self.delivery.pk)
+
+        self.assertEqual(delivery.status, "failed")
+        self.assertIn("SMTPServerDisconnected", delivery.error)
+        self.assertEqual((delivery.sent, delivery.failed, delivery.last_user_id), (300, 0, self.user_ids[299]))
+
+        OutageBackend.budget = None
+        self.assertEqual(mailing.requeue_failed(delivery.pk), 1)
+        delivery = mailing.run_delivery(delivery.pk)
+
+        self.assertEqual((delivery.status, delivery.sent, delivery.failed), ("done", RECIPIENTS, 0))
+        self.assertEachEmailedOnce(self.all_emails())
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.OutageBackend")
+    def test_outage_mid_chunk_resumes_with_the_first_recipient_not_emailed(self):
+        OutageBackend.budget = 250  # the server goes away halfway through the third chunk
+
+        delivery = mailing.run_delivery(self.delivery.pk)
+
+        self.assertEqual(delivery.status, "failed")
+        self.assertEqual((delivery.sent, delivery.failed, delivery.last_user_id), (250, 0, self.user_ids[249]))
+
+        OutageBackend.budget = None
+        self.assertEqual(mailing.requeue_failed(delivery.pk), 1)
+        delivery = mailing.run_delivery(delivery.pk)
+
+        self.assertEqual((delivery.status, delivery.sent, delivery.failed), ("done", RECIPIENTS, 0))
+        self.assertEachEmailedOnce(self.all_emails())
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.FlakyBackend")
+    def test_refused_address_before_an_outage_is_counted_once(self):
+        RefusingBackend.refused = {"mailtest120@example.com"}
+        OutageBackend.budget = 250
+
+        delivery = mailing.run_delivery(self.delivery.pk)
+
+        self.assertEqual((delivery.status, delivery.sent, delivery.failed), ("failed", 250, 1))
+        self.assertEqual(delivery.last_user_id, self.user_ids[250])
+
+        OutageBackend.budget = None
+        mailing.requeue_failed(delivery.pk)
+        delivery = mailing.run_delivery(delivery.pk)
+
+        self.assertEqual((delivery.status, delivery.sent, delivery.failed), ("done", RECIPIENTS - 1, 1))
+        self.assertEachEmailedOnce(set(self.all_emails()) - RefusingBackend.refused)
+
+    def test_stale_sending_delivery_continues_after_last_user_id(self):
+        # a worker died after committing half the recipients
+        AnnouncementDelivery.objects.filter(pk=self.delivery.pk).update(
+            status="sending", total=RECIPIENTS, sent=RECIPIENTS // 2, last_user_id=self.user_ids[RECIPIENTS // 2 - 1],
+        )
+        AnnouncementDelivery.objects.filter(pk=self.delivery.pk).update(
+            updated_at=timezone.now() - mailing.STALE_AFTER - timedelta(minutes=1),
+        )
+        self.assertEqual(list(mailing.resumable()), [self.delivery])
+
+        delivery = mailing.run_delivery(self.delivery.pk)
+
+        self.assertEqual((delivery.status, delivery.sent, delivery.failed), ("done", RECIPIENTS, 0))
+        self.assertEachEmailedOnce(self.all_emails()[RECIPIENTS // 2:])
+
+    def test_live_delivery_is_not_claimed_twice(self):
+        self.assertTrue(mailing.claim(self.delivery.pk))
+        self.assertIsNone(mailing.run_delivery(self.delivery.pk))
+        self.assertEqual(mail.outbox, [])
+
+
+class LastPaidOnTests(TestCase):
+    """Student.last_paid_on (the fee aging date) follows every kind of fee write."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [
+            Student.objects.create(
+                user=User.objects.create(username=f"payer{i}", email=f"payer{i}@example.com", role="student"),
+                roll_number=f"PAYER{i}", admission_date=date(2030, 7, 1), total_fees=100000,
+            )
+            for i in range(2)
+        ]
+
+    def last_paid_on(self, student):
+        student.refresh_from_db(fields=["last_paid_on"])
+        return student.last_paid_on
+
+    def test_follows_saves_status_changes_moves_and_deletes(self):
+        first, second = self.students
+        early = FeeRecord.objects.create(student=first, amount=1000, date_paid=date(2031, 1, 10), status="paid")
+        late = FeeRecord.objects.create(student=first, amount=1000, date_paid=date(2031, 3, 5), status="paid")
+        FeeRecord.objects.create(student=first, amount=1000, date_paid=date(2031, 4, 1), status="pending")
+        self.assertEqual(self.last_paid_on(first), date(2031, 3, 5))
+
+        late.status = "overdue"
+        late.save()
+        self.assertEqual(self.last_paid_on(first), date(2031, 1, 10))
+
+        early.student = second
+        early.save()
+        self.assertEqual((self.last_paid_on(first), self.last_paid_on(second)), (None, date(2031, 1, 10)))
+
+        early.delete()
+        self.assertIsNone(self.last_paid_on(second))
+
+    def test_follows_bulk_payments(self):
+        first, second = self.students
+        response = self.client.post("/api/auth/fees/payments/", [
+            {"idempotency_key": "p1", "student": first.pk, "amount": "500.00", "date_paid": "2031-02-01"},
+            {"idempotency_key": "p2", "student": first.pk, "amount": "500.00", "date_paid": "2031-05-01"},
+            {"idempotency_key": "p3", "student": second.pk, "amount": "500.00", "date_paid": "2031-06-01",
+             "status": "pending"},
+        ], content_type="application/json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((self.last_paid_on(first), self.last_paid_on(second)), (date(2031, 5, 1), None))
+
+
+def run_threads(count, target):
+    """Run target(index) in `count` threads released together; returns the exceptions they raised."""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def run(index):
+        try:
+            barrier.wait()
+            target(index)
+        except Exception as exc:  # noqa: BLE001 - reported by the test
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+# threads use their own connections, so rows must be committed: no TestCase transaction
+class RollNumberConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def test_concurrent_allocations_are_unique_and_gap_free(self):
+        results = [[] for _ in range(self.THREADS)]
+
+        def allocate(index):
+            for i in range(40):
+                # every 10th call reserves a block, like a bulk import
+                results[index].extend(rollnumbers.allocate(2031, "CSE", 25 if i % 10 == 9 else 1))
+
+        self.assertEqual(run_threads(self.THREADS, allocate), [])
+        rolls = [roll for chunk in results for roll in chunk]
+        self.assertEqual(len(rolls), self.THREADS * (36 + 4 * 25))
+        serials = sorted(int(roll[-rollnumbers.width():]) for roll in rolls)
+        self.assertEqual(serials, list(range(1, len(rolls) + 1)))
+        for chunk in results:
+            self.assertEqual(chunk, sorted(chunk))  # each call's numbers are consecutive and in order
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+    def test_concurrent_admissions_get_distinct_roll_numbers_and_seats(self):
+        course = Course.objects.create(name="Computer Science", code="CSE", total_seats=100, seats_available=100)
+        per_thread = 5
+
+        def admit(index):
+            for i in range(per_thread):
+                serializer = StudentSerializer(data={
+                    "email": f"admit{index}x{i}@example.com", "name": "New Student",
+                    "course": course.pk, "admission_date": date(2031, 7, 1),
+                })
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+
+        self.assertEqual(run_threads(self.THREADS, admit), [])
+        admitted = self.THREADS * per_thread
+        rolls = sorted(Student.objects.filter(course=course).values_list("roll_number", flat=True))
+        self.assertEqual(rolls, [rollnumbers.format_roll(2031, "CSE", serial) for serial in range(1, admitted + 1)])
+        course.refresh_from_db()
+        self.assertEqual(course.seats_available, 100 - admitted)
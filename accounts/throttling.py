@@ -0,0 +1,170 @@
+"""
+Token-bucket throttles for the login and password-reset endpoints.
+
+Buckets live in a small SQLite file shared by every gunicorn worker on the
+host, so limits hold no matter which worker a request lands on. Each check
+is one short BEGIN IMMEDIATE transaction (atomic across processes) and never
+touches the main database.
+
+Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] as "<burst>/<period>",
+e.g. "5/min" or "5/15m": up to <burst> requests at once, refilled evenly over
+<period>. The store path is THROTTLE_STORE_PATH.
+"""
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*([smhd])[a-z]*\s*$")
+
+
+def parse_rate(rate):
+    """'5/15m' → (capacity=5, refill_per_second=5 / 900)."""
+    match = _RATE_RE.match(rate or "")
+    if not match:
+        raise ImproperlyConfigured(f"Invalid throttle rate {rate!r}")
+    capacity = int(match.group(1))
+    period = int(match.group(2) or 1) * _PERIODS[match.group(3)]
+    return capacity, capacity / period
+
+
+class BucketStore:
+    """Token buckets in an SQLite file; one connection per thread."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # counters only; losing a few on power loss is fine
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bucket ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, refill_per_second):
+        """Take one token. Returns (allowed, seconds_until_next_token)."""
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM bucket WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO bucket (key, tokens, updated) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        wait = 0 if allowed else (1 - tokens) / refill_per_second
+        return allowed, wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = getattr(settings, "THROTTLE_STORE_PATH", None) or os.path.join(
+                    tempfile.gettempdir(), "college_project_throttle.sqlite3"
+                )
+                _store = BucketStore(path)
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base class: subclasses set `scope` and implement get_bucket_key().
+    Requests without a key (e.g. no username in the body) are not throttled
+    by that class.
+    """
+    scope = None
+
+    def get_bucket_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        key = self.get_bucket_key(request, view)
+        if not key:
+            return True
+        capacity, refill = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(self.scope))
+        allowed, self._wait = get_store().take(f"{self.scope}:{key}", capacity, refill)
+        return allowed
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+def _body_value(request, field):
+    try:
+        value = request.data.get(field)
+    except AttributeError:  # non-dict body (e.g. a JSON list)
+        return None
+    return str(value).strip().lower() if value else None
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = "login_ip"
+
+    def get_bucket_key(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    scope = "login_username"
+
+    def get_bucket_key(self, request, view):
+        return _body_value(request, "username")
+
+
+class PasswordResetIPThrottle(TokenBucketThrottle):
+    scope = "reset_ip"
+
+    def get_bucket_key(self, request, view):
+        return self.get_ident(request)
+
+
+class PasswordResetEmailThrottle(TokenBucketThrottle):
+    scope = "reset_email"
+
+    def get_bucket_key(self, request, view):
+        return _body_value(request, "email")
+
+
+class OTPConfirmIPThrottle(TokenBucketThrottle):
+    scope = "otp_ip"
+
+    def get_bucket_key(self, request, view):
+        return self.get_ident(request)
+
+
+class OTPConfirmEmailThrottle(TokenBucketThrottle):
+    """Caps OTP guesses per email, whichever IPs they come from."""
+    scope = "otp_email"
+
+    def get_bucket_key(self, request, view):
+        return _body_value(request, "email")
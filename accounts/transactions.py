@@ -0,0 +1,37 @@
+"""
+Write transactions that must not fail on SQLite's lock upgrade.
+
+SQLite ignores select_for_update(), and a transaction opened with a plain
+BEGIN only asks for the write lock at its first write. Two such transactions
+that both read first cannot both upgrade: one fails at once with "database is
+locked", and the busy timeout doesn't help. `immediate_atomic()` opens the
+outermost block with BEGIN IMMEDIATE instead, so it waits for the write lock
+up front (up to the busy timeout) and then runs alone.
+
+Use it only for short write paths that read first and rely on that exclusion
+(roll-number allocation, admissions, seat counts). Everything else keeps
+the default DEFERRED mode, so long read-only transactions (exports, reports)
+never hold the write lock. On other databases it is plain transaction.atomic().
+"""
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+@contextmanager
+def immediate_atomic(using=None):
+    connection = transaction.get_connection(using)
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        # other databases lock rows themselves; a nested block runs in whatever the outer one began
+        with transaction.atomic(using=using):
+            yield
+        return
+    connection.ensure_connection()  # connecting resets transaction_mode from OPTIONS
+    previous = connection.transaction_mode
+    connection.transaction_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using):  # BEGIN is issued on entering the outermost block
+            connection.transaction_mode = previous
+            yield
+    finally:
+        connection.transaction_mode = previous
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     AdminProfileView, AnnouncementDetailView, AnnouncementListCreateView, ChangePasswordView, FeeRecordDetailView, FeeRecordListCreateView, HolidayListView,
-    RegisterView, MeView, LogoutView, ReportsView,
+    RegisterView, MeView, LogoutView, ReportsView, ThrottledTokenObtainPairView,
     RequestResetView, ConfirmResetView,
     StudentListCreateView,
     StudentDetailView,
@@ -11,8 +11,24 @@ from .views import (
 
 from .views import AnnouncementListCreateView, AnnouncementDetailView
 from .dashboard_views import AdminDashboardView
-from .announcement_views import AnnouncementListView
-from .report_views import FeeSummaryView
+from .announcement_views import (
+    AnnouncementBadgeView, AnnouncementDeliveryView, AnnouncementFeedView, AnnouncementListView, AnnouncementSeenView,
+)
+from .report_views import FeeAgingView, FeeSummaryView
+from .fee_views import FeeDefaulterListView, FeePaymentPostView
+from .sync_views import SyncView
+from .attendance_views import (
+    AttendanceSessionMarkView, AttendanceShortfallView, CourseAttendanceView, StudentAttendanceView,
+)
+from .bulk_views import RollNumberBlockView, StudentBatchUpdateView, StudentBulkRemoveView, FacultyBulkRemoveView
+from .results_views import MarksUploadView, SemesterResultListView, StudentResultsView
+from .export_views import ExportDownloadView, ExportJobCreateView, ExportJobDetailView
+from .profile_views import StudentProfileView
+from .batch_views import BatchView
+from .audit_views import AuditEntryListView
+from .counseling_views import (
+    CounselingApplicantDetailView, CounselingApplicantListCreateView, CounselingCommitView, CounselingRoundListCreateView,
+)
 from .management_views import (
     FacultyListCreateView, 
     FacultyDetailView,
@@ -20,7 +36,6 @@ from .management_views import (
 )
 
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
@@ -36,12 +51,13 @@ urlpatterns = [
     # ===============================
     path('register/', RegisterView.as_view(), name='auth_register'),
     path('me/', MeView.as_view(), name='auth_me'),
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),   # login
+    path('token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),   # login (throttled)
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('token/verify/', TokenVerifyView.as_view(), name='token_verify'),
     path('logout/', LogoutView.as_view(), name='auth_logout'),                 # logout
     path('change-password/', ChangePasswordView.as_view(), name='change_password'),
     path('profile/', AdminProfileView.as_view(), name='admin_profile'),
+    path('batch/', BatchView.as_view(), name='batch'),                         # several GETs in one round trip
 
     # ===============================
     # 📊 DASHBOARD & REPORTS
@@ -62,6 +78,12 @@ urlpatterns = [
     path('fees/<int:pk>/', FeeRecordDetailView.as_view(), name='fee_detail'),
     # 💰 Fee Summary (for Dashboard)
     path('fees/summary/', FeeSummaryView.as_view(), name='fee_summary'),
+    # ⏳ Fee Aging (outstanding amounts by days since last payment)
+    path('fees/aging/', FeeAgingView.as_view(), name='fee_aging'),
+    # 💸 Fee Defaulters (outstanding amount, keyset paginated)
+    path('fees/defaulters/', FeeDefaulterListView.as_view(), name='fee_defaulters'),
+    # 🧾 Bulk payment posting (idempotent)
+    path('fees/payments/', FeePaymentPostView.as_view(), name='fee_payments'),
 
     # ===============================
     # 🧑‍🎓 STUDENT MANAGEMENT (FIXED)
@@ -69,29 +91,79 @@ urlpatterns = [
 
     path("students/", StudentListCreateView.as_view(), name="student-list-create"),
     path("students/<int:pk>/", StudentDetailView.as_view(), name="student-detail"),
+    path("students/<int:pk>/profile/", StudentProfileView.as_view(), name="student-profile"),
+    path("students/batch/", StudentBatchUpdateView.as_view(), name="student-batch-update"),
+    path("students/bulk-remove/", StudentBulkRemoveView.as_view(), name="student-bulk-remove"),
+    path("students/roll-numbers/", RollNumberBlockView.as_view(), name="student-roll-numbers"),
     path("student-status/<int:pk>/", StudentStatusUpdateView.as_view(), name="student-status"),
 
+    # ===============================
+    # 🎯 COUNSELING (rank-based seat allocation)
+    # ===============================
+    path('counseling/applicants/', CounselingApplicantListCreateView.as_view(), name='counseling_applicants'),
+    path('counseling/applicants/<int:pk>/', CounselingApplicantDetailView.as_view(), name='counseling_applicant'),
+    path('counseling/rounds/', CounselingRoundListCreateView.as_view(), name='counseling_rounds'),
+    path('counseling/commit/', CounselingCommitView.as_view(), name='counseling_commit'),
+
+    # ===============================
+    # 🕵️ AUDIT LOG
+    # ===============================
+    path('audit/', AuditEntryListView.as_view(), name='audit_log'),
+
     # ===============================
     # 👨‍🏫 FACULTY MANAGEMENT
     # ===============================
     path('faculty/', FacultyListCreateView.as_view(), name='faculty_list'),
     path('faculty/<int:pk>/', FacultyDetailView.as_view(), name='faculty_detail'),
+    path('faculty/bulk-remove/', FacultyBulkRemoveView.as_view(), name='faculty_bulk_remove'),
 
     # ===============================
     # 📚 COURSES
     # ===============================
     path('courses/', CourseListView.as_view(), name='course_list'),
 
+    # ===============================
+    # 📝 ATTENDANCE
+    # ===============================
+    path('attendance/sessions/', AttendanceSessionMarkView.as_view(), name='attendance_mark'),
+    path('attendance/courses/<int:pk>/', CourseAttendanceView.as_view(), name='attendance_course'),
+    path('attendance/students/<int:pk>/', StudentAttendanceView.as_view(), name='attendance_student'),
+    path('attendance/shortfall/', AttendanceShortfallView.as_view(), name='attendance_shortfall'),
+
+    # ===============================
+    # 🎓 MARKS & RESULTS (SGPA / CGPA)
+    # ===============================
+    path('results/', SemesterResultListView.as_view(), name='semester_results'),
+    path('results/marks/', MarksUploadView.as_view(), name='marks_upload'),
+    path('results/students/<int:pk>/', StudentResultsView.as_view(), name='student_results'),
+
+    # ===============================
+    # 🧾 EXPORTS (async PDF / XLSX)
+    # ===============================
+    path('exports/', ExportJobCreateView.as_view(), name='export_create'),
+    path('exports/<uuid:pk>/', ExportJobDetailView.as_view(), name='export_detail'),
+    path('exports/<uuid:pk>/download/', ExportDownloadView.as_view(), name='export_download'),
+
     # ===============================
     # 📢 ANNOUNCEMENTS
     # ===============================
     path('announcements/', AnnouncementListCreateView.as_view(), name='announcement-list-create'),
-    path('announcements/<int:pk>/', AnnouncementDetailView.as_view(), name='announcement-detail'),        
+    path('announcements/<int:pk>/', AnnouncementDetailView.as_view(), name='announcement-detail'),
+    path('announcements/<int:pk>/email/', AnnouncementDeliveryView.as_view(), name='announcement-email'),
+    # 📬 per-user feed with unread state
+    path('announcements/feed/', AnnouncementFeedView.as_view(), name='announcement-feed'),
+    path('announcements/feed/seen/', AnnouncementSeenView.as_view(), name='announcement-feed-seen'),
+    path('announcements/feed/badge/', AnnouncementBadgeView.as_view(), name='announcement-feed-badge'),        
     # ===============================
     # 🗓️ HOLIDAYS
     # ===============================
     path('holidays/', HolidayListView.as_view(), name='holiday_list'),
 
+    # ===============================
+    # 🔄 DELTA SYNC
+    # ===============================
+    path('sync/', SyncView.as_view(), name='sync'),
+
     # ===============================
     # 🔑 PASSWORD RESET (OTP)
     # ===============================
@@ -5,6 +5,7 @@ from rest_framework.views import APIView  # type: ignore
 from .serializers import StudentSerializer
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.decorators import api_view
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth import get_user_model
@@ -16,6 +17,16 @@ from .models import Student
 from .models import Faculty
 from .models import Announcement
 from .serializers import FacultySerializer
+from . import audit, coalesce
+from .renderers import COLUMNAR_RENDERER_CLASSES, StreamingListMixin
+from .throttling import (
+    LoginIPThrottle,
+    LoginUsernameThrottle,
+    OTPConfirmEmailThrottle,
+    OTPConfirmIPThrottle,
+    PasswordResetEmailThrottle,
+    PasswordResetIPThrottle,
+)
 
 
 from .models import (
@@ -80,7 +91,7 @@ class StudentListView(APIView):
         entry_type = request.query_params.get("entry_type")
         year = request.query_params.get("year")
 
-        students = Student.objects.all()
+        students = Student.objects.filter(archived_at__isnull=True)
 
         # ✅ Filter by department
         if dept:
@@ -100,14 +111,15 @@ class StudentListView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class StudentListCreateView(generics.ListCreateAPIView):
+class StudentListCreateView(StreamingListMixin, generics.ListCreateAPIView):
     """
-    GET → List all students
+    GET → List all students (archived students are left out); plain JSON is streamed
     POST → Create a new student
     """
-    queryset = Student.objects.all()
+    queryset = Student.objects.filter(archived_at__isnull=True).select_related("user")  # course names: catalog
     serializer_class = StudentSerializer
     permission_classes = [permissions.AllowAny]
+    renderer_classes = COLUMNAR_RENDERER_CLASSES  # ?format=columnar for table views
 
 
 # ✅ FIXED DELETE ENDPOINT (Now matches /api/auth/students/<id>/)
@@ -122,10 +134,12 @@ class StudentDetailView(APIView):
     def delete(self, request, pk):
         student = self.get_object(pk)
         linked_user = student.user
+        before = audit.snapshot(student)
 
         student.delete()
         if linked_user:
             linked_user.delete()
+        audit.record("students", pk, request.user, before)
 
         return Response(
             {"message": f"Student '{student}' deleted successfully."},
@@ -135,9 +149,11 @@ class StudentDetailView(APIView):
     # --- PUT (for edit modal) ---
     def put(self, request, pk):
         student = self.get_object(pk)
+        before = audit.snapshot(student)
         serializer = StudentSerializer(student, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            audit.record("students", student.pk, request.user, before, audit.snapshot(student))
             return Response(
                 {"message": "Student updated successfully.", "data": serializer.data},
                 status=status.HTTP_200_OK
@@ -188,9 +204,12 @@ class FacultyDetailView(generics.RetrieveUpdateDestroyAPIView):
     def delete(self, request, *args, **kwargs):
         faculty = self.get_object()
         linked_user = faculty.user
+        faculty_id = faculty.pk
+        before = audit.snapshot(faculty, email=linked_user.email if linked_user else None)
         faculty.delete()
         if linked_user:
             linked_user.delete()
+        audit.record("faculty", faculty_id, request.user, before)
         return Response(
             {"message": "Faculty deleted successfully."},
             status=status.HTTP_204_NO_CONTENT,
@@ -207,6 +226,11 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
 
 
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """Login (JWT pair) with per-IP and per-username token buckets, checked before any password hashing"""
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
+
 # ======================================================
 # 🗓️ HOLIDAYS
 # ======================================================
@@ -270,37 +294,48 @@ class AdminDashboardView(APIView):
 # ======================================================
 # 📈 REPORTS
 # ======================================================
+def reports_data():
+    return {
+        "total_students": Student.objects.count(),
+        "total_faculty": Faculty.objects.count(),
+        "total_courses": Course.objects.count(),
+        "total_holidays": Holiday.objects.count(),
+        "total_announcements": Announcement.objects.count(),
+        "fee_summary": {
+            "paid": FeeRecord.objects.aggregate(Sum('amount'))['amount__sum'] or 0,
+            "total": FeeRecord.objects.aggregate(Sum('amount'))['amount__sum'] or 0,
+        }
+    }
+
+
 class ReportsView(APIView):
-    """Generate summarized report data"""
+    """Generate summarized report data (single-flight, stale-while-revalidate: see coalesce.py)"""
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        data = {
-            "total_students": Student.objects.count(),
-            "total_faculty": Faculty.objects.count(),
-            "total_courses": Course.objects.count(),
-            "total_holidays": Holiday.objects.count(),
-            "total_announcements": Announcement.objects.count(),
-            "fee_summary": {
-                "paid": FeeRecord.objects.aggregate(Sum('amount'))['amount__sum'] or 0,
-                "total": FeeRecord.objects.aggregate(Sum('amount'))['amount__sum'] or 0,
-            }
-        }
-        return Response(data)
+        return Response(coalesce.get_or_compute("aggregates:reports", reports_data))
 
 # ======================================================
 # 📢 ANNOUNCEMENTS MANAGEMENT
 # ======================================================
 from .serializers import AnnouncementSerializer
+from . import mailing
 
 class AnnouncementListCreateView(generics.ListCreateAPIView):
     """
     GET → List all announcements (newest first)
-    POST → Create a new announcement
+    POST → Create a new announcement; "send_email": true also emails it to
+    the target audience in the background
     """
     queryset = Announcement.objects.all().order_by('-created_at')
     serializer_class = AnnouncementSerializer
     permission_classes = [permissions.AllowAny]
+
+    def perform_create(self, serializer):
+        announcement = serializer.save()
+        if serializer.validated_data.get('send_email'):
+            # sent from a background thread once this request's transaction commits
+            mailing.queue_delivery(announcement)
     
 # ======================================================
 # 📢 ANNOUNCEMENT DETAIL (GET, DELETE)
@@ -320,14 +355,15 @@ class AnnouncementDetailView(generics.RetrieveDestroyAPIView):
 # ======================================================
 from .serializers import FeeRecordSerializer
 
-class FeeRecordListCreateView(generics.ListCreateAPIView):
+class FeeRecordListCreateView(StreamingListMixin, generics.ListCreateAPIView):
     """
-    GET → List all fee records
+    GET → List all fee records (plain JSON is streamed)
     POST → Add new fee record
     """
-    queryset = FeeRecord.objects.all().select_related("student__user")
+    queryset = FeeRecord.objects.all().select_related("student__user")  # course names: catalog
     serializer_class = FeeRecordSerializer
     permission_classes = [permissions.AllowAny]
+    renderer_classes = COLUMNAR_RENDERER_CLASSES  # ?format=columnar for table views
 
 
 class FeeRecordDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -339,7 +375,18 @@ class FeeRecordDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = FeeRecord.objects.all().select_related("student__user")
     serializer_class = FeeRecordSerializer
     permission_classes = [permissions.AllowAny]
-    
+
+    def perform_update(self, serializer):
+        before = audit.snapshot(serializer.instance)
+        record = serializer.save()
+        audit.record("fees", record.pk, self.request.user, before, audit.snapshot(record))
+
+    def perform_destroy(self, instance):
+        record_id = instance.pk
+        before = audit.snapshot(instance)
+        instance.delete()
+        audit.record("fees", record_id, self.request.user, before)
+
 # ======================================================
 # 📊 FEE SUMMARY AGGREGATION (for Dashboard)
 # ======================================================
@@ -382,6 +429,8 @@ class ChangePasswordView(APIView):
 class RequestResetView(APIView):
     """Step 1: Request a password reset - generates OTP/token and emails it"""
     permission_classes = [AllowAny]
+    authentication_classes = []  # anonymous flow; lets throttles run before any DB work
+    throttle_classes = [PasswordResetIPThrottle, PasswordResetEmailThrottle]
 
     def post(self, request):
         email = request.data.get("email")
@@ -424,6 +473,8 @@ class RequestResetView(APIView):
 class ConfirmResetView(APIView):
     """Step 2: Confirm password reset with OTP"""
     permission_classes = [AllowAny]
+    authentication_classes = []  # anonymous flow; lets throttles run before any DB work
+    throttle_classes = [OTPConfirmIPThrottle, OTPConfirmEmailThrottle]
 
     def post(self, request):
         email = request.data.get("email")
@@ -200,6 +200,7 @@ Minimal, corrected version — uses environment variables for secrets and fixes
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -241,15 +242,20 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
 
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # session / auth / messages are skipped for bearer-token API requests
+    # (admin and browsable API keep the full stock behaviour)
+    "accounts.middleware.ApiAwareSessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",            # cors early
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "accounts.middleware.ApiAwareAuthenticationMiddleware",
+    "accounts.middleware.ApiAwareMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Path prefixes where JWT-authenticated requests take the fast path above
+API_FAST_PATH_PREFIXES = ("/api/",)
+
 ROOT_URLCONF = "college_project.urls"
 
 TEMPLATES = [
@@ -275,9 +281,37 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # writers wait up to 20 s for the lock; paths that read before writing
+        # open with BEGIN IMMEDIATE themselves (accounts/transactions.py)
+        "OPTIONS": {"timeout": 20},
+        # a file, not the in-memory default: the concurrency tests write from several threads, and
+        # in-memory shared-cache databases fail with "table is locked" instead of waiting
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
 
+# "default" stays per-process; "shared" is seen by every gunicorn worker
+# (Redis when REDIS_URL is set, otherwise files under the temp directory)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+        if os.environ.get("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get(
+                "SHARED_CACHE_DIR", os.path.join(tempfile.gettempdir(), "college_project_cache")
+            ),
+            "OPTIONS": {"MAX_ENTRIES": 20000},
+        }
+    ),
+}
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -310,8 +344,10 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST framework + JWT (unchanged)
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.SessionAuthentication",
+        # JWT first: bearer-token calls never touch the session machinery;
+        # cookie-only requests (admin, browsable API) fall through to sessions
         "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -320,8 +356,22 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ),
+    # token buckets for login / password reset ("<burst>/<refill period>"), see accounts/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get("THROTTLE_LOGIN_IP", "30/min"),
+        "login_username": os.environ.get("THROTTLE_LOGIN_USERNAME", "5/min"),
+        "reset_ip": os.environ.get("THROTTLE_RESET_IP", "10/hour"),
+        "reset_email": os.environ.get("THROTTLE_RESET_EMAIL", "3/hour"),
+        "otp_ip": os.environ.get("THROTTLE_OTP_IP", "30/hour"),
+        "otp_email": os.environ.get("THROTTLE_OTP_EMAIL", "5/15m"),
+    },
+    # set to the number of reverse proxies in front of gunicorn so per-IP limits use the client IP
+    "NUM_PROXIES": int(os.environ["NUM_PROXIES"]) if os.environ.get("NUM_PROXIES") else None,
 }
 
+# Shared (cross-worker) SQLite file holding the throttle token buckets
+THROTTLE_STORE_PATH = os.environ.get("THROTTLE_STORE_PATH", "")
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -351,3 +401,39 @@ else:
     CORS_ALLOWED_ORIGINS = os.environ.get("CORS_ALLOWED_ORIGINS", "").split(",") if os.environ.get("CORS_ALLOWED_ORIGINS") else []
 
 CORS_ALLOW_CREDENTIALS = True
+
+# Fees: a pending FeeRecord becomes overdue after this many working days
+# (weekends and Holiday dates excluded), see `manage.py sweep_overdue_fees`
+FEE_DUE_WINDOW_WORKING_DAYS = int(os.environ.get("FEE_DUE_WINDOW_WORKING_DAYS", 30))
+
+# Export jobs (accounts/exports.py): rendered files, content-addressed, and the
+# number of render processes per web worker
+EXPORT_ROOT = os.environ.get("EXPORT_ROOT", "")
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", 2))
+
+# Announcement emails (accounts/mailing.py): messages sent per send_messages()
+# call over one connection; progress is committed after each chunk
+ANNOUNCEMENT_EMAIL_CHUNK = int(os.environ.get("ANNOUNCEMENT_EMAIL_CHUNK", 100))
+
+# Roll numbers (accounts/rollnumbers.py): digits of the per-year, per-course
+# serial, e.g. 4 → 25CSE0001 … 25CSE9999
+ROLL_NUMBER_WIDTH = int(os.environ.get("ROLL_NUMBER_WIDTH", 4))
+
+# Aggregate endpoints (dashboard, reports, fee summary; accounts/coalesce.py):
+# results younger than FRESH are served as is, older ones up to STALE are
+# served while one request recomputes them in the background. SHARED_LOCK also
+# coalesces the computation across workers with a cache.add lock in the "shared"
+# cache; that needs an atomic add, so it is on by default only with Redis (the
+# file cache checks, then writes, and two workers could both take the lock).
+AGGREGATE_FRESH_SECONDS = int(os.environ.get("AGGREGATE_FRESH_SECONDS", 15))
+AGGREGATE_STALE_SECONDS = int(os.environ.get("AGGREGATE_STALE_SECONDS", 300))
+AGGREGATE_SHARED_LOCK = os.environ.get(
+    "AGGREGATE_SHARED_LOCK", "True" if os.environ.get("REDIS_URL") else "False"
+).lower() in ("1", "true", "yes")
+
+# Audit log (accounts/audit.py): entries are buffered per worker and inserted
+# every FLUSH_SECONDS or once FLUSH_SIZE are waiting; a killed worker loses at
+# most that much. While inserts fail, at most BUFFER_MAX entries are kept.
+AUDIT_FLUSH_SECONDS = int(os.environ.get("AUDIT_FLUSH_SECONDS", 2))
+AUDIT_FLUSH_SIZE = int(os.environ.get("AUDIT_FLUSH_SIZE", 500))
+AUDIT_BUFFER_MAX = int(os.environ.get("AUDIT_BUFFER_MAX", 20000))
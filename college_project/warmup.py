@@ -0,0 +1,81 @@
+"""
+Warm-up routine run before a server starts taking traffic.
+
+Pays the one-off costs that would otherwise land on the first requests of
+every worker: URL resolver population, route matching, model/serializer
+field introspection and opening the database connection.
+"""
+import inspect
+import logging
+import time
+
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# sample values used to build concrete paths for parametrised routes
+_SAMPLE_ARGS = {"int": 1, "str": "x", "slug": "x", "uuid": "00000000-0000-0000-0000-000000000000", "path": "x"}
+
+
+def _iter_named_patterns(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_named_patterns(pattern.url_patterns, pattern.namespace or namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern, f"{namespace}:{pattern.name}" if namespace else pattern.name
+
+
+def warm_urls():
+    """Populate the resolver and resolve every named route once."""
+    resolver = get_resolver()
+    resolver.reverse_dict  # builds the reverse/namespace dicts
+    count = 0
+    for pattern, name in _iter_named_patterns(resolver.url_patterns):
+        converters = getattr(pattern.pattern, "converters", {})
+        kwargs = {key: _SAMPLE_ARGS.get(type(conv).__name__.replace("Converter", "").lower(), 1)
+                  for key, conv in converters.items()}
+        try:
+            resolve(reverse(name, kwargs=kwargs or None))
+            count += 1
+        except Exception:  # a route we can't build a sample path for; not worth failing boot over
+            logger.debug("warm-up: could not resolve %s", name, exc_info=True)
+    return count
+
+
+def warm_serializers(module_name="accounts.serializers"):
+    """Instantiate every serializer once so field/model introspection caches are filled."""
+    module = __import__(module_name, fromlist=["*"])
+    count = 0
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if issubclass(cls, serializers.BaseSerializer) and cls.__module__ == module.__name__:
+            try:
+                cls().fields
+                count += 1
+            except Exception:
+                logger.debug("warm-up: could not build %s", cls.__name__, exc_info=True)
+    return count
+
+
+def connect_databases():
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+def close_databases():
+    """Drop connections so they are not shared with forked workers."""
+    for alias in connections:
+        connections[alias].close()
+
+
+def warm_up(connect_db=True):
+    start = time.perf_counter()
+    routes = warm_urls()
+    serializer_count = warm_serializers()
+    if connect_db:
+        connect_databases()
+    logger.info(
+        "warm-up: %d routes, %d serializers in %.0f ms",
+        routes, serializer_count, (time.perf_counter() - start) * 1000,
+    )
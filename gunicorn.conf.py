@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration (picked up automatically by `gunicorn college_project.wsgi`).
+
+The app is imported once in the master (preload_app) and warmed up before
+forking, so workers share Django/DRF/simplejwt code and the populated URL
+resolver copy-on-write instead of each paying the cold start.
+
+Environment:
+  PORT                      bind port (default 8000)
+  GUNICORN_WORKERS          worker processes (default 2 * CPUs + 1)
+  GUNICORN_WORKER_CLASS     "sync" (default) or "gthread"
+  GUNICORN_THREADS          threads per gthread worker (default 4)
+  GUNICORN_TIMEOUT          worker timeout in seconds (default 30)
+  GUNICORN_MAX_REQUESTS     recycle workers after N requests (default 0 = never)
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", 4)) if worker_class == "gthread" else 1
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = 5 if worker_class == "gthread" else 2
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+accesslog = "-"
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before any worker is forked."""
+    from college_project.warmup import close_databases, warm_up
+
+    warm_up(connect_db=True)  # also verifies the database is reachable
+    close_databases()         # sockets/file handles must not be shared across fork
+
+
+def post_fork(server, worker):
+    from college_project.warmup import connect_databases
+
+    connect_databases()